@@ -0,0 +1,244 @@
+"""Admission control: per-client rate limits and a cap on expensive handlers.
+
+Each client (the remote address, or behind RATE_LIMIT_TRUSTED_PROXIES
+proxies, the X-Forwarded-For entry the outermost trusted proxy saw) gets a
+token bucket of RATE_LIMIT_BURST requests refilled at RATE_LIMIT_PER_SECOND.
+With the default "auto", one proxy is trusted when the connection comes
+from a loopback or private address (a platform edge or a sidecar nginx),
+so visitors behind it don't all share the proxy's bucket. An empty bucket
+gets a 429 whose Retry-After says when the next token arrives. That covers
+/api/* and WebSocket connects; health checks and WebSub deliveries are
+exempt. Refused WebSocket connects are accepted and then closed with 1013
+(try again later), since closing before the handshake reaches the client
+as a bare HTTP 403.
+
+The expensive handlers (article listing, stats, archive search, fetch
+triggers) also share ADMISSION_MAX_CONCURRENT slots. A request waits up to
+ADMISSION_QUEUE_TIMEOUT seconds for one, and gets a 503 past that or when
+ADMISSION_MAX_WAITING requests are already waiting, so a surge is shed at
+the door instead of queueing every later request behind it. Streaming
+exports hold their slot until the last byte is sent, which can take
+minutes on a slow client, so they get a pool of their own
+(ADMISSION_EXPORT_MAX_CONCURRENT) and can't starve the listing. The cap on
+live stream clients (WS_MAX_CLIENTS) is enforced where they subscribe, in
+app.websocket.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import math
+import time
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+from app.config import (
+    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RATE_LIMIT_TRUSTED_PROXIES,
+    ADMISSION_MAX_CONCURRENT, ADMISSION_EXPORT_MAX_CONCURRENT, ADMISSION_MAX_WAITING,
+    ADMISSION_QUEUE_TIMEOUT,
+)
+from app.metrics import ADMISSION_REJECTED, ADMISSION_IN_FLIGHT, ADMISSION_WAITING
+
+logger = logging.getLogger(__name__)
+
+EXEMPT_PATHS = ("/api/health", "/api/websub/")
+EXPENSIVE = (  # (method, path prefix)
+    ("GET", "/api/articles"),
+    ("GET", "/api/stats"),
+    ("GET", "/api/dashboard-stats"),
+    ("GET", "/api/archive"),
+    ("POST", "/api/fetch"),
+)
+STREAMING = (  # (method, path prefix) of expensive handlers that stream their body
+    ("GET", "/api/export/"),
+)
+CHEAP = (  # (method, path prefix) of single-row lookups under an EXPENSIVE prefix
+    ("GET", "/api/articles/"),
+)
+SWEEP_SECONDS = 60
+TRUSTED_PROXIES = None if RATE_LIMIT_TRUSTED_PROXIES == "auto" else int(RATE_LIMIT_TRUSTED_PROXIES)
+
+
+class TokenBuckets:
+    """Per-client token buckets: client -> (tokens, last update)"""
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, burst: int = RATE_LIMIT_BURST):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.buckets = {}
+        self.swept = time.monotonic()
+
+    def take(self, client: str, now: float = None) -> float:
+        """0 if the request is admitted, otherwise seconds until it would be"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        tokens, updated = self.buckets.get(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self.buckets[client] = (tokens, now)
+        if now - self.swept > SWEEP_SECONDS:
+            self._sweep(now)
+        return wait
+
+    def _sweep(self, now: float):
+        # A bucket that has had time to refill completely is the same as no bucket
+        refill = self.burst / self.rate
+        self.buckets = {c: b for c, b in self.buckets.items() if now - b[1] < refill}
+        self.swept = now
+
+
+class ConcurrencyLimiter:
+    """At most ``limit`` holders; up to ``max_waiting`` more wait in FIFO order"""
+
+    def __init__(self, limit: int = ADMISSION_MAX_CONCURRENT, max_waiting: int = ADMISSION_MAX_WAITING,
+                 timeout: float = ADMISSION_QUEUE_TIMEOUT, pool: str = "handlers"):
+        self.pool = pool
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.running = 0
+        self.waiters = deque()
+
+    def _update_metrics(self):
+        ADMISSION_IN_FLIGHT.set(self.running, pool=self.pool)
+        ADMISSION_WAITING.set(len(self.waiters), pool=self.pool)
+
+    async def acquire(self) -> bool:
+        """Take a slot; False if none freed up in time or too many are already waiting"""
+        if self.limit <= 0 or (self.running < self.limit and not self.waiters):
+            self.running += 1
+            self._update_metrics()
+            return True
+        if len(self.waiters) >= self.max_waiting:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self._update_metrics()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return True  # handed a slot just as the wait ran out
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+            self._update_metrics()
+
+    def release(self):
+        self.running -= 1
+        # Hand freed slots straight to waiters so newcomers can't jump the queue
+        while self.waiters and (self.limit <= 0 or self.running < self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.running += 1
+        self._update_metrics()
+
+
+buckets = TokenBuckets()
+limiter = ConcurrencyLimiter()
+export_limiter = ConcurrencyLimiter(limit=ADMISSION_EXPORT_MAX_CONCURRENT, pool="exports")
+
+
+def _private(address: str) -> bool:
+    try:
+        return not ipaddress.ip_address(address).is_global
+    except ValueError:
+        return False
+
+
+def client_address(scope) -> str:
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    trusted = TRUSTED_PROXIES if TRUSTED_PROXIES is not None else (1 if _private(peer) else 0)
+    if trusted > 0:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                if hops:
+                    # Entries before the ones our proxies appended are client-controlled
+                    return hops[max(0, len(hops) - trusted)]
+                break
+    return peer
+
+
+async def refuse_websocket(receive, send, code: int, reason: str = ""):
+    """Complete the handshake, then close with ``code`` (a close before accept is an HTTP 403)"""
+    message = await receive()
+    if message["type"] == "websocket.connect":
+        await send({"type": "websocket.accept"})
+        await send({"type": "websocket.close", "code": code, "reason": reason})
+
+
+def _retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def _pool(scope):
+    """The limiter an API request takes a slot from, None if it is cheap"""
+    method, path = scope["method"], scope["path"]
+    if any(method == m and path.startswith(prefix) for m, prefix in CHEAP):
+        return None
+    if any(method == m and path.startswith(prefix) for m, prefix in STREAMING):
+        return export_limiter
+    if any(method == m and path.startswith(prefix) for m, prefix in EXPENSIVE):
+        return limiter
+    return None
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the rate limits and the expensive-handler cap"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            if buckets.take(client_address(scope)):
+                ADMISSION_REJECTED.inc(reason="rate_limited")
+                await refuse_websocket(receive, send, 1013, "Too many requests")
+                return
+            await self.app(scope, receive, send)
+            return
+
+        if (scope["type"] != "http" or not scope["path"].startswith("/api/")
+                or scope["path"].startswith(EXEMPT_PATHS) or scope["method"] == "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        wait = buckets.take(client_address(scope))
+        if wait:
+            ADMISSION_REJECTED.inc(reason="rate_limited")
+            response = JSONResponse({"detail": "Too many requests, slow down"}, status_code=429,
+                                    headers={"Retry-After": _retry_after(wait)})
+            await response(scope, receive, send)
+            return
+
+        pool = _pool(scope)
+        if pool is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await pool.acquire():
+            ADMISSION_REJECTED.inc(reason="overloaded")
+            response = JSONResponse({"detail": "Server busy, try again shortly"}, status_code=503,
+                                    headers={"Retry-After": _retry_after(pool.timeout)})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release()
@@ -0,0 +1,324 @@
+"""Cold-storage archive for articles past the retention window.
+
+Cleanup moves expired rows here instead of dropping them. Each UTC day (by
+publish time) has two files in ARCHIVE_DIR:
+
+* ``YYYY-MM-DD.seg``: append-only segment of compressed blocks. Each block
+  is one cleanup batch as JSON lines, compressed with zstd (when the
+  ``zstandard`` package is installed) or zlib.
+* ``YYYY-MM-DD.idx``: sidecar index with one fixed-size record per
+  article (publish time, SHA-256 article hash, block offset/length, row in
+  block, codec), sorted by time. It is rewritten and swapped in atomically
+  after the block is on disk, so readers always see a consistent index.
+
+Reads memory-map both files and binary-search the index for the time
+range, so only the blocks that hold matching rows are decompressed.
+Article hashes already in a day's index are skipped on append, so a batch
+archived just before a crash can be re-run safely.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.cache import cached_json
+from app.config import ARCHIVE_DIR
+from app.database import SessionLocal
+from app.models import Article, ArticleContent, Category
+
+try:
+    import zstandard
+except ImportError:  # optional: zlib is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+BATCH_ROWS = 5000  # rows moved per cleanup step (and per block)
+MAX_LIMIT = 1000
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+# published (µs since epoch), article hash, block offset, block length, row in block, codec
+INDEX_RECORD = struct.Struct("<q32sQIHB")
+EPOCH = datetime(1970, 1, 1)
+
+_write_lock = threading.Lock()
+
+
+def _micros(ts: datetime) -> int:
+    return (ts - EPOCH) // timedelta(microseconds=1)
+
+
+def _iso(ts):
+    return ts.isoformat() + "Z" if ts else None
+
+
+def _naive_utc(ts):
+    if ts is not None and ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _digest(article_hash: str) -> bytes:
+    try:
+        return bytes.fromhex(article_hash)[:32].ljust(32, b"\0")
+    except (TypeError, ValueError):
+        return hashlib.sha256((article_hash or "").encode()).digest()
+
+
+def _compress(data: bytes):
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=10).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, 9)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Archive block is zstd-compressed; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _paths(day: str):
+    return os.path.join(ARCHIVE_DIR, f"{day}.seg"), os.path.join(ARCHIVE_DIR, f"{day}.idx")
+
+
+def _read_index(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return b""
+    return data[:len(data) - len(data) % INDEX_RECORD.size]
+
+
+# ===== WRITING =====
+
+def expired(cutoff: datetime, limit: int = BATCH_ROWS):
+    """The oldest articles published before ``cutoff``, as archive records"""
+    db = SessionLocal()
+    try:
+        categories = {c.id: c.name for c in db.query(Category).all()}
+        rows = (
+            db.query(Article, ArticleContent.content)
+            .outerjoin(ArticleContent, ArticleContent.article_id == Article.id)
+            .filter(Article.timestamp < cutoff)
+            .order_by(Article.timestamp)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "id": a.id,
+                "hash": a.article_hash,
+                "title": a.title,
+                "url": a.link,
+                "summary": content or a.description or "",
+                "source": a.source_name,
+                "source_id": a.source_id,
+                "category": categories.get(a.category_id),
+                "category_id": a.category_id,
+                "published_at": _iso(a.timestamp),
+                "fetched_at": _iso(a.fetched_at),
+                "severity": a.severity or 0,
+                "tags": [t for t in (a.tags or "").split(",") if t],
+                "_ts": a.timestamp or a.fetched_at or cutoff,
+            }
+            for a, content in rows
+        ]
+    finally:
+        db.close()
+
+
+def append(records) -> int:
+    """Write records to their day segments (blocking; run in a thread). Returns rows newly archived."""
+    by_day = {}
+    for record in records:
+        by_day.setdefault(record["_ts"].date().isoformat(), []).append(record)
+
+    written = 0
+    with _write_lock:
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        for day, rows in sorted(by_day.items()):
+            written += _append_day(day, rows)
+    return written
+
+
+def _append_day(day: str, rows) -> int:
+    segment_path, index_path = _paths(day)
+    index = _read_index(index_path)
+    known = {index[i + 8:i + 40] for i in range(0, len(index), INDEX_RECORD.size)}
+
+    fresh = []
+    for row in sorted(rows, key=lambda r: r["_ts"]):
+        digest = _digest(row["hash"])
+        if digest not in known:
+            known.add(digest)
+            fresh.append((row, digest))
+    if not fresh:
+        return 0
+
+    lines = b"\n".join(
+        json.dumps({k: v for k, v in row.items() if k != "_ts"}, separators=(",", ":")).encode()
+        for row, _ in fresh
+    )
+    codec, block = _compress(lines)
+    with open(segment_path, "ab") as f:
+        offset = f.seek(0, os.SEEK_END)
+        f.write(block)
+        f.flush()
+        os.fsync(f.fileno())
+
+    entries = [
+        (_micros(row["_ts"]), digest, offset, len(block), position, codec)
+        for position, (row, digest) in enumerate(fresh)
+    ]
+    entries.extend(INDEX_RECORD.iter_unpack(index))
+    entries.sort(key=lambda e: e[0])
+    temporary = index_path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(b"".join(INDEX_RECORD.pack(*e) for e in entries))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, index_path)
+    return len(fresh)
+
+
+# ===== READING =====
+
+def _map(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _bisect(index, count: int, micros: int) -> int:
+    """First record at or after ``micros``"""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if struct.unpack_from("<q", index, mid * INDEX_RECORD.size)[0] < micros:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def days(since: date = None, until: date = None):
+    """Archived days in range, newest first"""
+    try:
+        names = os.listdir(ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    found = sorted((n[:-4] for n in names if n.endswith(".idx")), reverse=True)
+    return [
+        d for d in found
+        if (since is None or d >= since.isoformat()) and (until is None or d <= until.isoformat())
+    ]
+
+
+def search(since: datetime = None, until: datetime = None, article_hash: str = None, match=None,
+           limit: int = 100):
+    """Archived articles in [since, until), newest first, that pass ``match(record)``"""
+    low = _micros(since) if since else None
+    high = _micros(until) if until else None
+    digest = _digest(article_hash) if article_hash else None
+    results = []
+
+    for day in days(since.date() if since else None, until.date() if until else None):
+        segment_path, index_path = _paths(day)
+        index = _map(index_path)
+        if index is None:
+            continue
+        segment = _map(segment_path)
+        try:
+            count = len(index) // INDEX_RECORD.size
+            start = _bisect(index, count, low) if low is not None else 0
+            stop = _bisect(index, count, high) if high is not None else count
+            blocks = {}
+            for i in range(stop - 1, start - 1, -1):
+                _, entry_digest, offset, length, row, codec = INDEX_RECORD.unpack_from(index, i * INDEX_RECORD.size)
+                if digest is not None and entry_digest != digest:
+                    continue
+                if offset not in blocks:
+                    blocks[offset] = _decompress(codec, segment[offset:offset + length]).split(b"\n")
+                record = json.loads(blocks[offset][row])
+                if match is None or match(record):
+                    results.append(record)
+                    if len(results) >= limit or digest is not None:
+                        return results
+        finally:
+            index.close()
+            if segment is not None:
+                segment.close()
+    return results
+
+
+def segments():
+    """Per-day row counts and on-disk sizes"""
+    summary = []
+    for day in days():
+        segment_path, index_path = _paths(day)
+        index_bytes = os.path.getsize(index_path)
+        summary.append({
+            "day": day,
+            "articles": index_bytes // INDEX_RECORD.size,
+            "segment_bytes": os.path.getsize(segment_path) if os.path.exists(segment_path) else 0,
+            "index_bytes": index_bytes,
+        })
+    return summary
+
+
+@router.get("/api/archive")
+def get_archive(
+    request: Request,
+    since: datetime = None,
+    until: datetime = None,
+    q: str = None,
+    source: str = None,
+    category: str = None,
+    min_severity: int = None,
+    hash: str = None,
+    limit: int = 100,
+):
+    """Articles moved out of the live tables by cleanup, newest first (``since``/``until`` on publish time)"""
+    if not ARCHIVE_DIR:
+        raise HTTPException(status_code=404, detail="Archive is disabled (ARCHIVE_DIR is empty)")
+    since, until = _naive_utc(since), _naive_utc(until)
+    limit = max(1, min(limit, MAX_LIMIT))
+    needle = q.lower() if q else None
+
+    def match(record):
+        if needle and needle not in record["title"].lower() and needle not in record["summary"].lower():
+            return False
+        if source and source not in (record["source"], str(record["source_id"])):
+            return False
+        if category and category.lower() not in ((record["category"] or "").lower(), str(record["category_id"])):
+            return False
+        return min_severity is None or record["severity"] >= min_severity
+
+    def build():
+        try:
+            articles = search(since, until, hash, match, limit)
+        except RuntimeError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        return {"count": len(articles), "articles": articles}
+
+    return cached_json(request, ("archive",), build)
+
+
+@router.get("/api/archive/segments")
+def get_archive_segments(request: Request):
+    """Archived days with row counts and file sizes"""
+    return cached_json(request, ("archive",), lambda: {"directory": ARCHIVE_DIR, "days": segments()})
@@ -0,0 +1,201 @@
+"""Fingerprinted, precompressed frontend assets.
+
+``build`` copies app.js and styles.css to content-hashed names
+(``app.3f9c2a1b7d4e.js``), rewrites index.html to load those, and writes
+gzip (and, when the ``brotli`` package is installed, brotli) variants of all
+three next to them, plus a manifest.json of content ETags. The Railway image
+runs it at build time (``python -m app.assets static static-build``);
+otherwise the app builds into STATIC_BUILD_DIR at startup, reusing an
+earlier build when the sources haven't changed.
+
+``PrecompressedStaticFiles`` serves the build with the smallest variant the
+client accepts (``Vary: Accept-Encoding``), ``immutable`` caching for the
+hashed names and ``no-cache`` revalidation for everything else. Files that
+aren't part of the build (and the unhashed names old pages still ask for)
+come from the source directory.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ASSETS = ("app.js", "styles.css")  # fingerprinted; index.html is rewritten, not renamed
+INDEX = "index.html"
+MANIFEST = "manifest.json"
+HASH_CHARS = 12
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))  # preferred first
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write(path: str, data: bytes):
+    # Atomic, so a concurrent worker building the same directory never serves a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _variants(data: bytes):
+    yield ".gz", gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress(data, quality=11)
+
+
+def _sources(source_dir: str) -> dict:
+    sources = {}
+    for name in (*ASSETS, INDEX):
+        with open(os.path.join(source_dir, name), "rb") as f:
+            sources[name] = f.read()
+    return sources
+
+
+def _load_manifest(out_dir: str):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build(source_dir: str, out_dir: str) -> dict:
+    """Write the fingerprinted assets and their variants; returns the manifest"""
+    if os.path.realpath(out_dir) == os.path.realpath(source_dir):
+        raise ValueError("The build directory must not be the source directory")  # it's cleaned out
+    sources = _sources(source_dir)
+    source_hashes = {name: _digest(data) for name, data in sources.items()}
+    manifest = _load_manifest(out_dir)
+    if (manifest and manifest.get("sources") == source_hashes
+            and manifest.get("brotli") == (brotli is not None)
+            and all(os.path.exists(os.path.join(out_dir, name)) for name in manifest["etags"])):
+        return manifest
+
+    started = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    outputs, names = {}, {}
+    for name in ASSETS:
+        stem, ext = os.path.splitext(name)
+        names[name] = f"{stem}.{source_hashes[name][:HASH_CHARS]}{ext}"
+        outputs[names[name]] = sources[name]
+
+    index = sources[INDEX].decode("utf-8")
+    for name, hashed in names.items():
+        index = re.sub(rf'((?:src|href)=["\'])(?:\./)?{re.escape(name)}(["\'])', rf"\g<1>{hashed}\g<2>", index)
+    outputs[INDEX] = index.encode("utf-8")
+
+    etags = {}
+    for name, data in outputs.items():
+        _write(os.path.join(out_dir, name), data)
+        etags[name] = _digest(data)[:16]
+        for suffix, compressed in _variants(data):
+            _write(os.path.join(out_dir, name + suffix), compressed)
+            etags[name + suffix] = _digest(compressed)[:16]
+
+    manifest = {"sources": source_hashes, "assets": names, "brotli": brotli is not None, "etags": etags}
+    _write(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2).encode())
+
+    # Drop the previous build's hashed files
+    keep = set(etags) | {MANIFEST}
+    for name in os.listdir(out_dir):
+        if name not in keep and not name.startswith(".tmp-"):
+            os.remove(os.path.join(out_dir, name))
+
+    logger.info(f"Built static assets into {out_dir} in {(time.perf_counter() - started) * 1000:.0f} ms "
+                f"({', '.join(names.values())}{', no brotli' if brotli is None else ''})")
+    return manifest
+
+
+def _accepted(header: str) -> set:
+    """Codings from Accept-Encoding, leaving out those refused with q=0"""
+    codings = set()
+    for part in header.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if coding.strip():
+            codings.add(coding.strip())
+    return codings
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles over a ``build`` output, falling back to the source directory"""
+
+    def __init__(self, source_dir: str, build_dir: str):
+        try:
+            self.manifest = build(source_dir, build_dir)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Serving unprocessed static files, asset build failed: {e}")
+            self.manifest = {"assets": {}, "etags": {}}
+            build_dir = source_dir
+        super().__init__(directory=build_dir, html=True)
+        if build_dir != source_dir:
+            self.all_directories.append(source_dir)
+        self.build_dir = os.path.realpath(build_dir)
+        self.immutable = set(self.manifest["assets"].values())
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        name = os.path.basename(full_path)
+        built = os.path.dirname(os.path.realpath(full_path)) == self.build_dir and name in self.manifest["etags"]
+
+        headers = {"Cache-Control": IMMUTABLE if built and name in self.immutable else REVALIDATE}
+        path, media_type = full_path, None
+        if built and any(name + suffix in self.manifest["etags"] for _, suffix in ENCODINGS):
+            headers["Vary"] = "Accept-Encoding"
+            accepted = _accepted(request_headers.get("accept-encoding", ""))
+            for coding, suffix in ENCODINGS:
+                if coding in accepted and name + suffix in self.manifest["etags"]:
+                    path = full_path + suffix
+                    name += suffix
+                    headers["Content-Encoding"] = coding
+                    media_type = guess_type(full_path)[0] or "text/plain"
+                    stat_result = os.stat(path)
+                    break
+        if built:
+            headers["ETag"] = f'"{self.manifest["etags"][name]}"'
+
+        response = FileResponse(path, status_code=status_code, headers=headers, media_type=media_type,
+                                stat_result=stat_result, method=scope["method"])
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def is_not_modified(self, response_headers, request_headers) -> bool:
+        # Also match If-None-Match lists and weak validators, which the base class compares verbatim
+        if_none_match = request_headers.get("if-none-match")
+        etag = response_headers.get("etag")
+        if if_none_match and etag:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return etag in tags or "*" in tags
+        return super().is_not_modified(response_headers, request_headers)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m app.assets SOURCE_DIR OUT_DIR")
+    build(sys.argv[1], sys.argv[2])
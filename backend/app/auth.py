@@ -1,65 +1,374 @@
-"""Authentication and JWT token management for Phase 2."""
+"""Authentication and JWT token management for Phase 2.
 
+bcrypt costs 100-300 ms of CPU per hash on purpose, so the async helpers
+run it on a small dedicated thread pool (AUTH_HASH_WORKERS). Logins beyond
+that wait their turn without holding the event loop. Once
+AUTH_HASH_MAX_WAITING are already waiting, new ones get a 503 instead of
+piling up. Verified tokens are cached by SHA-256 digest (LRU, at most
+AUTH_TOKEN_CACHE_TTL seconds and never past the token's own ``exp``), so
+authenticated requests skip the decode, the HMAC check and the account
+lookup.
+
+There is no open sign-up for admins. The first one is created at startup
+from ADMIN_USERNAME/ADMIN_PASSWORD when the table is empty, or with
+``python -m app.auth create-admin USERNAME`` (password from ADMIN_PASSWORD
+or a prompt). Without a real SECRET_KEY no token is issued or accepted:
+the read-only API keeps working and every signed-in endpoint answers 503.
+
+Reader accounts (``User``, for personal timelines) sign in through
+/api/users/*. Their tokens carry ``user:<id>`` as the subject, and
+verify_token, which guards the admin endpoints, refuses them.
+"""
+
+import asyncio
+import getpass
+import hashlib
+import logging
 import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+
+import bcrypt
 import jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.exc import IntegrityError
+
+from app.config import (
+    ADMIN_PASSWORD, ADMIN_USERNAME, AUTH_HASH_MAX_WAITING, AUTH_HASH_WORKERS, AUTH_TOKEN_CACHE_SIZE,
+    AUTH_TOKEN_CACHE_TTL,
+)
+from app.database import SessionLocal
+from app.metrics import AUTH_HASH_SECONDS, AUTH_HASH_WAITING, AUTH_TOKEN_CACHE
+from app.models import Admin, User
+from app.schemas import AdminLoginRequest, LoginRequest, UserCreate
+
+logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+router = APIRouter()
 security = HTTPBearer()
 
 # JWT settings from environment
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+SECRET_KEY = os.getenv("SECRET_KEY", "")
+# Placeholders shipped in docs and examples; anyone can sign tokens with them
+PLACEHOLDER_KEYS = {"", "your-secret-key-change-in-production", "change-me-in-production"}
+TOKENS_ENABLED = SECRET_KEY not in PLACEHOLDER_KEYS
+MIN_PASSWORD_LENGTH = 8
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+BCRYPT_ROUNDS = 12
+USER_PREFIX = "user:"  # token subject of reader accounts; admin subjects are bare ids
+
+
+def _secret(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes (and newer releases refuse longer input)
+    return password.encode()[:72]
 
 
 def hash_password(password: str) -> str:
-    """Hash a password for secure storage."""
-    return pwd_context.hash(password)
+    """Hash a password for secure storage (blocking, prefer hash_password_async)."""
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (blocking, prefer verify_password_async)."""
+    try:
+        return bcrypt.checkpw(_secret(plain_password), hashed_password.encode())
+    except ValueError:
+        return False  # not a bcrypt hash
+
+
+# Checked against when the username is unknown, so both cases cost one bcrypt check
+# (hash of a random string nobody knows; precomputed to keep it out of startup)
+_DUMMY_HASH = "$2b$12$s7l24w1ucyh0yH7ZgCyT5.UuhLcR/6I7fUe1p7ZlFOhug0KHsu5Ue"
+
+
+class PasswordHasher:
+    """bcrypt on a bounded thread pool; callers beyond the pool size queue"""
+
+    def __init__(self, workers: int = AUTH_HASH_WORKERS, max_waiting: int = AUTH_HASH_MAX_WAITING):
+        self.workers = max(1, workers)
+        self.max_waiting = max_waiting
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self.waiting = 0
+
+    async def run(self, operation: str, func, *args):
+        if self.waiting >= self.max_waiting:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.waiting += 1
+        AUTH_HASH_WAITING.set(self.waiting)
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.waiting -= 1
+            AUTH_HASH_WAITING.set(self.waiting)
+            AUTH_HASH_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+
+hasher = PasswordHasher()
+
+
+async def hash_password_async(password: str) -> str:
+    return await hasher.run("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: Optional[str]) -> bool:
+    return await hasher.run("verify", verify_password, plain_password, hashed_password or _DUMMY_HASH)
+
+
+def _tokens_disabled():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Sign-in is disabled: the server has no SECRET_KEY configured",
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
+    if not TOKENS_ENABLED:
+        raise _tokens_disabled()
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
+
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
-    """Verify JWT token and return user ID."""
-    token = credentials.credentials
+class TokenCache:
+    """LRU of verified tokens: digest -> (user id, expiry as epoch seconds)"""
+
+    def __init__(self, size: int = AUTH_TOKEN_CACHE_SIZE, ttl: float = AUTH_TOKEN_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+
+    def get(self, digest: bytes, now: float):
+        entry = self.entries.get(digest)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self.entries[digest]
+            return None
+        self.entries.move_to_end(digest)
+        return entry[0]
+
+    def put(self, digest: bytes, user_id: str, exp: float, now: float):
+        if self.size <= 0:
+            return
+        self.entries[digest] = (user_id, min(exp, now + self.ttl))
+        self.entries.move_to_end(digest)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+token_cache = TokenCache()
+
+
+def _unauthorized(detail: str = "Invalid authentication credentials"):
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def _account_exists(subject: str) -> bool:
+    """Whether the admin or reader a token names still exists"""
+    is_user = subject.startswith(USER_PREFIX)
+    try:
+        account_id = int(subject[len(USER_PREFIX):] if is_user else subject)
+    except ValueError:
+        return False
+    db = SessionLocal()
+    try:
+        return db.get(User if is_user else Admin, account_id) is not None
+    finally:
+        db.close()
+
+
+def decode_token(token: str) -> str:
+    """Subject of a valid token for an existing account, from the cache when verified recently."""
+    if not TOKENS_ENABLED:
+        raise _tokens_disabled()
+    now = time.time()
+    digest = hashlib.sha256(token.encode()).digest()
+    user_id = token_cache.get(digest, now)
+    if user_id is not None:
+        AUTH_TOKEN_CACHE.inc(result="hit")
+        return user_id
+    AUTH_TOKEN_CACHE.inc(result="miss")
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
     except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired"
-        )
-    except jwt.JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
+        raise _unauthorized("Token has expired")
+    except jwt.InvalidTokenError:
+        raise _unauthorized()
+    user_id = payload.get("sub")
+    if not isinstance(user_id, str) or not _account_exists(user_id):
+        raise _unauthorized()
+    token_cache.put(digest, user_id, float(payload.get("exp", now)), now)
     return user_id
+
+
+def _admin_id(token: str) -> str:
+    subject = decode_token(token)
+    if subject.startswith(USER_PREFIX):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin sign-in required")
+    return subject
+
+
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    """Verify an admin JWT token and return the admin ID."""
+    return _admin_id(credentials.credentials)
+
+
+async def verify_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
+    """Verify a reader JWT token and return the user ID."""
+    return user_from_token(credentials.credentials)
+
+
+def user_from_token(token: str) -> int:
+    subject = decode_token(token)
+    if not subject.startswith(USER_PREFIX):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sign in with a user account")
+    return int(subject[len(USER_PREFIX):])
+
+
+def _find_admin(username: str):
+    db = SessionLocal()
+    try:
+        return db.query(Admin.id, Admin.hashed_password).filter(Admin.username == username).first()
+    finally:
+        db.close()
+
+
+def _check_admin(username: str, password: str):
+    if not username or len(password) < MIN_PASSWORD_LENGTH:
+        raise ValueError(f"Admins need a username and a password of at least {MIN_PASSWORD_LENGTH} characters")
+
+
+def insert_admin(username: str, hashed_password: str, only_if_none: bool = False) -> Optional[int]:
+    """Insert an admin; None when the username is taken or, with ``only_if_none``, any admin exists.
+
+    Checks and inserts in one transaction (callers on the loop must not await in between). The
+    username is unique, so of several processes starting at once only one inserts.
+    """
+    db = SessionLocal()
+    try:
+        existing = db.query(Admin.id)
+        if not only_if_none:
+            existing = existing.filter(Admin.username == username)
+        if existing.first():
+            return None
+        admin = Admin(username=username, hashed_password=hashed_password)
+        db.add(admin)
+        db.commit()
+        return admin.id
+    except IntegrityError:
+        db.rollback()
+        return None
+    finally:
+        db.close()
+
+
+async def ensure_admin():
+    """Create ADMIN_USERNAME from ADMIN_PASSWORD when there are no admins yet"""
+    if not TOKENS_ENABLED:
+        logger.error("SECRET_KEY is unset or a placeholder: admin and reader sign-in are disabled")
+    if not ADMIN_PASSWORD:
+        return
+    try:
+        _check_admin(ADMIN_USERNAME, ADMIN_PASSWORD)
+    except ValueError as e:
+        logger.error(f"ADMIN_PASSWORD ignored: {e}")
+        return
+    if await asyncio.to_thread(_find_admin, ADMIN_USERNAME):
+        return
+    hashed = await hash_password_async(ADMIN_PASSWORD)
+    if insert_admin(ADMIN_USERNAME, hashed, only_if_none=True) is not None:
+        logger.info(f"Created admin {ADMIN_USERNAME!r}")
+
+
+@router.post("/api/auth/login")
+async def login(body: AdminLoginRequest):
+    """Exchange admin credentials for a bearer token"""
+    admin = await asyncio.to_thread(_find_admin, body.username)
+    valid = await verify_password_async(body.password, admin.hashed_password if admin else None)
+    if not admin or not valid:
+        raise _unauthorized("Incorrect username or password")
+    return {"access_token": create_access_token({"sub": str(admin.id)}), "token_type": "bearer"}
+
+
+@router.get("/api/auth/me")
+async def me(user_id: str = Depends(verify_token)):
+    return {"id": int(user_id)}
+
+
+def _find_user(login: str):
+    db = SessionLocal()
+    try:
+        return (
+            db.query(User.id, User.hashed_password)
+            .filter((User.email == login) | (User.username == login))
+            .first()
+        )
+    finally:
+        db.close()
+
+
+@router.post("/api/users/register", status_code=201)
+async def register_user(body: UserCreate):
+    """Create a reader account (personal timeline and preferences)"""
+    if not body.username or len(body.password) < MIN_PASSWORD_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Username and a password of at least "
+                                                    f"{MIN_PASSWORD_LENGTH} characters are required")
+
+    hashed = await hash_password_async(body.password)
+    # No awaits between here and the commit (the SQLite connection is shared)
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter((User.email == body.email) | (User.username == body.username)).first():
+            raise HTTPException(status_code=409, detail="Email or username already registered")
+        user = User(email=body.email, username=body.username, hashed_password=hashed, keywords=[])
+        db.add(user)
+        db.commit()
+        return {"id": user.id, "email": user.email, "username": user.username}
+    finally:
+        db.close()
+
+
+@router.post("/api/users/login")
+async def login_user(body: LoginRequest):
+    """Exchange reader credentials (email or username) for a bearer token"""
+    user = await asyncio.to_thread(_find_user, body.email)
+    valid = await verify_password_async(body.password, user.hashed_password if user else None)
+    if not user or not valid:
+        raise _unauthorized("Incorrect email or password")
+    return {"access_token": create_access_token({"sub": f"{USER_PREFIX}{user.id}"}), "token_type": "bearer"}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if len(sys.argv) != 3 or sys.argv[1] != "create-admin":
+        sys.exit("usage: python -m app.auth create-admin USERNAME  (password from ADMIN_PASSWORD or a prompt)")
+    from app.database import init_db
+    username = sys.argv[2]
+    password = ADMIN_PASSWORD or getpass.getpass(f"Password for {username}: ")
+    try:
+        _check_admin(username, password)
+    except ValueError as e:
+        sys.exit(str(e))
+    init_db()
+    if insert_admin(username, hash_password(password)) is None:
+        sys.exit(f"Admin {username!r} already exists")
+    logger.info(f"Created admin {username!r}")
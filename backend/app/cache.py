@@ -0,0 +1,139 @@
+"""Response caching for read APIs.
+
+Each cached endpoint depends on one or more data namespaces ("articles",
+"sources", "categories"). Writers call bump_data_version() for what they
+changed; a cached response stays valid until one of its namespaces moves.
+The ETag is derived from those version counters, so If-None-Match can be
+answered with a 304 without touching the database.
+
+A response over a "last N hours" window also goes stale as time passes
+with no write at all. Those pass ``bucket=time_bucket()`` and compute the
+window from ``bucket_start(bucket)``, so the cached copy moves on every
+TIME_BUCKET_SECONDS.
+"""
+
+import gzip
+import hashlib
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.config import API_CACHE_MAX_AGE, API_CACHE_MAX_ENTRIES
+from app.metrics import HTTP_CACHE
+
+# Distinguishes ETags across restarts, when the counters start again from zero
+BOOT_ID = secrets.token_hex(4)
+
+GZIP_MIN_BYTES = 1024
+TIME_BUCKET_SECONDS = 60
+
+_versions = {}
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+
+def bump_data_version(*namespaces: str):
+    """Invalidate cached responses that depend on any of ``namespaces``"""
+    with _lock:
+        for ns in namespaces:
+            _versions[ns] = _versions.get(ns, 0) + 1
+
+
+def data_version(namespaces) -> str:
+    return ".".join(str(_versions.get(ns, 0)) for ns in namespaces)
+
+
+def time_bucket() -> int:
+    """Index of the current TIME_BUCKET_SECONDS slice of wall-clock time"""
+    return int(time.time() // TIME_BUCKET_SECONDS)
+
+
+def bucket_start(bucket: int) -> datetime:
+    """UTC time the ``bucket`` slice began (the "now" of a windowed response)"""
+    return datetime.utcfromtimestamp(bucket * TIME_BUCKET_SECONDS)
+
+
+def _cache_key(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def _etag(key: str, version: str) -> str:
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    return f'"{BOOT_ID}-{version}-{digest}"'
+
+
+def _matches(if_none_match: str, etags) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(tag in candidates for tag in etags)
+
+
+class _Entry:
+    __slots__ = ("version", "etag", "body", "gzip_body")
+
+    def __init__(self, version, etag, body, gzip_body):
+        self.version = version
+        self.etag = etag
+        self.body = body
+        self.gzip_body = gzip_body
+
+
+def cached_json(request: Request, namespaces, build, max_age: int = API_CACHE_MAX_AGE,
+                key: str = None, private: bool = False, bucket: int = None) -> Response:
+    """Serve ``build()`` as JSON through the version-keyed response cache.
+
+    The gzip representation gets its own ETag (suffix ``-gz``) as strong
+    ETags must differ between encodings. Per-user responses pass their own
+    ``key`` and ``private`` so shared caches don't keep them; time-windowed
+    ones pass the ``bucket`` their window was computed from.
+    """
+    key = key or _cache_key(request)
+    if bucket is not None:
+        key = f"{key}#t{bucket}"
+    version = data_version(namespaces)
+    etag = _etag(key, version)
+    gzip_etag = etag[:-1] + '-gz"'
+    headers = {
+        "Cache-Control": f"{'private' if private else 'public'}, max-age={max_age}, "
+                         f"stale-while-revalidate={max_age * 6}",
+        "Vary": "Accept-Encoding, Authorization" if private else "Accept-Encoding",
+    }
+
+    if _matches(request.headers.get("if-none-match"), (etag, gzip_etag)):
+        HTTP_CACHE.inc(result="not_modified")
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+
+    if entry is None or entry.version != version:
+        HTTP_CACHE.inc(result="miss")
+        body = json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode()
+        gzip_body = gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None
+        entry = _Entry(version, etag, body, gzip_body)
+        with _lock:
+            _entries[key] = entry
+            _entries.move_to_end(key)
+            while len(_entries) > API_CACHE_MAX_ENTRIES:
+                _entries.popitem(last=False)
+    else:
+        HTTP_CACHE.inc(result="hit")
+
+    if entry.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers.update({"ETag": gzip_etag, "Content-Encoding": "gzip"})
+        return Response(entry.gzip_body, media_type="application/json", headers=headers)
+
+    headers["ETag"] = entry.etag
+    return Response(entry.body, media_type="application/json", headers=headers)
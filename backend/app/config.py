@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,389 +8,73 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./intel.db")
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
 RSS_CHECK_INTERVAL = int(os.getenv("RSS_CHECK_INTERVAL", 5))
 MAX_ARTICLES_PER_FEED = int(os.getenv("MAX_ARTICLES_PER_FEED", 10))
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", 2))  # older articles (by publish time) are archived
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", 20))  # seconds
+FETCH_ON_STARTUP = os.getenv("FETCH_ON_STARTUP", "true").lower() == "true"
+API_CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", 5))  # seconds browsers/proxies may reuse a response
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", 256))
+FETCH_MIN_INTERVAL = float(os.getenv("FETCH_MIN_INTERVAL", 60))  # seconds between forced fetch cycles
+FETCH_JOB_HISTORY = int(os.getenv("FETCH_JOB_HISTORY", 50))
+REPLAY_LOG_SIZE = int(os.getenv("REPLAY_LOG_SIZE", 2000))  # stream messages kept for ?resume=
+CLIENT_SEND_QUEUE_SIZE = int(os.getenv("CLIENT_SEND_QUEUE_SIZE", 500))  # per-client backlog before disconnect
+SNAPSHOT_MAX_ARTICLES = int(os.getenv("SNAPSHOT_MAX_ARTICLES", 200))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", 15))
+PUBLIC_BASE_URL = os.getenv("PUBLIC_BASE_URL", "").rstrip("/")  # enables WebSub callbacks when set
+WEBSUB_LEASE_SECONDS = int(os.getenv("WEBSUB_LEASE_SECONDS", 7 * 24 * 3600))
+WEBSUB_SAFETY_POLL_MINUTES = int(os.getenv("WEBSUB_SAFETY_POLL_MINUTES", 60))  # polling of push-enabled sources
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", "")  # TSV replacing the bundled app/data/gazetteer.tsv
+TRIAGE_METHOD = os.getenv("TRIAGE_METHOD", "keyword").lower()  # keyword | ollama
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+TRIAGE_BATCH_SIZE = int(os.getenv("TRIAGE_BATCH_SIZE", 8))  # articles per model call
+TRIAGE_CONCURRENCY = int(os.getenv("TRIAGE_CONCURRENCY", 2))  # model calls in flight
+TRIAGE_QUEUE_SIZE = int(os.getenv("TRIAGE_QUEUE_SIZE", 1000))  # articles waiting before new ones keep keyword severity
+TRIAGE_TIMEOUT = float(os.getenv("TRIAGE_TIMEOUT", 120))  # seconds per model call
+TRENDING_WINDOW_MINUTES = int(os.getenv("TRENDING_WINDOW_MINUTES", 60))  # "right now"
+TRENDING_BASELINE_HOURS = int(os.getenv("TRENDING_BASELINE_HOURS", 24))  # what counts as normal
+TRENDING_BROADCAST_SECONDS = int(os.getenv("TRENDING_BROADCAST_SECONDS", 60))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archive")  # segments of expired articles; empty drops them instead
+ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")  # created at startup when there are no admins
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")  # that admin's password; unset creates none
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", 2))  # bcrypt threads; more logins than this queue
+AUTH_HASH_MAX_WAITING = int(os.getenv("AUTH_HASH_MAX_WAITING", 64))  # queued logins before answering 503
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 1024))  # verified tokens kept
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", 300))  # seconds before a token is re-verified
+FEED_STREAMING = os.getenv("FEED_STREAMING", "true").lower() == "true"  # incremental parse with early stop
+FEED_MAX_BYTES = int(os.getenv("FEED_MAX_BYTES", 5 * 1024 * 1024))  # feed bodies are not read past this
+ARTICLE_SUMMARY_CHARS = int(os.getenv("ARTICLE_SUMMARY_CHARS", 600))  # description stored with the article; 0 = untruncated
+STORE_FULL_CONTENT = os.getenv("STORE_FULL_CONTENT", "true").lower() == "true"  # keep longer descriptions in article_contents
+DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+READ_YOUR_WRITES = os.getenv("READ_YOUR_WRITES", "true").lower() == "true"  # keep reads on the primary until replicas catch up
+REPLICA_CHECK_SECONDS = int(os.getenv("REPLICA_CHECK_SECONDS", 5))  # replica health and replay position checks
+REPLICA_LAG_SECONDS = float(os.getenv("REPLICA_LAG_SECONDS", 5))  # assumed delay where it can't be measured
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", 2))  # per client, /api/* and /ws; 0 disables
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 20))  # requests a client may make at once
+# Proxies appending X-Forwarded-For; "auto" trusts one when the peer has a private/loopback address
+RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "auto").strip().lower()
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", 4))  # expensive handlers running; 0 = no cap
+ADMISSION_MAX_WAITING = int(os.getenv("ADMISSION_MAX_WAITING", 32))  # queued beyond that before answering 503
+ADMISSION_EXPORT_MAX_CONCURRENT = int(os.getenv("ADMISSION_EXPORT_MAX_CONCURRENT", 2))  # streaming exports, own pool
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 1))  # seconds a queued request waits
+WS_MAX_CLIENTS = int(os.getenv("WS_MAX_CLIENTS", 500))  # live WebSocket + SSE clients; 0 = no cap
+IMPORT_CONCURRENCY = int(os.getenv("IMPORT_CONCURRENCY", 16))  # feeds checked at once during a bulk import
+IMPORT_TIMEOUT = float(os.getenv("IMPORT_TIMEOUT", 10))  # seconds per candidate feed check
+IMPORT_MAX_SOURCES = int(os.getenv("IMPORT_MAX_SOURCES", 1000))  # sources per import request
+IMPORT_ALLOW_PRIVATE = os.getenv("IMPORT_ALLOW_PRIVATE", "false").lower() == "true"  # allow feeds on internal addresses
+TIMELINE_SIZE = int(os.getenv("TIMELINE_SIZE", 200))  # article ids kept per user timeline
+TIMELINE_CACHE_USERS = int(os.getenv("TIMELINE_CACHE_USERS", 1000))  # timelines kept in memory (LRU)
+TIMELINE_SCAN_ROWS = int(os.getenv("TIMELINE_SCAN_ROWS", 5000))  # newest articles scanned to rebuild a timeline
+DIAGNOSTICS_ENABLED = os.getenv("DIAGNOSTICS_ENABLED", "false").lower() == "true"  # mount /api/admin/diagnostics/*
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", 250))  # log event loop stalls over this; 0 = off
+DIAG_PROFILE_MAX_SECONDS = float(os.getenv("DIAG_PROFILE_MAX_SECONDS", 60))  # longest on-demand CPU profile
+DIAG_TRACEMALLOC_FRAMES = int(os.getenv("DIAG_TRACEMALLOC_FRAMES", 10))  # stack depth kept per allocation
+STATIC_BUILD_DIR = os.getenv(  # fingerprinted, precompressed frontend assets (built at startup if stale)
+    "STATIC_BUILD_DIR", os.path.join(tempfile.gettempdir(), "intel-terminal-static"))
 
-# Comprehensive RSS sources organized by category
-DEFAULT_SOURCES = [
-    # ===== CYBERSECURITY (Red) =====
-    {
-        "name": "BleepingComputer",
-        "url": "https://www.bleepingcomputer.com/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Krebs on Security",
-        "url": "https://krebsonsecurity.com/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Dark Reading",
-        "url": "https://www.darkreading.com/feeds/all.rss",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Securityweek",
-        "url": "https://www.securityweek.com/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "SANS Cyber Aces",
-        "url": "https://www.sans.org/cyber-academy/blog/feed.xml",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Recorded Future Insikt",
-        "url": "https://insikt-group.recorded-future.com/rss.xml",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    
-    # ===== GEOPOLITICAL (Cyan) =====
-    {
-        "name": "Reuters World",
-        "url": "https://feeds.reuters.com/Reuters/worldNews",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    {
-        "name": "BBC News World",
-        "url": "http://feeds.bbc.co.uk/news/world/rss.xml",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    {
-        "name": "Al Jazeera English",
-        "url": "https://www.aljazeera.com/xml/rss/all.xml",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    {
-        "name": "The Guardian World",
-        "url": "https://www.theguardian.com/world/rss",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    {
-        "name": "Associated Press",
-        "url": "https://apnews.com/apf-services/v2/homepage.rss",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    
-    # ===== TECHNOLOGY (Yellow) =====
-    {
-        "name": "Hacker News",
-        "url": "https://news.ycombinator.com/rss",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    {
-        "name": "TechCrunch",
-        "url": "http://feeds.techcrunch.com/TechCrunch/",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    {
-        "name": "The Verge",
-        "url": "https://www.theverge.com/rss/index.xml",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    {
-        "name": "ArXiv CS",
-        "url": "http://arxiv.org/rss/cs.all",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    {
-        "name": "InfoQ",
-        "url": "https://feed.infoq.com/",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    {
-        "name": "Ars Technica",
-        "url": "https://arstechnica.com/feed/",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    
-    # ===== OSINT (Green) =====
-    {
-        "name": "Bellingcat",
-        "url": "https://www.bellingcat.com/feed/",
-        "color": "#00ff00",
-        "category": "OSINT"
-    },
-    {
-        "name": "First Draft",
-        "url": "https://firstdraftnews.org/feed/",
-        "color": "#00ff00",
-        "category": "OSINT"
-    },
-    {
-        "name": "OSINT Combine",
-        "url": "https://www.osintcombine.com/feed",
-        "color": "#00ff00",
-        "category": "OSINT"
-    },
-    {
-        "name": "MITRE ATT&CK",
-        "url": "https://attack.mitre.org/resources/blog/rss.xml",
-        "color": "#00ff00",
-        "category": "OSINT"
-    },
-    
-    # ===== AI/ML (Purple) =====
-    {
-        "name": "OpenAI Blog",
-        "url": "https://openai.com/feed.xml",
-        "color": "#dd00ff",
-        "category": "AI/ML"
-    },
-    {
-        "name": "Anthropic News",
-        "url": "https://www.anthropic.com/news.rss",
-        "color": "#dd00ff",
-        "category": "AI/ML"
-    },
-    {
-        "name": "DeepMind Blog",
-        "url": "https://www.deepmind.com/blog/feed.xml",
-        "color": "#dd00ff",
-        "category": "AI/ML"
-    },
-    {
-        "name": "Papers With Code",
-        "url": "https://paperswithcode.com/latest/feed",
-        "color": "#dd00ff",
-        "category": "AI/ML"
-    },
-    {
-        "name": "Hugging Face Blog",
-        "url": "https://huggingface.co/blog/feed.xml",
-        "color": "#dd00ff",
-        "category": "AI/ML"
-    },
-    
-    # ===== PRIVACY/RIGHTS (Orange) =====
-    {
-        "name": "EFF Blog",
-        "url": "https://www.eff.org/feeds/rss",
-        "color": "#ff9900",
-        "category": "Privacy"
-    },
-    {
-        "name": "Access Now",
-        "url": "https://www.accessnow.org/feed/",
-        "color": "#ff9900",
-        "category": "Privacy"
-    },
-    {
-        "name": "Privacy International",
-        "url": "https://www.privacyinternational.org/feed",
-        "color": "#ff9900",
-        "category": "Privacy"
-    },
-    
-    # ===== INVESTIGATIVE JOURNALISM (Pink) =====
-    {
-        "name": "ProPublica",
-        "url": "https://www.propublica.org/feeds/big-story",
-        "color": "#ff1493",
-        "category": "Investigation"
-    },
-    {
-        "name": "The Intercept",
-        "url": "https://theintercept.com/feed/?lang=en",
-        "color": "#ff1493",
-        "category": "Investigation"
-    },
-    
-    # ===== HACKING/EXPLOITS (Red) =====
-    {
-        "name": "EXPLOIT-DB",
-        "url": "https://www.exploit-db.com/rss.xml",
-        "color": "#ff0000",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "NVD - NIST",
-        "url": "https://nvd.nist.gov/feeds/json/cve/1.1/nvdcve-1.1-recent.json",
-        "color": "#ff0000",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Packet Storm Security",
-        "url": "https://packetstormsecurity.com/files/rss/",
-        "color": "#ff0000",
-        "category": "Cybersecurity"
-    },
-    
-    # ===== NETWORKING/INFRASTRUCTURE =====
-    {
-        "name": "MikroTik Blog",
-        "url": "https://blog.mikrotik.com/feed/",
-        "color": "#00aaff",
-        "category": "Technology"
-    },
-    {
-        "name": "Cisco Talos",
-        "url": "https://blog.talosintelligence.com/feeds/posts/default",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Cloudflare Blog",
-        "url": "https://blog.cloudflare.com/rss/",
-        "color": "#ffff00",
-        "category": "Technology"
-    },
-    
-    # ===== SCIENCE (Blue) =====
-    {
-        "name": "NASA Breaking News",
-        "url": "https://www.nasa.gov/news-release/feed/",
-        "color": "#00aaff",
-        "category": "Science"
-    },
-    {
-        "name": "Nature News",
-        "url": "https://www.nature.com/nature.rss",
-        "color": "#00aaff",
-        "category": "Science"
-    },
-    {
-        "name": "Scientific American",
-        "url": "https://www.scientificamerican.com/feed/",
-        "color": "#00aaff",
-        "category": "Science"
-    },
-    {
-        "name": "Phys.org",
-        "url": "https://phys.org/rss-feed/",
-        "color": "#00aaff",
-        "category": "Science"
-    },
-    {
-        "name": "Space.com",
-        "url": "https://www.space.com/feeds/all",
-        "color": "#00aaff",
-        "category": "Science"
-    },
-    
-    # ===== CRYPTO/BLOCKCHAIN =====
-    {
-        "name": "CoinDesk",
-        "url": "https://www.coindesk.com/arc/outboundfeeds/rss/",
-        "color": "#ffd700",
-        "category": "Technology"
-    },
-    {
-        "name": "Decrypt",
-        "url": "https://decrypt.co/feed",
-        "color": "#ffd700",
-        "category": "Technology"
-    },
-    
-    # ===== THREAT INTEL/APT =====
-    {
-        "name": "Mandiant Blog",
-        "url": "https://www.mandiant.com/resources/blog/rss.xml",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Palo Alto Unit 42",
-        "url": "https://unit42.paloaltonetworks.com/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "CrowdStrike Blog",
-        "url": "https://www.crowdstrike.com/blog/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "SentinelOne Labs",
-        "url": "https://www.sentinelone.com/labs/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    
-    # ===== OBSCURE/NICHE =====
-    {
-        "name": "Schneier on Security",
-        "url": "https://www.schneier.com/feed/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Risky Business News",
-        "url": "https://risky.biz/feeds/risky-business/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Daniel Miessler",
-        "url": "https://danielmiessler.com/feed/",
-        "color": "#dd00ff",
-        "category": "AI/ML"
-    },
-    {
-        "name": "Troy Hunt",
-        "url": "https://www.troyhunt.com/rss/",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "WIRED Threat Level",
-        "url": "https://www.wired.com/feed/category/security/latest/rss",
-        "color": "#ff3333",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "ZeroDay Initiative",
-        "url": "https://www.zerodayinitiative.com/blog/feed/",
-        "color": "#ff0000",
-        "category": "Cybersecurity"
-    },
-    {
-        "name": "Google Project Zero",
-        "url": "https://googleprojectzero.blogspot.com/feeds/posts/default",
-        "color": "#ff0000",
-        "category": "Cybersecurity"
-    },
-    
-    # ===== INDEPENDENT/ALT NEWS =====
-    {
-        "name": "Hacks/Hackers",
-        "url": "https://www.hackshackers.com/feed/",
-        "color": "#ff1493",
-        "category": "Investigation"
-    },
-    {
-        "name": "Rest of World",
-        "url": "https://restofworld.org/feed/",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    {
-        "name": "Lawfare",
-        "url": "https://www.lawfareblog.com/rss.xml",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-    {
-        "name": "Foreign Policy",
-        "url": "https://foreignpolicy.com/feed/",
-        "color": "#00ffff",
-        "category": "Geopolitical"
-    },
-]
 
+def __getattr__(name):
+    # DEFAULT_SOURCES is large and only needed for seeding, so load it on first use
+    if name == "DEFAULT_SOURCES":
+        from app.default_sources import DEFAULT_SOURCES
+        return DEFAULT_SOURCES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
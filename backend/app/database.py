@@ -1,18 +1,166 @@
-from sqlalchemy import create_engine
+"""Engines and sessions.
+
+``SessionLocal`` always talks to the primary (DATABASE_URL). Read-only
+handlers use ``ReadSessionLocal``, which spreads sessions round-robin over
+the healthy replicas in DATABASE_REPLICA_URLS and falls back to the primary
+when there are none.
+
+Read-your-writes: every commit on the primary moves a write watermark, and
+a replica is only used once it has caught up with it. On Postgres that is
+known exactly: the health check (``check_replicas``, every
+REPLICA_CHECK_SECONDS) compares the replica's replayed WAL position with
+the primary's, and a lagging replica stays out of rotation however long
+ago the write was. Only for replicas whose position can't be queried is a
+write assumed visible after REPLICA_LAG_SECONDS. So articles from an ingest cycle are served from the
+primary until the replicas have them, and the response cache never stores
+a pre-ingest view under the post-ingest version.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL, DATABASE_REPLICA_URLS, READ_YOUR_WRITES, REPLICA_CHECK_SECONDS, REPLICA_LAG_SECONDS,
+)
+from app.metrics import DB_READ_SESSIONS, DB_REPLICA_HEALTHY
 from app.models import Base
 
-# For SQLite, use StaticPool for in-memory or file-based
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool if "sqlite" in DATABASE_URL else None
-)
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(url: str):
+    if "sqlite" in url:
+        # For SQLite, use StaticPool for in-memory or file-based
+        return create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return create_engine(url, pool_pre_ping=True)
+
+
+engine = _create_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
+
+def _lsn(value) -> int:
+    """Postgres WAL position ('16/B374D848') as a comparable integer"""
+    high, _, low = str(value).partition("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+class Replica:
+    def __init__(self, url: str):
+        parsed = make_url(url)
+        self.name = f"{parsed.host}:{parsed.port or ''}/{parsed.database}" if parsed.host else str(parsed.database)
+        self.engine = _create_engine(url)
+        self.healthy = False  # until the first check
+        self.synced_at = float("-inf")  # monotonic time of the last write known to be replayed
+        self.measured = False  # whether the last check could compare replay positions
+        event.listen(self.engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect and self.healthy:
+            logger.warning(f"Replica {self.name} disconnected, reading from the others until it recovers")
+            self._set_health(False)
+
+    def _set_health(self, healthy: bool):
+        self.healthy = healthy
+        DB_REPLICA_HEALTHY.set(1 if healthy else 0, replica=self.name)
+
+
+class ReadRouter:
+    """Picks the engine for each read-only session"""
+
+    def __init__(self, primary, replica_urls):
+        self.primary = primary
+        self.replicas = [Replica(url) for url in replica_urls]
+        self.last_write = float("-inf")
+        self._turn = itertools.count()
+        if self.replicas:
+            event.listen(primary, "commit", self._on_commit)
+
+    def _on_commit(self, conn):
+        self.last_write = time.monotonic()
+
+    def _caught_up(self, replica: Replica, now: float) -> bool:
+        if not READ_YOUR_WRITES:
+            return True
+        if replica.synced_at >= self.last_write:
+            return True
+        # Only a replica whose position can't be measured is trusted on elapsed time alone
+        return not replica.measured and now - self.last_write >= REPLICA_LAG_SECONDS
+
+    def read_engine(self):
+        now = time.monotonic()
+        eligible = [r for r in self.replicas if r.healthy and self._caught_up(r, now)]
+        if not eligible:
+            DB_READ_SESSIONS.inc(target="primary")
+            return self.primary
+        DB_READ_SESSIONS.inc(target="replica")
+        return eligible[next(self._turn) % len(eligible)].engine
+
+    def _primary_lsn(self):
+        if self.primary.dialect.name != "postgresql":
+            return None
+        try:
+            with self.primary.connect() as conn:
+                return _lsn(conn.execute(text("SELECT pg_current_wal_lsn()")).scalar())
+        except Exception as e:
+            logger.warning(f"Could not read the primary's WAL position: {e}")
+            return None
+
+    def check(self):
+        """Probe every replica (blocking; run in a thread)"""
+        started = time.monotonic()
+        primary_lsn = self._primary_lsn()
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    if replica.engine.dialect.name == "postgresql":
+                        replayed = conn.execute(text("SELECT pg_last_wal_replay_lsn()")).scalar()
+                        replica.measured = primary_lsn is not None and replayed is not None
+                        if replica.measured and _lsn(replayed) >= primary_lsn:
+                            replica.synced_at = started  # has everything committed before the check began
+                    else:
+                        conn.execute(text("SELECT 1"))
+                        replica.measured = False
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning(f"Replica {replica.name} failed its health check: {e}")
+                replica._set_health(False)
+            else:
+                if not replica.healthy:
+                    logger.info(f"Replica {replica.name} is serving reads")
+                replica._set_health(True)
+
+
+router = ReadRouter(engine, DATABASE_REPLICA_URLS)
+
+
+def ReadSessionLocal():
+    """Session for read-only work: a caught-up healthy replica, else the primary"""
+    return SessionLocal(bind=router.read_engine())
+
+
+async def check_replicas():
+    """Scheduled every REPLICA_CHECK_SECONDS when replicas are configured"""
+    await asyncio.to_thread(router.check)
+
+
+def dialect_insert(model):
+    """INSERT construct supporting ON CONFLICT for the configured dialect"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,285 @@
+"""Admin-only diagnostics of the running process.
+
+* ``GET /api/admin/diagnostics/profile``: samples every thread's stack for
+  N seconds and returns folded stacks (``root;caller;callee count``), the
+  input format of flamegraph.pl, speedscope and inferno
+* ``POST /api/admin/diagnostics/memory/snapshot``: tracemalloc snapshot
+  (tracing starts on the first call), with the top allocation sites and the
+  growth since the previous snapshot; ``DELETE .../memory`` stops tracing
+* ``GET /api/admin/diagnostics/tasks``: stacks of every asyncio task and
+  every other thread
+* ``GET /api/admin/diagnostics/stalls``: recent event loop stalls
+
+The endpoints are only mounted with DIAGNOSTICS_ENABLED=true; the stall
+watchdog runs either way.
+
+Stalls are found by a watchdog thread: a task on the loop ticks every
+``interval``, and when no tick has come for LOOP_STALL_THRESHOLD_MS the
+watchdog logs what the loop thread is executing at that moment, together
+with the task it is running. That names the synchronous call holding the
+loop (a ``feedparser.parse``, a ``requests.post``) while it is still in
+progress, which asyncio's debug-mode slow callback warning can't.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.auth import verify_token
+from app.config import LOOP_STALL_THRESHOLD_MS, DIAG_PROFILE_MAX_SECONDS, DIAG_TRACEMALLOC_FRAMES
+from app.metrics import LOOP_STALLS, LOOP_STALL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(verify_token)])
+
+STACK_LIMIT = 30  # frames kept per stack in dumps and stall reports
+STALLS_KEPT = 50
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _format_stack(frame, limit: int = STACK_LIMIT) -> list:
+    return [line.rstrip() for line in traceback.format_stack(frame, limit=limit)]
+
+
+def _task_label(task) -> str:
+    coro = task.get_coro()
+    return f"{task.get_name()} ({getattr(coro, '__qualname__', repr(coro))})"
+
+
+# ===== CPU PROFILE =====
+
+_profiling = threading.Lock()
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    """Folded stack -> samples, for every thread but the sampler (blocking)"""
+    own = threading.get_ident()
+    counts = Counter()
+    names = {}
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if ident not in names:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+@router.get("/api/admin/diagnostics/profile")
+async def cpu_profile(seconds: float = 10, interval_ms: float = 10):
+    """Sampling CPU profile of the whole process as folded stacks"""
+    seconds = max(0.1, min(seconds, DIAG_PROFILE_MAX_SECONDS))
+    interval = max(1, interval_ms) / 1000
+    if not _profiling.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already being captured")
+    try:
+        counts = await asyncio.to_thread(sample_stacks, seconds, interval)
+    finally:
+        _profiling.release()
+    folded = "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+    return PlainTextResponse(folded, headers={"Content-Disposition": 'attachment; filename="profile.folded"'})
+
+
+# ===== MEMORY =====
+
+class MemoryTracker:
+    """tracemalloc snapshots, each compared with the one before"""
+
+    FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self):
+        self.previous = None
+        self.taken_at = None
+
+    @staticmethod
+    def _stat(stat, key_type: str) -> dict:
+        entry = {
+            "where": str(stat.traceback[0]) if key_type != "traceback" else stat.traceback.format(),
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        if hasattr(stat, "size_diff"):
+            entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+            entry["count_diff"] = stat.count_diff
+        return entry
+
+    def snapshot(self, limit: int, key_type: str) -> dict:
+        """Blocking: taking and comparing snapshots can take a while with many traces"""
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(DIAG_TRACEMALLOC_FRAMES)
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+        result = {
+            "started_tracing": started,
+            "traced_kb": current // 1024,
+            "peak_kb": peak // 1024,
+            "top": [self._stat(s, key_type) for s in snapshot.statistics(key_type)[:limit]],
+        }
+        if self.previous is not None:
+            result["since"] = self.taken_at
+            result["diff"] = [self._stat(s, key_type) for s in snapshot.compare_to(self.previous, key_type)[:limit]]
+        self.previous = snapshot
+        self.taken_at = datetime.utcnow().isoformat() + "Z"
+        return result
+
+    def stop(self):
+        self.previous = None
+        self.taken_at = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+memory = MemoryTracker()
+
+
+@router.post("/api/admin/diagnostics/memory/snapshot")
+async def memory_snapshot(limit: int = 25, group: str = "lineno"):
+    """Top allocation sites, and growth since the previous snapshot (group: lineno | filename | traceback)"""
+    if group not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=400, detail="group must be lineno, filename or traceback")
+    return await asyncio.to_thread(memory.snapshot, max(1, min(limit, 200)), group)
+
+
+@router.delete("/api/admin/diagnostics/memory")
+def memory_stop():
+    """Stop tracing allocations (tracemalloc slows every allocation while it runs)"""
+    memory.stop()
+    return {"tracing": False}
+
+
+# ===== TASKS =====
+
+@router.get("/api/admin/diagnostics/tasks")
+async def task_dump():
+    """Where every asyncio task is suspended, and what the other threads are running"""
+    tasks = []
+    for task in asyncio.all_tasks():
+        stack = task.get_stack(limit=STACK_LIMIT)
+        tasks.append({
+            "task": _task_label(task),
+            "done": task.done(),
+            "stack": [f"{f.f_code.co_filename}:{f.f_lineno} in {f.f_code.co_name}" for f in stack],
+        })
+    tasks.sort(key=lambda t: t["task"])
+
+    own = threading.get_ident()
+    frames = sys._current_frames()
+    threads = [
+        {"thread": t.name, "daemon": t.daemon, "stack": _format_stack(frames[t.ident])}
+        for t in threading.enumerate() if t.ident != own and t.ident in frames
+    ]
+    return {"tasks": tasks, "threads": threads, "stalls": len(watchdog.stalls)}
+
+
+# ===== LOOP STALLS =====
+
+class LoopWatchdog:
+    """Logs event loop stalls over ``threshold_ms`` with the loop thread's stack"""
+
+    def __init__(self, threshold_ms: float = LOOP_STALL_THRESHOLD_MS):
+        self.threshold = threshold_ms / 1000
+        self.interval = min(0.1, self.threshold / 2)
+        self.stalls = deque(maxlen=STALLS_KEPT)
+        self.last_tick = time.monotonic()
+        self.loop = None
+        self.loop_thread = None
+        self.heartbeat = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    async def _tick(self):
+        while True:
+            self.last_tick = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start watching the running loop (LOOP_STALL_THRESHOLD_MS=0 disables)"""
+        if self.threshold <= 0 or self.thread is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self.heartbeat = asyncio.create_task(self._tick(), name="loop-watchdog")
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.heartbeat.cancel()
+        self.thread.join(timeout=1)
+        self.thread = None
+
+    def _watch(self):
+        stalled_since = None  # tick the current stall started after
+        while not self.stopping.wait(self.interval):
+            tick = self.last_tick
+            behind = time.monotonic() - tick - self.interval
+            if stalled_since is not None and tick != stalled_since:
+                self._ended(stalled_since, tick)
+                stalled_since = None
+            if stalled_since is None and behind >= self.threshold:
+                stalled_since = tick
+                self._began(behind)
+
+    def _began(self, behind: float):
+        frame = sys._current_frames().get(self.loop_thread)
+        task = asyncio.current_task(self.loop)
+        stall = {
+            "at": datetime.utcnow().isoformat() + "Z",
+            "task": _task_label(task) if task is not None else None,
+            "stack": _format_stack(frame) if frame is not None else [],
+            "duration_ms": None,  # filled in once the loop runs again
+        }
+        self.stalls.append(stall)
+        where = stall["stack"][-1].strip().replace("\n", " | ") if stall["stack"] else "?"
+        logger.warning(
+            f"Event loop blocked for over {behind * 1000:.0f} ms in {stall['task'] or 'a callback'} at {where}\n"
+            + "\n".join(stall["stack"])
+        )
+
+    def _ended(self, stalled_since: float, resumed: float):
+        duration = resumed - stalled_since - self.interval
+        LOOP_STALLS.inc()
+        LOOP_STALL_SECONDS.observe(duration)
+        if self.stalls:
+            self.stalls[-1]["duration_ms"] = round(duration * 1000)
+        logger.info(f"Event loop was blocked for {duration * 1000:.0f} ms")
+
+
+watchdog = LoopWatchdog()
+
+
+@router.get("/api/admin/diagnostics/stalls")
+def recent_stalls():
+    """The last event loop stalls, newest first, with the stack that held the loop"""
+    return {"threshold_ms": watchdog.threshold * 1000, "stalls": list(reversed(watchdog.stalls))}
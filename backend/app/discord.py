@@ -1,6 +1,7 @@
 import requests
 import logging
 from app.config import DISCORD_WEBHOOK_URL
+from app.metrics import DISCORD_DISPATCH
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +9,7 @@ async def send_discord_alert(title: str, link: str, source: str, severity: int =
     """Send alert to Discord webhook"""
     
     if not DISCORD_WEBHOOK_URL:
+        DISCORD_DISPATCH.inc(outcome="skipped")
         logger.debug("Discord webhook not configured")
         return
     
@@ -44,6 +46,11 @@ async def send_discord_alert(title: str, link: str, source: str, severity: int =
     try:
         response = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=5)
         response.raise_for_status()
+        DISCORD_DISPATCH.inc(outcome="sent")
         logger.info(f"Discord alert sent: {title[:50]}")
+    except requests.HTTPError as e:
+        DISCORD_DISPATCH.inc(outcome="rejected")
+        logger.error(f"Failed to send Discord alert: {e}")
     except Exception as e:
+        DISCORD_DISPATCH.inc(outcome="error")
         logger.error(f"Failed to send Discord alert: {e}")
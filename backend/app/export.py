@@ -0,0 +1,252 @@
+"""Streaming bulk export of articles (NDJSON, CSV, Parquet).
+
+Rows are read CHUNK_ROWS at a time and encoded as they arrive, so an export
+of any size runs in constant memory. The sync generator runs in Starlette's
+threadpool, so other requests are not blocked. On PostgreSQL the query uses
+a server-side cursor (``yield_per``). SQLite shares one connection across
+sessions (StaticPool), so a cursor left open there would interleave with
+ingest commits. Instead it is read in keyset-paginated chunks (id > last
+id), each in its own short session.
+Parquet needs the optional ``pyarrow`` package.
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+
+from app.database import ReadSessionLocal, SessionLocal, router as read_router
+from app.models import Article, ArticleContent, Category, Source
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+CHUNK_ROWS = 1000
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+FIELDS = ["id", "title", "url", "summary", "source", "category", "published_at", "fetched_at", "severity", "tags"]
+COLUMNS = (  # summary: the full text where ingest truncated the description
+    Article.id, Article.title, Article.link, func.coalesce(ArticleContent.content, Article.description),
+    Article.source_name,
+    Article.category_id, Article.timestamp, Article.fetched_at, Article.severity, Article.tags,
+)
+
+
+def _iso(ts):
+    return ts.isoformat() + "Z" if ts else None
+
+
+def _naive_utc(ts):
+    """Timestamps are stored as naive UTC; convert aware query params to match"""
+    if ts is not None and ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _filtered(query, since, until, category_id, source, min_severity):
+    if since:
+        query = query.filter(Article.timestamp >= since)
+    if until:
+        query = query.filter(Article.timestamp < until)
+    if category_id is not None:
+        query = query.filter(Article.category_id == category_id)
+    if source is not None:
+        query = query.filter(Article.source_id == source if isinstance(source, int) else Article.source_name == source)
+    if min_severity is not None:
+        query = query.filter(Article.severity >= min_severity)
+    return query
+
+
+def _query(db):
+    return db.query(*COLUMNS).outerjoin(ArticleContent, ArticleContent.article_id == Article.id)
+
+
+def _chunks(filters, limit):
+    """Lists of up to CHUNK_ROWS result tuples, in id order"""
+    remaining = limit
+    bind = read_router.read_engine()  # one database for the whole export
+    if bind.dialect.name != "sqlite":
+        db = SessionLocal(bind=bind)
+        try:
+            query = _filtered(_query(db), *filters).order_by(Article.id)
+            if remaining:
+                query = query.limit(remaining)
+            rows = query.execution_options(yield_per=CHUNK_ROWS)
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == CHUNK_ROWS:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            db.close()
+        return
+
+    last_id = 0
+    while remaining is None or remaining > 0:
+        size = CHUNK_ROWS if remaining is None else min(CHUNK_ROWS, remaining)
+        db = SessionLocal(bind=bind)
+        try:
+            chunk = (
+                _filtered(_query(db), *filters)
+                .filter(Article.id > last_id)
+                .order_by(Article.id)
+                .limit(size)
+                .all()
+            )
+        finally:
+            db.close()
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1][0]
+        if remaining is not None:
+            remaining -= len(chunk)
+        if len(chunk) < size:
+            return
+
+
+def _records(chunk, categories):
+    for id_, title, link, description, source, category_id, ts, fetched_at, severity, tags in chunk:
+        yield {
+            "id": id_,
+            "title": title,
+            "url": link,
+            "summary": description or "",
+            "source": source,
+            "category": categories.get(category_id),
+            "published_at": ts,
+            "fetched_at": fetched_at,
+            "severity": severity or 0,
+            "tags": [t for t in (tags or "").split(",") if t],
+        }
+
+
+def _ndjson(chunks, categories):
+    for chunk in chunks:
+        yield "".join(
+            json.dumps({**r, "published_at": _iso(r["published_at"]), "fetched_at": _iso(r["fetched_at"])}) + "\n"
+            for r in _records(chunk, categories)
+        ).encode()
+
+
+def _csv(chunks, categories):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for chunk in chunks:
+        for r in _records(chunk, categories):
+            writer.writerow([
+                r["id"], r["title"], r["url"], r["summary"], r["source"], r["category"] or "",
+                _iso(r["published_at"]) or "", _iso(r["fetched_at"]) or "", r["severity"], ",".join(r["tags"]),
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file whose bytes are collected and handed out by ``drain()``"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def _parquet(chunks, categories):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("title", pa.string()), ("url", pa.string()), ("summary", pa.string()),
+        ("source", pa.string()), ("category", pa.string()), ("published_at", pa.timestamp("us")),
+        ("fetched_at", pa.timestamp("us")), ("severity", pa.int32()), ("tags", pa.list_(pa.string())),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        # One row group per chunk, flushed to the client as soon as it's encoded
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(list(_records(chunk, categories)), schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {"ndjson": _ndjson, "csv": _csv, "parquet": _parquet}
+
+
+@router.get("/api/export/{fmt}")
+def export_articles(
+    fmt: str,
+    since: datetime = None,
+    until: datetime = None,
+    category: str = None,
+    source: str = None,
+    min_severity: int = None,
+    limit: int = None,
+):
+    """Stream every matching article, oldest first (``since``/``until`` filter on publish time)"""
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=404, detail=f"Unknown export format, use one of: {', '.join(FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export needs the pyarrow package")
+    since, until = _naive_utc(since), _naive_utc(until)
+
+    db = ReadSessionLocal()
+    try:
+        categories = {c.id: c.name for c in db.query(Category).all()}
+        category_id = None
+        if category:
+            category_id = int(category) if category.isdigit() else next(
+                (cid for cid, name in categories.items() if name.lower() == category.lower()), -1
+            )
+        if source and source.isdigit():
+            source = int(source)
+        elif source and not db.query(Source.id).filter(Source.name == source).first():
+            raise HTTPException(status_code=404, detail="Source not found")
+    finally:
+        db.close()
+
+    filters = (since, until, category_id, source, min_severity)
+    chunks = _chunks(filters, limit if limit and limit > 0 else None)
+    filename = f"articles-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{fmt}"
+    return StreamingResponse(
+        ENCODERS[fmt](chunks, categories),
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
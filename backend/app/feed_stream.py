@@ -0,0 +1,215 @@
+"""Incremental, size-bounded RSS/Atom fetching.
+
+feedparser downloads the whole document and builds every entry before
+ingest keeps the first MAX_ARTICLES_PER_FEED. This reads the response in
+chunks through an XMLPullParser and builds entries one at a time, as they
+close. Feeds are newest-first, so it stops reading once it has ``limit``
+entries or ``stop(entry)`` says the entry is already stored. The body is
+never read past FEED_MAX_BYTES.
+
+The result mimics what ingest reads from ``feedparser.parse`` (a
+FeedParserDict with ``entries``, ``feed.links``, ``status``, ``etag``,
+``modified`` and ``bozo``). Documents expat can't handle (broken markup,
+unknown entities, exotic encodings) go to feedparser with the same bytes,
+and so do non-HTTP URLs.
+"""
+
+import calendar
+import logging
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from app.config import FEED_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+CHUNK_BYTES = 64 * 1024
+TIMEOUT = 30  # seconds, connect and between reads
+USER_AGENT = "intel-terminal/1.0"
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+RSS1 = "{http://purl.org/rss/1.0/}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+ENTRY_TAGS = {"item", f"{ATOM}entry", f"{RSS1}item"}
+LINK_TAGS = {"link", f"{ATOM}link"}
+TITLE_TAGS = {"title", f"{ATOM}title", f"{RSS1}title"}  # not itunes:title, media:title, ...
+
+
+class _Truncated(Exception):
+    """Enough entries read; stop downloading"""
+
+
+def _text(elem):
+    return "".join(elem.itertext()).strip() if elem is not None else ""
+
+
+def _struct_time(value: str):
+    """RFC 822 or ISO 8601 date as a UTC struct_time, like feedparser's *_parsed fields"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return time.gmtime(calendar.timegm(parsed.utctimetuple()))
+
+
+def _entry(elem):
+    from feedparser import FeedParserDict
+
+    fields = {"id": elem.get(RDF_ABOUT)}
+    links = []
+    permalink = None
+    for child in elem:
+        tag = child.tag
+        if tag in LINK_TAGS or tag == f"{RSS1}link":
+            href = child.get("href")
+            if href is None:
+                href = _text(child)
+            if href:
+                links.append({"rel": child.get("rel", "alternate"), "href": href})
+        elif tag in TITLE_TAGS:
+            fields["title"] = _text(child)
+        elif tag in ("description", f"{ATOM}summary", f"{RSS1}description"):
+            fields["summary"] = _text(child)
+        elif tag in (f"{ATOM}content", f"{CONTENT}encoded"):
+            fields.setdefault("content", _text(child))
+        elif tag in ("guid", f"{ATOM}id"):
+            fields["id"] = _text(child)
+            if tag == "guid" and child.get("isPermaLink", "true") == "true":
+                permalink = fields["id"]
+        elif tag in ("pubDate", f"{ATOM}published"):
+            fields.setdefault("published_parsed", _struct_time(_text(child)))
+        elif tag in (f"{ATOM}updated", f"{DC}date"):  # feedparser reads dc:date as the update time
+            fields["updated_parsed"] = _struct_time(_text(child))
+
+    entry = FeedParserDict(
+        title=fields.get("title", ""),
+        summary=fields.get("summary") or fields.get("content", ""),
+        links=links,
+    )
+    # Like feedparser, an RSS item without <link> uses its guid unless isPermaLink="false"
+    link = next((l["href"] for l in links if l["rel"] == "alternate"), None) or permalink
+    if link:
+        entry["link"] = link
+    for key in ("id", "published_parsed", "updated_parsed"):
+        if fields.get(key):
+            entry[key] = fields[key]
+    return entry
+
+
+class StreamingFeedParser:
+    """Feed bytes in with ``feed()``; entries are built as each one closes"""
+
+    def __init__(self, limit: int, stop=None):
+        self.limit = limit
+        self.stop = stop
+        self.parser = ET.XMLPullParser(events=("start", "end"))
+        self.entries = []
+        self.feed_links = []
+        self.depth = 0  # open entry elements
+        self.done = False
+
+    def feed(self, data: bytes):
+        self.parser.feed(data)
+        for event, elem in self.parser.read_events():
+            if event == "start":
+                if elem.tag in ENTRY_TAGS:
+                    self.depth += 1
+                continue
+            if elem.tag in ENTRY_TAGS:
+                self.depth -= 1
+                entry = _entry(elem)
+                elem.clear()  # drop the subtree, it's been copied into ``entry``
+                if self.stop is not None and self.stop(entry):
+                    self.done = True
+                else:
+                    self.entries.append(entry)
+                    self.done = len(self.entries) >= self.limit
+                if self.done:
+                    raise _Truncated()
+            elif self.depth == 0 and elem.tag in LINK_TAGS and elem.get("href"):
+                self.feed_links.append({"rel": elem.get("rel", "alternate"), "href": elem.get("href")})
+
+    def close(self):
+        self.parser.close()
+
+
+def _result(entries, links, status, headers):
+    from feedparser import FeedParserDict
+
+    return FeedParserDict(
+        entries=entries,
+        feed=FeedParserDict(links=links),
+        status=status,
+        etag=headers.get("ETag"),
+        modified=headers.get("Last-Modified"),
+        bozo=False,
+        bozo_exception=None,
+    )
+
+
+def _fallback(body: bytes, status: int, headers):
+    import feedparser
+
+    feed = feedparser.parse(body, response_headers={k.lower(): v for k, v in headers.items()})
+    feed["status"] = status
+    feed["etag"] = headers.get("ETag")
+    feed["modified"] = headers.get("Last-Modified")
+    return feed
+
+
+def fetch(url: str, etag: str = None, modified: str = None, limit: int = 10, stop=None,
+          max_bytes: int = FEED_MAX_BYTES):
+    """Download and parse a feed incrementally (blocking; run in a thread).
+
+    ``stop(entry)`` returning True ends the read before that entry: it
+    and everything older are already known.
+    """
+    if not url.startswith(("http://", "https://")):
+        import feedparser
+        return feedparser.parse(url, etag=etag, modified=modified)
+
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+
+    with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        if response.status_code == 304:
+            return _result([], [], 304, response.headers)
+        response.raise_for_status()
+
+        parser = StreamingFeedParser(limit, stop)
+        received = bytearray()  # kept for the feedparser fallback
+        try:
+            for chunk in response.iter_content(CHUNK_BYTES):
+                received += chunk
+                if len(received) > max_bytes:
+                    logger.warning(f"Feed {url} is over {max_bytes} bytes, keeping what was parsed")
+                    break
+                parser.feed(chunk)
+            else:
+                parser.close()
+        except _Truncated:
+            pass
+        except ET.ParseError as e:
+            logger.debug(f"Streaming parse of {url} failed ({e}), falling back to feedparser")
+            for chunk in response.iter_content(CHUNK_BYTES):
+                received += chunk
+                if len(received) > max_bytes:
+                    break
+            return _fallback(bytes(received[:max_bytes]), response.status_code, response.headers)
+        return _result(parser.entries, parser.feed_links, response.status_code, response.headers)
@@ -0,0 +1,186 @@
+"""Single-flight coordination for RSS fetch cycles.
+
+Every trigger (scheduler, POST /api/fetch) goes through the coordinator:
+at most one cycle runs at a time, triggers that arrive while it runs join
+it (or are merged into one follow-up job when they ask for sources the
+running cycle doesn't cover, or force sources a scheduled cycle skips), and
+forced triggers that would add work are rate limited to one per
+FETCH_MIN_INTERVAL seconds, whichever sources they name.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.config import FETCH_MIN_INTERVAL, FETCH_JOB_HISTORY
+from app.database import SessionLocal
+from app.websocket import broadcast_fetch_job
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class FetchJob:
+    def __init__(self, source_ids=None, reason="manual", forced=True):
+        self.id = uuid.uuid4().hex[:12]
+        self.source_ids = set(source_ids) if source_ids else None  # None = all sources
+        self.reason = reason
+        self.forced = forced  # scheduled cycles poll WebSub-pushed sources less often
+        self.status = "queued"
+        self.new_articles = 0
+        self.error = None
+        self.requested_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.done = asyncio.Event()
+
+    def covers(self, source_ids) -> bool:
+        return self.source_ids is None or (source_ids is not None and set(source_ids) <= self.source_ids)
+
+    def merge(self, source_ids, forced=True):
+        self.forced = self.forced or forced
+        if self.source_ids is None or source_ids is None:
+            self.source_ids = None
+        else:
+            self.source_ids |= set(source_ids)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "reason": self.reason,
+            "source_ids": sorted(self.source_ids) if self.source_ids else None,
+            "new_articles": self.new_articles,
+            "error": self.error,
+            "requested_at": self.requested_at.isoformat() + "Z",
+            "started_at": self.started_at.isoformat() + "Z" if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() + "Z" if self.finished_at else None,
+        }
+
+
+class FetchCoordinator:
+    def __init__(self, min_interval: float = FETCH_MIN_INTERVAL, history: int = FETCH_JOB_HISTORY):
+        self.min_interval = min_interval
+        self.history = history
+        self.jobs = OrderedDict()
+        self.running: Optional[FetchJob] = None
+        self.pending: Optional[FetchJob] = None
+        self.last_forced_at = None  # monotonic time of the last forced cycle start
+        self._runner = None
+
+    def get(self, job_id: str) -> Optional[FetchJob]:
+        return self.jobs.get(job_id)
+
+    def retry_after(self) -> float:
+        if self.last_forced_at is None:
+            return 0.0
+        return max(0.0, self.min_interval - (time.monotonic() - self.last_forced_at))
+
+    def trigger(self, source_ids=None, forced=True, reason="manual"):
+        """Request a cycle. Returns (job, outcome) with outcome one of
+        started / joined / queued / throttled."""
+        # A scheduled cycle skips WebSub-pushed sources, so a forced trigger can't just join one
+        for job in (self.running, self.pending):
+            if job is not None and job.covers(source_ids) and (job.forced or not forced):
+                return job, "joined"
+
+        # Whatever sources it names, a forced trigger adds work: one per FETCH_MIN_INTERVAL
+        if forced and self.retry_after() > 0:
+            return next(reversed(self.jobs.values())), "throttled"
+
+        job, outcome = self._enqueue(source_ids, reason, forced)
+        if forced:
+            self.last_forced_at = time.monotonic()
+        return job, outcome
+
+    def follow_up(self, source_ids, reason="manual"):
+        """Queue a cycle for ``source_ids`` behind the running one, which may have loaded
+        its source list before they existed. Returns (job, outcome) like trigger()."""
+        return self._enqueue(source_ids, reason, forced=False)
+
+    def _enqueue(self, source_ids, reason, forced):
+        if self.pending is not None:
+            self.pending.merge(source_ids, forced)
+            job, outcome = self.pending, "joined"
+        else:
+            job = FetchJob(source_ids, reason, forced)
+            self._remember(job)
+            if self.running is None:
+                self.running = job
+                self._runner = asyncio.create_task(self._run_loop())
+                outcome = "started"
+            else:
+                self.pending = job
+                outcome = "queued"
+        return job, outcome
+
+    def _remember(self, job: FetchJob):
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.history:
+            self.jobs.popitem(last=False)
+
+    async def _run_loop(self):
+        while self.running is not None:
+            await self._run(self.running)
+            self.running, self.pending = self.pending, None
+
+    async def _run(self, job: FetchJob):
+        from app.rss_engine import fetch_and_process_feeds
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        await broadcast_fetch_job(job.to_dict())
+        db = SessionLocal()
+        try:
+            job.new_articles = await fetch_and_process_feeds(
+                db, sorted(job.source_ids) if job.source_ids else None, include_pushed=job.forced
+            )
+            job.status = "done"
+        except Exception as e:
+            logger.error(f"Fetch job {job.id} failed: {e}")
+            job.status = "error"
+            job.error = str(e)
+        finally:
+            db.close()
+            job.finished_at = datetime.utcnow()
+            job.done.set()
+        await broadcast_fetch_job(job.to_dict())
+
+    async def wait(self, job: FetchJob, timeout: float = None) -> bool:
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+coordinator = FetchCoordinator()
+
+
+@router.post("/api/fetch")
+async def fetch_feeds(source_id: List[int] = Query(None)):
+    """Trigger an RSS fetch (optionally only for ``source_id``s); returns a job to poll"""
+    job, outcome = coordinator.trigger(source_id, forced=True)
+    body = {**job.to_dict(), "outcome": outcome}
+    if outcome == "throttled":
+        retry = coordinator.retry_after()
+        body["retry_after"] = round(retry, 1)
+        return JSONResponse(body, status_code=200, headers={"Retry-After": str(int(retry) + 1)})
+    return JSONResponse(body, status_code=202)
+
+
+@router.get("/api/fetch/{job_id}")
+async def fetch_job_status(job_id: str):
+    """Status of a fetch job"""
+    job = coordinator.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown fetch job")
+    return job.to_dict()
@@ -0,0 +1,208 @@
+"""Gazetteer-based location extraction and the map endpoint.
+
+The bundled gazetteer (countries, capitals, major cities and a few
+conflict regions, with aliases and demonyms) is loaded once into a trie
+keyed by word tokens. Scanning an article is one regex tokenization plus a
+dict walk from each capitalized token, taking the longest match, so tagging
+costs microseconds and only proper-noun spans on word boundaries can match.
+Results go into the article_locations table, indexed by time, country and
+region, so /api/geo aggregates without touching article text.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+from fastapi import APIRouter, Request
+
+from app.cache import bucket_start, cached_json, time_bucket
+from app.config import GAZETTEER_PATH
+from app.database import ReadSessionLocal
+from app.models import Article, ArticleLocation
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+DEFAULT_GAZETTEER = os.path.join(os.path.dirname(__file__), "data", "gazetteer.tsv")
+MAX_LOCATIONS_PER_ARTICLE = 20
+MAX_HOURS = 24 * 30
+RECENT_LIMIT = 200
+TOP_PLACES = 100
+
+# Words and single punctuation marks; "U.S." -> U . S .  "Port-au-Prince" -> Port - au - Prince
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str  # country/capital/city/region
+    country: str
+    region: str
+    lat: float
+    lon: float
+
+
+class _Entry(NamedTuple):
+    place: Place
+    exact: tuple  # original-case tokens for all-caps aliases (US, UK, UAE), else None
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer():
+    """(trie, country centroids) built from the gazetteer file, once per process"""
+    path = GAZETTEER_PATH or DEFAULT_GAZETTEER
+    trie = {}
+    centroids = {}
+    places = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            name, kind, country, region, lat, lon = fields[:6]
+            place = Place(name, kind, country, region, float(lat), float(lon))
+            if kind == "country":
+                centroids[country] = (place.lat, place.lon)
+            aliases = [a for a in fields[6].split("|") if a] if len(fields) > 6 else []
+            for alias in [name] + aliases:
+                tokens = TOKEN_PATTERN.findall(alias)
+                node = trie
+                for token in tokens:
+                    node = node.setdefault(token.lower(), {})
+                if None in node:
+                    logger.debug(f"Gazetteer: '{alias}' already maps to {node[None].place.name}")
+                    continue
+                node[None] = _Entry(place, tuple(tokens) if alias.isupper() else None)
+            places += 1
+    logger.info(f"Gazetteer loaded: {places} places from {path}")
+    return trie, centroids
+
+
+def _scan(text: str, found: dict):
+    trie = load_gazetteer()[0]
+    tokens = TOKEN_PATTERN.findall(text)
+    i, n = 0, len(tokens)
+    while i < n:
+        # Place names are proper nouns: lowercase "china" or "turkey" never starts a match
+        if not tokens[i][0].isupper():
+            i += 1
+            continue
+        node, j, best = trie, i, None
+        while j < n:
+            node = node.get(tokens[j].lower())
+            if node is None:
+                break
+            j += 1
+            entry = node.get(None)
+            if entry is not None and (entry.exact is None or tuple(tokens[i:j]) == entry.exact):
+                best = (j, entry.place)
+        if best is None:
+            i += 1
+            continue
+        i, place = best
+        found.setdefault(place.name, place)
+
+
+def extract_locations(*texts: str):
+    """Unique places mentioned in ``texts``, in order of first appearance"""
+    found = {}
+    for text in texts:
+        if text:
+            _scan(text, found)
+    return list(found.values())[:MAX_LOCATIONS_PER_ARTICLE]
+
+
+def _iso(ts):
+    return ts.isoformat() + "Z" if ts else None
+
+
+def summarize(db, since: datetime, region: str = None, country: str = None, limit: int = 50):
+    """Counts per region/country/place and the ``limit`` latest located articles since ``since``"""
+    centroids = load_gazetteer()[1]
+
+    # One index range scan over the window; grouping in SQL makes SQLite
+    # walk a whole (country|region, timestamp) index instead
+    query = db.query(
+        ArticleLocation.article_id, ArticleLocation.place, ArticleLocation.kind,
+        ArticleLocation.country_code, ArticleLocation.region,
+        ArticleLocation.lat, ArticleLocation.lon, ArticleLocation.timestamp,
+    ).filter(ArticleLocation.timestamp >= since)
+    if region:
+        query = query.filter(ArticleLocation.region == region)
+    if country:
+        query = query.filter(ArticleLocation.country_code == country)
+
+    regions, countries, places, located, latest = {}, {}, {}, {}, {}
+    for article_id, place, kind, code, region_name, lat, lon, ts in query:
+        regions.setdefault(region_name, set()).add(article_id)
+        countries.setdefault((code, region_name), (set(), lat, lon))[0].add(article_id)
+        places.setdefault(place, (set(), kind, code, lat, lon))[0].add(article_id)
+        located.setdefault(article_id, []).append(
+            {"place": place, "country": code, "lat": lat, "lon": lon}
+        )
+        if ts and (article_id not in latest or ts > latest[article_id]):
+            latest[article_id] = ts
+
+    recent_ids = sorted(latest, key=latest.get, reverse=True)[:limit]
+    rows = {a.id: a for a in db.query(Article).filter(Article.id.in_(recent_ids))}
+    top_places = sorted(places.items(), key=lambda p: -len(p[1][0]))[:TOP_PLACES]
+
+    return {
+        "total": len(located),
+        "regions": sorted(
+            ({"region": name, "count": len(ids)} for name, ids in regions.items()),
+            key=lambda r: -r["count"],
+        ),
+        "countries": sorted(
+            (
+                {
+                    "code": code,
+                    "region": region_name,
+                    "count": len(ids),
+                    "lat": centroids.get(code, (lat, lon))[0],
+                    "lon": centroids.get(code, (lat, lon))[1],
+                }
+                for (code, region_name), (ids, lat, lon) in countries.items()
+            ),
+            key=lambda c: -c["count"],
+        ),
+        "places": [
+            {"place": name, "kind": kind, "country": code, "lat": lat, "lon": lon, "count": len(ids)}
+            for name, (ids, kind, code, lat, lon) in top_places
+        ],
+        "articles": [
+            {
+                "id": a.id,
+                "title": a.title,
+                "url": a.link,
+                "source": a.source_name,
+                "published_at": _iso(a.timestamp),
+                "locations": located[a.id],
+            }
+            for a in (rows.get(article_id) for article_id in recent_ids)
+            if a is not None
+        ],
+    }
+
+
+@router.get("/api/geo")
+def get_geo(request: Request, hours: int = 24, region: str = None, country: str = None, limit: int = 50):
+    """Per-region/country/place article counts and recent located articles, for the map view"""
+    hours = max(1, min(hours, MAX_HOURS))
+    limit = max(1, min(limit, RECENT_LIMIT))
+    country = country.upper() if country else None
+    bucket = time_bucket()  # the window moves with the clock, not only with ingest
+
+    def build():
+        since = bucket_start(bucket) - timedelta(hours=hours)
+        db = ReadSessionLocal()
+        try:
+            return {"since": _iso(since), "hours": hours, **summarize(db, since, region, country, limit)}
+        finally:
+            db.close()
+
+    return cached_json(request, ("articles",), build, bucket=bucket)
@@ -0,0 +1,139 @@
+"""Indicator (IOC) extraction and lookup.
+
+At ingest, titles and descriptions are scanned once with a single
+precompiled pattern for CVE IDs, IPv4/IPv6 addresses, domains, MD5/SHA1/
+SHA256 hashes and MITRE ATT&CK technique IDs. Normalized values go into
+the article_iocs table, indexed on (value, article_id), so looking up an
+indicator is an index range scan rather than a text scan.
+"""
+
+import ipaddress
+import logging
+import re
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.cache import cached_json
+from app.database import ReadSessionLocal
+from app.models import Article, ArticleIOC
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_IOCS_PER_ARTICLE = 100
+LOOKUP_LIMIT = 200
+
+# TLDs we accept for domains. Deliberately excludes ccTLDs that collide with
+# file extensions (.py, .md, .pl, .rs, .sh, .so, .zip, ...).
+TLDS = frozenset((
+    "com net org info biz edu gov mil int io ai app dev cloud online site xyz top club "
+    "shop store tech live news blog onion me tv cc co us uk ca au de fr nl be ch at it es "
+    "pt se no dk fi pl ru ua by kz cn hk tw jp kr in ir il tr sa ae br ar mx cl za ng eu su"
+).split())
+
+HASH_TYPES = {32: "md5", 40: "sha1", 64: "sha256"}
+
+# One pass over the text. Kept to simple branches (hash lengths and TLDs are
+# told apart in _normalize) so the regex engine doesn't backtrack much.
+IOC_PATTERN = re.compile(
+    r"(?P<cve>\b(?i:CVE)-\d{4}-\d{4,7}\b)"
+    r"|(?P<attack>\bT\d{4}(?:\.\d{3})?\b)"
+    r"|(?P<ipv6>(?<![\w:.])(?:[0-9a-fA-F]{1,4}:|:){2,7}(?::|[0-9a-fA-F]{1,4})(?![\w:]))"
+    r"|(?P<ipv4>\b(?:\d{1,3}\.){3}\d{1,3}\b)"
+    r"|(?P<hash>\b[0-9a-fA-F]{32}(?:[0-9a-fA-F]{8}(?:[0-9a-fA-F]{24})?)?\b)"
+    r"|(?P<domain>\b(?i:(?:[a-z0-9][a-z0-9-]{0,62}\.)+[a-z]{2,10})\b(?![.-]\w))"
+)
+
+# Defanged forms analysts and vendors use: hxxp://, evil[.]com, 1.2.3(.)4
+_DEFANG = re.compile(r"\[\.\]|\(\.\)|\{\.\}|\[dot\]|\[:\]|hxxp", re.IGNORECASE)
+_REFANG = {"[.]": ".", "(.)": ".", "{.}": ".", "[dot]": ".", "[:]": ":", "hxxp": "http"}
+
+
+def refang(text: str) -> str:
+    return _DEFANG.sub(lambda m: _REFANG[m.group(0).lower()], text)
+
+
+def _normalize(kind: str, value: str):
+    """(type, canonical value) of a matched indicator, or None if it isn't one"""
+    if kind in ("cve", "attack"):
+        return kind, value.upper()
+    if kind == "hash":
+        return HASH_TYPES[len(value)], value.lower()
+    if kind == "domain":
+        value = value.lower()
+        if value.rsplit(".", 1)[1] not in TLDS or "-." in value:
+            return None
+        return kind, value
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+    if address.is_unspecified or address.is_loopback:
+        return None
+    return kind, address.compressed
+
+
+def extract_iocs(*texts: str):
+    """Unique (type, value) indicators found in ``texts``, in order of appearance"""
+    found = {}
+    for text in texts:
+        if not text:
+            continue
+        for match in IOC_PATTERN.finditer(refang(text)):
+            normalized = _normalize(match.lastgroup, match.group())
+            if normalized and normalized[1] not in found:
+                kind, value = normalized
+                found[value] = kind
+                if len(found) >= MAX_IOCS_PER_ARTICLE:
+                    return [(k, v) for v, k in found.items()]
+    return [(k, v) for v, k in found.items()]
+
+
+def classify(value: str):
+    """(type, normalized value) of a single indicator typed by a user"""
+    value = refang(value.strip())
+    match = IOC_PATTERN.fullmatch(value)
+    normalized = _normalize(match.lastgroup, value) if match else None
+    return normalized or (None, None)
+
+
+@router.get("/api/iocs/{value}")
+def lookup_ioc(value: str, request: Request, limit: int = 50):
+    """Articles mentioning an indicator (CVE, IP, domain, hash, ATT&CK ID), newest first"""
+    kind, normalized = classify(value)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail="Not a recognized indicator")
+    limit = max(1, min(limit, LOOKUP_LIMIT))
+
+    def build():
+        db = ReadSessionLocal()
+        try:
+            total = db.query(ArticleIOC).filter(ArticleIOC.value == normalized).count()
+            rows = (
+                db.query(Article)
+                .join(ArticleIOC, ArticleIOC.article_id == Article.id)
+                .filter(ArticleIOC.value == normalized)
+                .order_by(ArticleIOC.article_id.desc())
+                .limit(limit)
+                .all()
+            )
+            return {
+                "value": normalized,
+                "type": kind,
+                "count": total,
+                "articles": [
+                    {
+                        "id": a.id,
+                        "title": a.title,
+                        "url": a.link,
+                        "source": a.source_name,
+                        "published_at": a.timestamp.isoformat() + "Z" if a.timestamp else None,
+                    }
+                    for a in rows
+                ],
+            }
+        finally:
+            db.close()
+
+    return cached_json(request, ("articles",), build)
@@ -1,20 +1,38 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.database import init_db, SessionLocal
-from app.models import Category, Source, Article
-from app.websocket import router as websocket_router, broadcast_status
-from app.rss_engine import fetch_and_process_feeds
-from app.config import RSS_CHECK_INTERVAL, DEFAULT_SOURCES
+from app.database import init_db, SessionLocal, ReadSessionLocal, dialect_insert, router as read_router, check_replicas
+from sqlalchemy.orm import load_only
+from app.models import Category, Source, Article, ArticleContent, ArticleIOC, ArticleLocation, ArticleTag, TriageResult
+from app.websocket import router as websocket_router, broadcast_status, LIST_COLUMNS
+from app.metrics import router as metrics_router, RequestMetricsMiddleware
+from app.admission import AdmissionMiddleware
+from app.cache import bucket_start, bump_data_version, cached_json, time_bucket
+from app.utils import article_item
+from app.fetch_coordinator import router as fetch_router, coordinator
+from app.websub import router as websub_router, maintain_subscriptions
+from app.ioc import router as ioc_router, classify as classify_ioc
+from app.geo import router as geo_router, load_gazetteer
+from app import triage
+from app.trending import router as trending_router, load_history as load_trending, publish_trending
+from app.export import router as export_router
+from app.archive import router as archive_router
+from app.tags import router as tags_router, load_tally
+from app.auth import ensure_admin, router as auth_router
+from app.source_import import router as source_import_router
+from app.timelines import router as timelines_router
+from app.diagnostics import router as diagnostics_router, watchdog
+from app.assets import PrecompressedStaticFiles
+from app import archive
+from app.config import (
+    RSS_CHECK_INTERVAL, SHUTDOWN_DRAIN_TIMEOUT, FETCH_ON_STARTUP, PUBLIC_BASE_URL, TRENDING_BROADCAST_SECONDS,
+    ARCHIVE_DIR, STATIC_BUILD_DIR, REPLICA_CHECK_SECONDS, DIAGNOSTICS_ENABLED, ARTICLE_RETENTION_DAYS,
+)
 import os
 
-# Cleanup settings
-ARTICLE_RETENTION_DAYS = 2  # Delete articles older than this
-
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,107 +40,163 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Scheduler
-scheduler = AsyncIOScheduler()
+# Scheduler (apscheduler is imported during warmup, not at module load)
+scheduler = None
+warmup_task = None
+
+# Category colors mapping
+CATEGORY_COLORS = {
+    'Cybersecurity': '#ff3333',
+    'Geopolitical': '#00ffff',
+    'Technology': '#ffff00',
+    'OSINT': '#00ff00',
+    'AI/ML': '#dd00ff',
+    'Privacy': '#ff9900',
+    'Science': '#00aaff',
+    'Investigation': '#ff1493'
+}
 
 async def initialize_default_data():
-    """Create default categories and sources if they don't exist"""
+    """Create default categories and sources if they don't exist.
+
+    Runs as one bulk upsert per table and a single commit, so restarts
+    cost the same whether the database is empty or fully seeded.
+    """
+    from app.config import DEFAULT_SOURCES
+
     db = SessionLocal()
     try:
-        # Category colors mapping
-        CATEGORY_COLORS = {
-            'Cybersecurity': '#ff3333',
-            'Geopolitical': '#00ffff',
-            'Technology': '#ffff00',
-            'OSINT': '#00ff00',
-            'AI/ML': '#dd00ff',
-            'Privacy': '#ff9900',
-            'Science': '#00aaff',
-            'Investigation': '#ff1493'
-        }
-        
-        # Create default categories with proper colors
-        category_names = set()
-        for source in DEFAULT_SOURCES:
-            category_names.add(source["category"])
-        
-        for cat_name in category_names:
-            existing = db.query(Category).filter(Category.name == cat_name).first()
-            if not existing:
-                category = Category(
-                    name=cat_name, 
-                    color=CATEGORY_COLORS.get(cat_name, "#ffffff")
-                )
-                db.add(category)
-                db.commit()
-                logger.info(f"Created category: {cat_name}")
-            else:
-                # Update color if it was #ffffff
-                if existing.color == "#ffffff":
-                    existing.color = CATEGORY_COLORS.get(cat_name, "#ffffff")
-                    db.commit()
-        
-        # Create default sources
-        for source_config in DEFAULT_SOURCES:
-            if not db.query(Source).filter(
-                Source.rss_url == source_config["url"]
-            ).first():
-                category = db.query(Category).filter(
-                    Category.name == source_config["category"]
-                ).first()
-                
-                source = Source(
-                    name=source_config["name"],
-                    rss_url=source_config["url"],
-                    color=source_config["color"],
-                    category_id=category.id if category else None
+        category_rows = [
+            {"name": name, "color": CATEGORY_COLORS.get(name, "#ffffff")}
+            for name in sorted({source["category"] for source in DEFAULT_SOURCES})
+        ]
+
+        stmt = dialect_insert(Category)
+        if stmt is not None:
+            # Insert missing categories; fix up colors still left at the #ffffff default
+            db.execute(
+                stmt.values(category_rows).on_conflict_do_update(
+                    index_elements=[Category.name],
+                    set_={"color": stmt.excluded.color},
+                    where=Category.color == "#ffffff",
                 )
-                db.add(source)
-                db.commit()
-                logger.info(f"Created source: {source_config['name']}")
+            )
+        else:
+            existing = {c.name: c for c in db.query(Category).all()}
+            for row in category_rows:
+                if row["name"] not in existing:
+                    db.add(Category(**row))
+                elif existing[row["name"]].color == "#ffffff":
+                    existing[row["name"]].color = row["color"]
+            db.flush()
+
+        category_ids = dict(db.query(Category.name, Category.id).all())
+        source_rows = [
+            {
+                "name": source["name"],
+                "rss_url": source["url"],
+                "color": source["color"],
+                "category_id": category_ids.get(source["category"]),
+            }
+            for source in DEFAULT_SOURCES
+        ]
+
+        stmt = dialect_insert(Source)
+        if stmt is not None:
+            result = db.execute(
+                stmt.values(source_rows).on_conflict_do_nothing(index_elements=[Source.rss_url])
+            )
+            created = result.rowcount
+        else:
+            known = {url for (url,) in db.query(Source.rss_url).all()}
+            missing = [row for row in source_rows if row["rss_url"] not in known]
+            db.add_all(Source(**row) for row in missing)
+            created = len(missing)
+
+        db.commit()
+        bump_data_version("categories", "sources")
+        logger.info(f"Default data ready: {len(category_rows)} categories, {created} new sources")
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 async def scheduled_fetch():
-    """Scheduled task to fetch RSS feeds"""
-    db = SessionLocal()
+    """Scheduled task to fetch RSS feeds (joins a manual cycle if one is running)"""
     try:
-        logger.info("Starting RSS fetch...")
-        await fetch_and_process_feeds(db)
+        job, outcome = coordinator.trigger(forced=False, reason="scheduled")
+        logger.info(f"Starting RSS fetch... (job {job.id}, {outcome})")
+        await coordinator.wait(job)
     except Exception as e:
         logger.error(f"Scheduled fetch error: {e}")
-    finally:
-        db.close()
 
 async def cleanup_old_articles():
-    """Remove articles older than ARTICLE_RETENTION_DAYS"""
-    db = SessionLocal()
+    """Move articles older than ARTICLE_RETENTION_DAYS to the archive, then delete them.
+
+    Works in batches: rows are read, written to the archive off the loop, and
+    only deleted once the archive write has succeeded.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=ARTICLE_RETENTION_DAYS)
+    removed = archived = 0
     try:
-        cutoff = datetime.utcnow() - timedelta(days=ARTICLE_RETENTION_DAYS)
-        deleted = db.query(Article).filter(Article.published < cutoff).delete()
-        db.commit()
-        if deleted > 0:
-            logger.info(f"Cleaned up {deleted} articles older than {ARTICLE_RETENTION_DAYS} days")
+        while True:
+            records = await asyncio.to_thread(archive.expired, cutoff)
+            if not records:
+                break
+            if ARCHIVE_DIR:
+                archived += await asyncio.to_thread(archive.append, records)
+            ids = [r["id"] for r in records]
+            hashes = [r["hash"] for r in records if r["hash"]]
+            db = SessionLocal()
+            try:
+                db.query(ArticleIOC).filter(ArticleIOC.article_id.in_(ids)).delete(synchronize_session=False)
+                db.query(ArticleLocation).filter(ArticleLocation.article_id.in_(ids)).delete(synchronize_session=False)
+                db.query(ArticleTag).filter(ArticleTag.article_id.in_(ids)).delete(synchronize_session=False)
+                db.query(ArticleContent).filter(ArticleContent.article_id.in_(ids)).delete(synchronize_session=False)
+                db.query(TriageResult).filter(TriageResult.article_hash.in_(hashes)).delete(synchronize_session=False)
+                removed += db.query(Article).filter(Article.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            if len(records) < archive.BATCH_ROWS:
+                break
     except Exception as e:
         logger.error(f"Cleanup error: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    if removed:
+        bump_data_version("articles", "archive")
+        logger.info(f"Cleaned up {removed} articles older than {ARTICLE_RETENTION_DAYS} days ({archived} archived)")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Startup and shutdown events"""
-    # Startup
-    logger.info("Intel Terminal starting...")
-    init_db()
-    await initialize_default_data()
-    
+async def warmup():
+    """Bring up the database, defaults and scheduler after the server is accepting requests"""
+    global scheduler
+    started = datetime.utcnow()
+    try:
+        await asyncio.to_thread(init_db)
+        await initialize_default_data()
+        await ensure_admin()
+        await asyncio.to_thread(load_gazetteer)
+        await triage.start()
+        await load_trending()
+        await load_tally()
+    except Exception as e:
+        logger.error(f"Startup warmup failed: {e}")
+        raise
+
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    scheduler = AsyncIOScheduler()
+    # First cycle right away (in the background) unless disabled
+    first_run = {"next_run_time": datetime.now()} if FETCH_ON_STARTUP else {}
     scheduler.add_job(
         scheduled_fetch,
         "interval",
         minutes=RSS_CHECK_INTERVAL,
         id="rss_fetch",
-        name="RSS Feed Fetch"
+        name="RSS Feed Fetch",
+        **first_run
     )
     scheduler.add_job(
         cleanup_old_articles,
@@ -131,14 +205,67 @@ async def lifespan(app: FastAPI):
         id="cleanup",
         name="Cleanup Old Articles"
     )
+    scheduler.add_job(
+        publish_trending,
+        "interval",
+        seconds=TRENDING_BROADCAST_SECONDS,
+        id="trending",
+        name="Trending Broadcast"
+    )
+    if read_router.replicas:
+        scheduler.add_job(
+            check_replicas,
+            "interval",
+            seconds=REPLICA_CHECK_SECONDS,
+            id="replicas",
+            name="Replica Health Check",
+            next_run_time=datetime.now()
+        )
+    if PUBLIC_BASE_URL:
+        scheduler.add_job(
+            maintain_subscriptions,
+            "interval",
+            minutes=15,
+            id="websub",
+            name="WebSub Subscriptions",
+            next_run_time=datetime.now() + timedelta(minutes=1)
+        )
     scheduler.start()
-    logger.info(f"Scheduler started (fetch: {RSS_CHECK_INTERVAL} min, cleanup: hourly, retention: {ARTICLE_RETENTION_DAYS} days)")
-    
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    logger.info(f"Scheduler started in {elapsed:.2f}s (fetch: {RSS_CHECK_INTERVAL} min, cleanup: hourly, retention: {ARTICLE_RETENTION_DAYS} days)")
+
+def is_ready() -> bool:
+    """True once warmup has finished successfully"""
+    return (
+        warmup_task is not None and warmup_task.done()
+        and not warmup_task.cancelled() and warmup_task.exception() is None
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown events"""
+    global warmup_task
+    # Startup: return immediately so /api/health and static files are served while we warm up
+    logger.info("Intel Terminal starting...")
+    watchdog.start()
+    warmup_task = asyncio.create_task(warmup())
+
     yield
-    
-    # Shutdown
+
+    # Shutdown: stop scheduling, then let in-flight fetches finish their current source
     logger.info("Intel Terminal shutting down...")
-    scheduler.shutdown()
+    if not warmup_task.done():
+        warmup_task.cancel()
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown(wait=False)
+
+    from app.rss_engine import request_stop, wait_idle
+    request_stop()
+    if not await wait_idle(SHUTDOWN_DRAIN_TIMEOUT):
+        logger.warning(f"Fetch cycle still running after {SHUTDOWN_DRAIN_TIMEOUT}s, exiting anyway")
+    # Unscored articles are requeued on the next start
+    await triage.stop()
+    watchdog.stop()
 
 app = FastAPI(
     title="Intel Terminal",
@@ -147,6 +274,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limits and load shedding (innermost, so rejections still get CORS headers and metrics)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -156,9 +286,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency for /api/*
+app.add_middleware(RequestMetricsMiddleware)
+
 # WebSocket router
 app.include_router(websocket_router)
 
+# Prometheus scrape endpoint
+app.include_router(metrics_router)
+
+# Manual fetch trigger and job status
+app.include_router(fetch_router)
+
+# WebSub hub callbacks
+app.include_router(websub_router)
+
+# Indicator lookups
+app.include_router(ioc_router)
+
+# Location counts for the map view
+app.include_router(geo_router)
+
+# Trending terms
+app.include_router(trending_router)
+
+# Tag facets
+app.include_router(tags_router)
+
+# Bulk export
+app.include_router(export_router)
+
+# Cold-storage archive of expired articles
+app.include_router(archive_router)
+
+# Admin sign-in
+app.include_router(auth_router)
+
+# Admin-only profiling, memory and event loop diagnostics (opt-in: they expose stacks and can slow the process)
+if DIAGNOSTICS_ENABLED:
+    app.include_router(diagnostics_router)
+
+# Bulk OPML/JSON source import (admin)
+app.include_router(source_import_router)
+
+# Reader timelines and preferences (/api/me/*)
+app.include_router(timelines_router)
+
 # Static files path - check multiple locations for different deployment scenarios
 # Local dev: ../frontend, Docker/Railway: /app/static or ./static
 possible_frontend_paths = [
@@ -167,114 +340,148 @@ possible_frontend_paths = [
     os.path.join(os.path.dirname(__file__), "..", "static"),  # Alternative
     "./static",  # Current directory
 ]
-frontend_path = None
-for path in possible_frontend_paths:
-    abs_path = os.path.abspath(path)
-    logger.info(f"Checking frontend path: {abs_path}")
-    if os.path.exists(path):
-        frontend_path = path
-        logger.info(f"Found frontend at: {abs_path}")
-        break
+frontend_path = next((path for path in possible_frontend_paths if os.path.isdir(path)), None)
 
 if not frontend_path:
     logger.warning("No frontend path found! Static files will not be served.")
 
 
 @app.get("/api/sources")
-def get_sources():
+def get_sources(request: Request):
     """Get all RSS sources"""
-    db = SessionLocal()
-    try:
-        sources = db.query(Source).all()
-        return [
-            {
-                "id": s.id,
-                "name": s.name,
-                "url": s.rss_url,
-                "category": s.category_id,
-                "color": s.color,
-                "last_fetch": s.created_at.isoformat() if s.created_at else None
-            }
-            for s in sources
-        ]
-    finally:
-        db.close()
+    def build():
+        db = ReadSessionLocal()
+        try:
+            sources = db.query(Source).all()
+            return [
+                {
+                    "id": s.id,
+                    "name": s.name,
+                    "url": s.rss_url,
+                    "category": s.category_id,
+                    "color": s.color,
+                    "last_fetch": s.created_at.isoformat() if s.created_at else None
+                }
+                for s in sources
+            ]
+        finally:
+            db.close()
+
+    return cached_json(request, ("sources",), build)
 
 @app.get("/api/categories")
-def get_categories():
+def get_categories(request: Request):
     """Get all categories"""
-    db = SessionLocal()
-    try:
-        cats = db.query(Category).all()
-        return [
-            {
-                "id": c.id,
-                "name": c.name,
-                "color": c.color,
-                "enabled": c.enabled
-            }
-            for c in cats
-        ]
-    finally:
-        db.close()
+    def build():
+        db = ReadSessionLocal()
+        try:
+            cats = db.query(Category).all()
+            return [
+                {
+                    "id": c.id,
+                    "name": c.name,
+                    "color": c.color,
+                    "enabled": c.enabled
+                }
+                for c in cats
+            ]
+        finally:
+            db.close()
 
-@app.post("/api/fetch")
-async def fetch_feeds():
-    """Manually trigger RSS feed fetch"""
-    db = SessionLocal()
-    try:
-        await fetch_and_process_feeds(db)
-        return {"status": "success", "message": "RSS feeds fetched"}
-    except Exception as e:
-        return {"status": "error", "detail": str(e)}
-    finally:
-        db.close()
+    return cached_json(request, ("categories",), build)
 
 @app.get("/api/articles")
-def get_articles(category: str = None, limit: int = 50):
-    """Get articles with optional filtering"""
-    db = SessionLocal()
-    try:
-        # Build category name lookup
-        cats = {c.id: c.name for c in db.query(Category).all()}
-        # Build source color lookup
-        source_colors = {s.id: s.color for s in db.query(Source).all()}
-        
-        query = db.query(Article).order_by(Article.timestamp.desc()).limit(limit)
-        if category:
-            query = query.filter(Article.category_id == category)
-        articles = query.all()
-        return [
-            {
-                "id": a.id,
-                "title": a.title,
-                "url": a.link,
-                "summary": a.description or "No summary",
-                "source": a.source_name,
-                "source_color": source_colors.get(a.source_id, "#55ff55"),
-                "category": cats.get(a.category_id, "Unknown"),
-                "category_id": a.category_id,
-                "published_at": a.timestamp.isoformat() + "Z" if a.timestamp else None,
-                "severity": "high" if a.severity >= 7 else "medium" if a.severity >= 4 else "low"
+def get_articles(request: Request, category: str = None, ioc: str = None, tag: str = None, hours: int = None,
+                 limit: int = 50):
+    """Get articles with optional filtering, in the compact list shape (no description).
+
+    ``ioc``: only articles mentioning that indicator; ``tag``: only articles
+    with that tag (e.g. EXPLOIT); ``hours``: only articles published in the
+    last N hours.
+    """
+    ioc_value = None
+    if ioc:
+        ioc_value = classify_ioc(ioc)[1]
+        if ioc_value is None:
+            raise HTTPException(status_code=400, detail="Not a recognized indicator")
+
+    # The window moves with the clock, not only with ingest
+    bucket = time_bucket() if hours else None
+
+    def build():
+        db = ReadSessionLocal()
+        try:
+            # Build category name lookup
+            cats = {c.id: c.name for c in db.query(Category).all()}
+            # Build source color lookup
+            source_colors = {s.id: s.color for s in db.query(Source).all()}
+
+            since = bucket_start(bucket) - timedelta(hours=hours) if hours else None
+            query = db.query(Article).options(load_only(*LIST_COLUMNS))
+            if category:
+                query = query.filter(Article.category_id == category)
+            if ioc_value:
+                query = query.filter(Article.id.in_(
+                    db.query(ArticleIOC.article_id).filter(ArticleIOC.value == ioc_value)
+                ))
+            if tag:
+                # Walks the (tag, timestamp) index newest first instead of scanning Article.tags
+                query = query.join(ArticleTag, ArticleTag.article_id == Article.id).filter(ArticleTag.tag == tag.upper())
+            published = ArticleTag.timestamp if tag else Article.timestamp
+            if since:
+                query = query.filter(published >= since)
+            articles = query.order_by(published.desc()).limit(limit).all()
+            return [article_item(a, cats.get(a.category_id), source_colors.get(a.source_id)) for a in articles]
+        finally:
+            db.close()
+
+    return cached_json(request, ("articles", "sources", "categories"), build, bucket=bucket)
+
+@app.get("/api/articles/{article_id:int}")
+def get_article(request: Request, article_id: int):
+    """One article with its summary and, when it was truncated at ingest, the full text"""
+    def build():
+        db = ReadSessionLocal()
+        try:
+            row = (
+                db.query(Article, Category.name, Source.color, ArticleContent.content)
+                .outerjoin(Category, Category.id == Article.category_id)
+                .outerjoin(Source, Source.id == Article.source_id)
+                .outerjoin(ArticleContent, ArticleContent.article_id == Article.id)
+                .filter(Article.id == article_id)
+                .first()
+            )
+            if row is None:
+                raise HTTPException(status_code=404, detail="Article not found")
+            article, category, color, content = row
+            return {
+                **article_item(article, category, color),
+                "summary": article.description or "",
+                "content": content or article.description or "",
+                "score": article.severity or 0,
+                "fetched_at": article.fetched_at.isoformat() + "Z" if article.fetched_at else None,
             }
-            for a in articles
-        ]
-    finally:
-        db.close()
+        finally:
+            db.close()
+
+    return cached_json(request, ("articles", "sources", "categories"), build)
 
 @app.get("/api/dashboard-stats")
-def get_dashboard_stats():
+def get_dashboard_stats(request: Request):
     """Get dashboard statistics"""
-    db = SessionLocal()
-    try:
-        total_articles = db.query(Article).count()
-        total_sources = db.query(Source).count()
-        return {
-            "total_articles": total_articles or 0,
-            "total_sources": total_sources or 0
-        }
-    finally:
-        db.close()
+    def build():
+        db = ReadSessionLocal()
+        try:
+            total_articles = db.query(Article).count()
+            total_sources = db.query(Source).count()
+            return {
+                "total_articles": total_articles or 0,
+                "total_sources": total_sources or 0
+            }
+        finally:
+            db.close()
+
+    return cached_json(request, ("articles", "sources"), build)
 
 @app.get("/api/health")
 async def health():
@@ -282,46 +489,45 @@ async def health():
     return {
         "status": "online",
         "service": "Intel Terminal",
-        "scheduler": scheduler.running
+        "scheduler": scheduler is not None and scheduler.running,
+        "ready": is_ready()
     }
 
 @app.get("/api/stats")
-async def stats():
+def stats(request: Request):
     """Get basic stats"""
-    db = SessionLocal()
-    try:
-        categories = db.query(Category).count()
-        sources = db.query(Source).count()
-        articles = db.query(Article).count()
-        
-        return {
-            "categories": categories,
-            "sources": sources,
-            "articles": articles
-        }
-    finally:
-        db.close()
+    def build():
+        db = ReadSessionLocal()
+        try:
+            return {
+                "categories": db.query(Category).count(),
+                "sources": db.query(Source).count(),
+                "articles": db.query(Article).count()
+            }
+        finally:
+            db.close()
+
+    return cached_json(request, ("articles", "sources", "categories"), build)
 
-# Root endpoint fallback (only used if static files not found)
-@app.get("/")
+# Root endpoint fallback (only registered if static files not found)
 def root():
     """Root endpoint - shows API info if frontend not mounted"""
     return {
         "service": "Intel Terminal API",
         "status": "running",
         "frontend_path": frontend_path,
-        "frontend_found": frontend_path is not None and os.path.exists(frontend_path) if frontend_path else False,
+        "frontend_found": frontend_path is not None,
         "docs": "/docs",
         "health": "/api/health"
     }
 
 # Mount static files LAST so API routes take precedence
-if frontend_path and os.path.exists(frontend_path):
-    logger.info(f"Mounting static files from: {frontend_path}")
-    # This will override the "/" route above
-    app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
+if frontend_path:
+    logger.info(f"Mounting static files from: {os.path.abspath(frontend_path)}")
+    app.mount("/", PrecompressedStaticFiles(frontend_path, STATIC_BUILD_DIR), name="frontend")
 else:
     logger.warning("Static files not mounted - frontend_path not found")
+    app.get("/")(root)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,252 @@
+"""Lightweight Prometheus-style metrics for the hot paths.
+
+Kept dependency-free on purpose: a metric update is a dict lookup and a
+couple of additions under a lock, so instrumentation can stay on in
+production.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter()
+
+# Latency buckets in seconds (5ms .. 30s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: Tuple, extra: Tuple = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def header(self) -> str:
+        return f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> str:
+        with self._lock:
+            items = list(self._values.items())
+        return "".join(f"{self.name}{_format_labels(k)} {v}\n" for k, v in items)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> str:
+        with self._lock:
+            items = list(self._values.items())
+        return "".join(f"{self.name}{_format_labels(k)} {v}\n" for k, v in items)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 2)
+            series[idx] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._values.get(_label_key(labels))
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> str:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}\n")
+            cumulative += series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {cumulative}\n")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]}\n")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}\n")
+        return "".join(lines)
+
+
+REGISTRY = []
+
+# ===== RSS INGEST =====
+FEED_FETCH_SECONDS = Histogram("intel_feed_fetch_seconds", "Time to download a feed, per source")
+FEED_PARSE_SECONDS = Histogram("intel_feed_parse_seconds", "Time to parse and process a feed, per source")
+FEED_FETCH_ERRORS = Counter("intel_feed_fetch_errors_total", "Feed fetches that raised, per source")
+FETCH_CYCLE_SECONDS = Histogram("intel_fetch_cycle_seconds", "Wall time of a full fetch cycle")
+ARTICLES_INGESTED = Counter("intel_articles_ingested_total", "New articles stored, per source")
+ARTICLES_DEDUPLICATED = Counter("intel_articles_deduplicated_total", "Entries skipped as duplicates, per source")
+DB_COMMIT_SECONDS = Histogram("intel_db_commit_seconds", "Latency of ingest database commits")
+
+# ===== DATABASE =====
+DB_READ_SESSIONS = Counter("intel_db_read_sessions_total", "Read-only sessions, by target (primary/replica)")
+DB_REPLICA_HEALTHY = Gauge("intel_db_replica_healthy", "1 if the replica passed its last health check, per replica")
+
+# ===== WEBSOCKET =====
+WS_CLIENTS = Gauge("intel_ws_clients", "Connected WebSocket clients")
+WS_SEND_QUEUE_DEPTH = Gauge("intel_ws_send_queue_depth", "Messages waiting to be sent to WebSocket clients")
+WS_BROADCAST_SECONDS = Histogram("intel_ws_broadcast_seconds", "Time to fan a message out to all clients")
+WS_SEND_ERRORS = Counter("intel_ws_send_errors_total", "Failed WebSocket sends")
+
+# ===== WEBSUB =====
+WEBSUB_PUSHES = Counter("intel_websub_pushes_total", "WebSub content notifications, by result")
+WEBSUB_SUBSCRIBE_REQUESTS = Counter("intel_websub_subscribe_requests_total", "Subscription requests sent to hubs, by outcome")
+
+# ===== TRIAGE =====
+TRIAGE_QUEUE_DEPTH = Gauge("intel_triage_queue_depth", "Articles waiting for model triage")
+TRIAGE_BATCH_SECONDS = Histogram("intel_triage_batch_seconds", "Latency of one triage backend call, per backend")
+TRIAGE_ARTICLES = Counter("intel_triage_articles_total", "Articles through model triage, by result (scored/cached/failed/dropped)")
+
+# ===== AUTH =====
+AUTH_HASH_SECONDS = Histogram("intel_auth_hash_seconds", "bcrypt hash/verify latency including queueing, by operation")
+AUTH_HASH_WAITING = Gauge("intel_auth_hash_waiting", "bcrypt hashes queued or running")
+AUTH_TOKEN_CACHE = Counter("intel_auth_token_cache_total", "Bearer token verifications, by result (hit/miss)")
+
+# ===== ADMISSION =====
+ADMISSION_REJECTED = Counter("intel_admission_rejected_total", "Requests shed, by reason (rate_limited/overloaded/stream_full)")
+ADMISSION_IN_FLIGHT = Gauge("intel_admission_in_flight", "Expensive handlers running, by pool (handlers/exports)")
+ADMISSION_WAITING = Gauge("intel_admission_waiting", "Expensive requests waiting for a slot, by pool")
+
+# ===== TIMELINES =====
+TIMELINE_BUILDS = Counter("intel_timeline_builds_total", "User timelines rebuilt from the database, by reason (miss/preferences)")
+TIMELINE_BUILD_SECONDS = Histogram("intel_timeline_build_seconds", "Time to rebuild one user timeline")
+TIMELINES_CACHED = Gauge("intel_timelines_cached", "User timelines held in memory")
+
+# ===== EVENT LOOP =====
+LOOP_STALLS = Counter("intel_loop_stalls_total", "Event loop stalls over LOOP_STALL_THRESHOLD_MS")
+LOOP_STALL_SECONDS = Histogram("intel_loop_stall_seconds", "Duration of event loop stalls")
+
+# ===== DISCORD =====
+DISCORD_DISPATCH = Counter("intel_discord_dispatch_total", "Discord webhook dispatches, by outcome")
+
+# ===== HTTP =====
+HTTP_REQUEST_SECONDS = Histogram("intel_http_request_seconds", "API request latency, per route")
+HTTP_CACHE = Counter("intel_http_cache_total", "Read API cache lookups, by result (hit/miss/not_modified)")
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format"""
+    return "".join(m.header() + m.render() for m in REGISTRY)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording latency for /api/* routes.
+
+    Uses the matched route template (e.g. /api/articles) as the label so
+    path parameters don't explode the series count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path_format", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=path,
+                status=str(status_code),
+            )
+
+
+@router.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Index, JSON
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 import hashlib
@@ -19,6 +19,13 @@ class User(Base):
     alerts_enabled = Column(Boolean, default=True)
     keywords = Column(JSON, default=[])  # user's watched keywords
 
+class UserCategory(Base):
+    """Category a user follows; a user with none follows all of them."""
+    __tablename__ = "user_categories"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+
 class Category(Base):
     __tablename__ = "categories"
 
@@ -49,11 +56,11 @@ class Article(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), index=True)
     link = Column(String(500))
-    description = Column(Text, nullable=True)
+    description = Column(Text, nullable=True)  # summary, cut to ARTICLE_SUMMARY_CHARS
     source_id = Column(Integer, ForeignKey("sources.id"))
     source_name = Column(String(255))
     category_id = Column(Integer, nullable=True)
-    tags = Column(String(500), default="")  # Comma-separated
+    tags = Column(String(500), default="")  # Comma-separated copy of the article_tags rows
     severity = Column(Integer, default=0)  # 0-10 scale
     article_hash = Column(String(64), unique=True, index=True)  # SHA256 for deduplication
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
@@ -66,6 +73,98 @@ class Article(Base):
         return hashlib.sha256(content).hexdigest()
 
 
+class ArticleContent(Base):
+    """Full description of an article whose stored one was truncated (STORE_FULL_CONTENT)."""
+    __tablename__ = "article_contents"
+
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    content = Column(Text)
+
+
+class ArticleIOC(Base):
+    """Indicator (CVE, IP, domain, hash, ATT&CK ID) mentioned by an article."""
+    __tablename__ = "article_iocs"
+    __table_args__ = (
+        Index('idx_ioc_value_article', 'value', 'article_id'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
+    ioc_type = Column(String(16))  # cve/ipv4/ipv6/domain/md5/sha1/sha256/attack
+    value = Column(String(255))  # normalized
+
+
+class ArticleLocation(Base):
+    """Gazetteer place (country, capital, city) mentioned by an article."""
+    __tablename__ = "article_locations"
+    __table_args__ = (
+        Index('idx_location_timestamp', 'timestamp'),
+        Index('idx_location_country_timestamp', 'country_code', 'timestamp'),
+        Index('idx_location_region_timestamp', 'region', 'timestamp'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
+    place = Column(String(100))
+    kind = Column(String(16))  # country/capital/city/region
+    country_code = Column(String(2))  # ISO 3166-1 alpha-2
+    region = Column(String(32))
+    lat = Column(Float)
+    lon = Column(Float)
+    timestamp = Column(DateTime)  # copy of the article's, so map queries skip the join
+
+
+class ArticleTag(Base):
+    """Keyword tag of an article, one row per tag, for indexed tag queries."""
+    __tablename__ = "article_tags"
+    __table_args__ = (
+        Index('idx_tag_timestamp', 'tag', 'timestamp'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
+    tag = Column(String(32))  # uppercase, as extract_keywords returns it
+    timestamp = Column(DateTime)  # copy of the article's, so tag queries skip the join
+
+
+class TriageResult(Base):
+    """Model-assigned severity, keyed by article hash so reposts and restarts reuse it."""
+    __tablename__ = "triage_results"
+
+    article_hash = Column(String(64), primary_key=True)
+    severity = Column(Integer)  # 0-10 scale, like Article.severity
+    label = Column(String(16))  # critical/high/medium/low
+    model = Column(String(100))
+    scored_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SourceCheckpoint(Base):
+    """Per-source ingest progress so restarts don't replay work."""
+    __tablename__ = "source_checkpoints"
+
+    source_id = Column(Integer, ForeignKey("sources.id"), primary_key=True)
+    last_entry_id = Column(String(500), nullable=True)  # guid/id of newest entry seen
+    last_entry_hash = Column(String(64), nullable=True)  # article_hash of newest entry seen
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    last_fetched_at = Column(DateTime, nullable=True)
+
+
+class WebSubSubscription(Base):
+    """WebSub (PubSubHubbub) subscription of a source that advertises a hub."""
+    __tablename__ = "websub_subscriptions"
+
+    source_id = Column(Integer, ForeignKey("sources.id"), primary_key=True)
+    hub_url = Column(String(500))
+    topic_url = Column(String(500))
+    secret = Column(String(64))  # HMAC key for X-Hub-Signature
+    state = Column(String(20), default="discovered")  # discovered/pending/active/denied/failed
+    lease_expires_at = Column(DateTime, nullable=True)
+    requested_at = Column(DateTime, nullable=True)
+    last_push_at = Column(DateTime, nullable=True)
+    error = Column(String(500), nullable=True)
+
+
 class Admin(Base):
     """Admin user for managing feeds (web version only)."""
     __tablename__ = "admins"
@@ -1,12 +1,30 @@
-import feedparser
+import asyncio
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from time import mktime
 from sqlalchemy.orm import Session
-from app.models import Article, Source
-from app.websocket import broadcast_article
-from app.utils import generate_article_hash, extract_keywords, sanitize_text
-from app.config import MAX_ARTICLES_PER_FEED
+from app.models import (
+    Article, ArticleContent, ArticleIOC, ArticleLocation, ArticleTag, Category, Source, SourceCheckpoint,
+    WebSubSubscription,
+)
+from app.websocket import broadcast_article, article_message_data
+from app.cache import bump_data_version
+from app.utils import generate_article_hash, extract_keywords, sanitize_text, truncate_text
+from app.ioc import extract_iocs
+from app.geo import extract_locations
+from app import triage
+from app.trending import engine as trending
+from app import tags as tag_tally
+from app.timelines import timelines, publish as publish_to_timelines
+from app.config import (
+    MAX_ARTICLES_PER_FEED, WEBSUB_SAFETY_POLL_MINUTES, FEED_STREAMING, ARTICLE_SUMMARY_CHARS, STORE_FULL_CONTENT,
+)
+from app import feed_stream
+from app.metrics import (
+    FEED_FETCH_SECONDS, FEED_PARSE_SECONDS, FEED_FETCH_ERRORS, FETCH_CYCLE_SECONDS,
+    ARTICLES_INGESTED, ARTICLES_DEDUPLICATED, DB_COMMIT_SECONDS,
+)
 
 
 def parse_feed_date(entry):
@@ -24,84 +42,315 @@ def parse_feed_date(entry):
 
 logger = logging.getLogger(__name__)
 
-async def fetch_and_process_feeds(db: Session):
-    """Fetch all enabled sources and process articles"""
-    sources = db.query(Source).filter(Source.enabled == True).all()
-    
-    for source in sources:
-        try:
-            await fetch_source(source, db)
-        except Exception as e:
-            logger.error(f"Error fetching {source.name}: {e}")
-
-async def fetch_source(source: Source, db: Session):
-    """Fetch a single RSS source"""
+# Shutdown coordination: a stop request lets the running cycle finish the
+# source it is on (which commits atomically) and then return.
+_stop_requested = False
+_active_cycles = 0
+_idle = asyncio.Event()
+_idle.set()
+
+
+def request_stop():
+    """Ask running fetch cycles to stop after their current source"""
+    global _stop_requested
+    _stop_requested = True
+
+
+async def wait_idle(timeout: float) -> bool:
+    """Wait for in-flight fetch cycles to drain. Returns False on timeout."""
+    try:
+        await asyncio.wait_for(_idle.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def _pushed_recently(db: Session, checkpoints) -> set:
+    """Sources with a live WebSub subscription that were polled within the safety interval"""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=WEBSUB_SAFETY_POLL_MINUTES)
+    skip = set()
+    for sub in db.query(WebSubSubscription).filter(WebSubSubscription.state == "active"):
+        checkpoint = checkpoints.get(sub.source_id)
+        if (sub.lease_expires_at and sub.lease_expires_at > now
+                and checkpoint and checkpoint.last_fetched_at and checkpoint.last_fetched_at > cutoff):
+            skip.add(sub.source_id)
+    return skip
+
+
+async def fetch_and_process_feeds(db: Session, source_ids=None, include_pushed=True) -> int:
+    """Fetch enabled sources (all, or only ``source_ids``) and process articles.
+
+    With ``include_pushed=False`` (scheduled cycles) sources that receive
+    WebSub pushes are only polled every WEBSUB_SAFETY_POLL_MINUTES.
+    Returns the number of new articles stored.
+    """
+    global _active_cycles
+    if _stop_requested:
+        return 0
+    _active_cycles += 1
+    _idle.clear()
+    new_count = 0
+    try:
+        with FETCH_CYCLE_SECONDS.time():
+            query = db.query(Source).filter(Source.enabled == True)
+            if source_ids:
+                query = query.filter(Source.id.in_(source_ids))
+            sources = query.all()
+            checkpoints = {c.source_id: c for c in db.query(SourceCheckpoint).all()}
+            skip = set() if include_pushed else _pushed_recently(db, checkpoints)
+
+            for source in sources:
+                if _stop_requested:
+                    logger.info("Fetch cycle stopping early for shutdown")
+                    break
+                if source.id in skip:
+                    continue
+                try:
+                    new_count += await fetch_source(source, db, checkpoints.get(source.id))
+                except Exception as e:
+                    db.rollback()
+                    FEED_FETCH_ERRORS.inc(source=source.name)
+                    logger.error(f"Error fetching {source.name}: {e}")
+    finally:
+        _active_cycles -= 1
+        if _active_cycles == 0:
+            _idle.set()
+    return new_count
+
+
+class StoredEntries:
+    """``stop`` callback for feed_stream.fetch, called from the parsing thread.
+
+    Feeds are newest-first, so reading can end after STORED_RUN entries in
+    a row that are already stored. A single stored entry (e.g. a pinned
+    post, or the top item of a rank-ordered feed) doesn't end it.
+
+    The hashes of the source's latest articles are loaded up front, on the
+    loop's session: the parsing thread must not use the shared SQLite
+    connection (closing a session there rolls back whatever the loop has
+    in progress). An entry stored longer ago just doesn't end the read
+    early; ingest still skips it.
+    """
+
+    STORED_RUN = 3
+    LOOKBACK = 200  # latest articles of the source whose hashes are checked
+
+    def __init__(self, db: Session, source_id: int):
+        self.run = 0
+        self.known = {
+            h for (h,) in db.query(Article.article_hash)
+            .filter(Article.source_id == source_id)
+            .order_by(Article.timestamp.desc())
+            .limit(self.LOOKBACK)
+        }
+
+    def __call__(self, entry) -> bool:
+        article_hash = generate_article_hash(sanitize_text(entry.get("title", "No title")), entry.get("link", ""))
+        self.run = self.run + 1 if article_hash in self.known else 0
+        return self.run >= self.STORED_RUN
+
+
+async def fetch_source(source: Source, db: Session, checkpoint: SourceCheckpoint = None) -> int:
+    """Fetch a single RSS source and return how many new articles it stored.
+
+    New articles and the source checkpoint are committed together, so a
+    source is either fully ingested or not at all.
+    """
+    import feedparser
+
     logger.info(f"Fetching: {source.name}")
-    
-    feed = feedparser.parse(source.rss_url)
-    
+
+    etag = checkpoint.etag if checkpoint else None
+    modified = checkpoint.last_modified if checkpoint else None
+
+    # Download and parse off the event loop so shutdown and WS fan-out stay responsive
+    with FEED_FETCH_SECONDS.time(source=source.name):
+        if FEED_STREAMING:
+            feed = await asyncio.to_thread(
+                feed_stream.fetch,
+                source.rss_url,
+                etag=etag,
+                modified=modified,
+                limit=MAX_ARTICLES_PER_FEED,
+                stop=StoredEntries(db, source.id),
+            )
+        else:
+            feed = await asyncio.to_thread(
+                feedparser.parse,
+                source.rss_url,
+                etag=etag,
+                modified=modified,
+            )
+
+    # Added only now: a pending INSERT would be flushed by the next query and could
+    # be rolled back on the shared SQLite connection while the fetch is awaited
+    if checkpoint is None:
+        checkpoint = SourceCheckpoint(source_id=source.id)
+        db.add(checkpoint)
+
+    parse_started = time.perf_counter()
+    checkpoint.last_fetched_at = datetime.utcnow()
+
+    if feed.get("status") == 304:
+        logger.debug(f"Not modified: {source.name}")
+        db.commit()
+        FEED_PARSE_SECONDS.observe(time.perf_counter() - parse_started, source=source.name)
+        return 0
+
     if feed.bozo:
         logger.warning(f"Feed error for {source.name}: {feed.bozo_exception}")
-    
-    # Process latest articles
-    for entry in feed.entries[:MAX_ARTICLES_PER_FEED]:
-        try:
-            title = sanitize_text(entry.get("title", "No title"))
-            link = entry.get("link", "")
-            description = sanitize_text(entry.get("summary", ""))
-            
-            if not title or not link:
-                continue
-            
-            # Generate hash for deduplication
-            article_hash = generate_article_hash(title, link)
-            
-            # Check if article already exists
-            existing = db.query(Article).filter(
-                Article.article_hash == article_hash
-            ).first()
-            
-            if existing:
-                logger.debug(f"Duplicate article: {title[:50]}")
-                continue
-            
-            # Extract tags and severity
-            tags, severity = extract_keywords(title)
-            
-            # Get actual publication date from feed
-            published_time = parse_feed_date(entry)
-            
-            # Create article
-            article = Article(
-                title=title,
-                link=link,
-                description=description,
-                source_id=source.id,
-                source_name=source.name,
-                category_id=source.category_id,
-                tags=",".join(tags),
-                severity=severity,
-                article_hash=article_hash,
-                timestamp=published_time
+
+    hub, topic = discover_hub(feed)
+    if hub:
+        from app.websub import note_hub
+        note_hub(db, source, hub, topic)
+
+    checkpoint.etag = feed.get("etag")
+    checkpoint.last_modified = feed.get("modified")
+    return await ingest_entries(source, db, feed.entries, checkpoint, parse_started)
+
+
+def discover_hub(feed):
+    """WebSub hub and topic (self) URLs advertised by a parsed feed, if any"""
+    hub, topic = None, None
+    for link in feed.feed.get("links", []):
+        rel = link.get("rel")
+        if rel == "hub" and not hub:
+            hub = link.get("href")
+        elif rel == "self" and not topic:
+            topic = link.get("href")
+    return hub, topic
+
+
+async def ingest_entries(source: Source, db: Session, entries, checkpoint: SourceCheckpoint,
+                         started: float = None) -> int:
+    """Dedup, store and broadcast feed entries (polled or pushed) for ``source``.
+
+    Articles and the checkpoint are committed together. Returns how many new
+    articles were stored.
+    """
+    started = started or time.perf_counter()
+    new_articles = []
+    seen_hashes = set()
+    newest = None
+
+    # Every entry is checked against stored hashes: a pinned post or a rank-ordered
+    # feed (e.g. HN) can list new entries below ones already stored. No autoflush, so
+    # the checkpoint changes aren't written before the extraction below is awaited.
+    with db.no_autoflush:
+        for entry in entries[:MAX_ARTICLES_PER_FEED]:
+            try:
+                title = sanitize_text(entry.get("title", "No title"))
+                link = entry.get("link", "")
+                description = sanitize_text(entry.get("summary", ""))
+
+                if not title or not link:
+                    continue
+
+                # Generate hash for deduplication
+                article_hash = generate_article_hash(title, link)
+                if newest is None:
+                    newest = (entry.get("id"), article_hash)
+
+                # Check if article already exists
+                if article_hash in seen_hashes or db.query(Article.id).filter(
+                    Article.article_hash == article_hash
+                ).first():
+                    ARTICLES_DEDUPLICATED.inc(source=source.name)
+                    logger.debug(f"Duplicate article: {title[:50]}")
+                    continue
+                seen_hashes.add(article_hash)
+
+                # Extract tags and severity
+                tags, severity = extract_keywords(title)
+
+                # Get actual publication date from feed
+                published_time = parse_feed_date(entry)
+
+                # Create article
+                article = Article(
+                    title=title,
+                    link=link,
+                    description=description,
+                    source_id=source.id,
+                    source_name=source.name,
+                    category_id=source.category_id,
+                    tags=",".join(tags),
+                    severity=severity,
+                    article_hash=article_hash,
+                    timestamp=published_time
+                )
+                new_articles.append((article, tags))
+
+            except Exception as e:
+                logger.error(f"Error processing article from {source.name}: {e}")
+
+    if newest is not None:
+        checkpoint.last_entry_id, checkpoint.last_entry_hash = newest
+
+    # Indicator and place extraction is CPU-bound on long descriptions; keep it off the loop
+    iocs, locations = [], []
+    if new_articles:
+        iocs, locations = await asyncio.to_thread(
+            lambda: (
+                [extract_iocs(a.title, a.description) for a, _ in new_articles],
+                [extract_locations(a.title, a.description) for a, _ in new_articles],
             )
-            
-            db.add(article)
-            db.commit()
-            
-            # Broadcast to WebSocket clients
-            await broadcast_article({
-                "id": article.id,
-                "source": source.name,
-                "source_color": source.color,
-                "title": title,
-                "link": link,
-                "tags": tags,
-                "severity": severity,
-                "timestamp": article.timestamp.isoformat() + "Z",
-                "category": source.category_id
-            })
-            
-            logger.info(f"New article: {title[:50]}")
-            
-        except Exception as e:
-            logger.error(f"Error processing article from {source.name}: {e}")
+        )
+
+    # Lists and the stream never show the description; keep a short one with the
+    # article and, optionally, the full text aside for /api/articles/{id}
+    contents = []
+    for article, _ in new_articles:
+        summary = truncate_text(article.description, ARTICLE_SUMMARY_CHARS)
+        if summary != article.description:
+            if STORE_FULL_CONTENT:
+                contents.append((article, article.description))
+            article.description = summary
+
+    # Reposts of articles a model already scored keep that severity
+    triaged = triage.apply_cached(db, [article for article, _ in new_articles])
+
+    db.add_all(article for article, _ in new_articles)
+    if contents or any(iocs) or any(locations) or any(tags for _, tags in new_articles):
+        db.flush()  # assigns article ids for the content, indicator, location and tag rows
+        db.add_all(ArticleContent(article_id=article.id, content=content) for article, content in contents)
+        db.add_all(
+            ArticleTag(article_id=article.id, tag=tag, timestamp=article.timestamp)
+            for article, tags in new_articles
+            for tag in tags
+        )
+        db.add_all(
+            ArticleIOC(article_id=article.id, ioc_type=kind, value=value)
+            for (article, _), found in zip(new_articles, iocs)
+            for kind, value in found
+        )
+        db.add_all(
+            ArticleLocation(article_id=article.id, place=place.name, kind=place.kind,
+                            country_code=place.country, region=place.region,
+                            lat=place.lat, lon=place.lon, timestamp=article.timestamp)
+            for (article, _), places in zip(new_articles, locations)
+            for place in places
+        )
+    with DB_COMMIT_SECONDS.time():
+        db.commit()
+    ARTICLES_INGESTED.inc(len(new_articles), source=source.name)
+    matched = {}
+    if new_articles:
+        bump_data_version("articles")
+        matched = timelines.add_articles(article for article, _ in new_articles)
+        triage.enqueue(article for article, _ in new_articles if article.article_hash not in triaged)
+        trending.add_titles(article.title for article, _ in new_articles)
+        tag_tally.add_articles(article for article, _ in new_articles)
+    FEED_PARSE_SECONDS.observe(time.perf_counter() - started, source=source.name)
+
+    # Broadcast to WebSocket clients
+    category = db.query(Category.name).filter(Category.id == source.category_id).scalar() if new_articles else None
+    for (article, _), found, places in zip(new_articles, iocs, locations):
+        data = article_message_data(article, category, source.color, found, places)
+        await broadcast_article(data)
+        publish_to_timelines(data, matched.get(article.id, ()))
+        logger.info(f"New article: {article.title[:50]}")
+
+    return len(new_articles)
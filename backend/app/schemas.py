@@ -19,6 +19,7 @@ class UserUpdate(BaseModel):
     theme: Optional[str] = None
     alerts_enabled: Optional[bool] = None
     keywords: Optional[List[str]] = None
+    categories: Optional[List[str]] = None  # names; empty = all
 
 
 class UserResponse(UserBase):
@@ -38,6 +39,11 @@ class LoginRequest(BaseModel):
     password: str
 
 
+class AdminLoginRequest(BaseModel):
+    username: str
+    password: str
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
@@ -0,0 +1,392 @@
+"""Bulk source import from OPML or JSON.
+
+``POST /api/sources/import`` (admin only) takes an OPML document (outline
+folders become categories) or a JSON list shaped like DEFAULT_SOURCES
+(``name``, ``url``, ``category``, optional ``color``). Candidates are
+checked concurrently, IMPORT_CONCURRENCY at a time, each within
+IMPORT_TIMEOUT seconds: the URL must answer with an RSS, Atom or RDF
+document. Permanent redirects (301/308) are followed and the final URL is
+what gets stored; temporary ones are not. Unless IMPORT_ALLOW_PRIVATE is
+set, a URL (or redirect) whose host resolves to a loopback, private,
+link-local or otherwise non-public address is refused before it is
+requested, so an import can't be used to probe the server's own network;
+the request then goes to the address that was checked, so a host that
+answers DNS differently the second time can't slip past.
+Repeats within the upload, URLs
+already stored, and different URLs that redirect to the same feed are
+reported rather than inserted.
+
+Valid sources (and any categories they introduce) are inserted in one
+transaction. The scheduler reads sources from the database every cycle,
+so they're polled from then on, and the import also starts a fetch of
+just the new sources (queued behind a running cycle that may have loaded
+its source list before they were inserted).
+"""
+
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.auth import verify_token
+from app.cache import bump_data_version
+from app.config import IMPORT_ALLOW_PRIVATE, IMPORT_CONCURRENCY, IMPORT_MAX_SOURCES, IMPORT_TIMEOUT
+from app.database import SessionLocal, dialect_insert
+from app.feed_stream import USER_AGENT
+from app.models import Category, Source
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+SNIFF_BYTES = 256 * 1024  # read at most this much of each candidate
+CHUNK_BYTES = 16 * 1024
+FEED_ROOTS = {"rss", "feed", "RDF"}
+ENTRY_TAGS = {"item", "entry"}
+DEFAULT_COLOR = "#ffffff"
+MAX_REDIRECTS = 5
+JSON_FIELDS = ("name", "url", "rss_url", "xmlUrl", "category", "color")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def normalize_url(url: str) -> str:
+    """Comparison key: lowercase scheme and host, no default port or fragment"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if parts.port and (parts.scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", parts.query, ""))
+
+
+# ===== PARSING =====
+
+def parse_opml(body: bytes) -> list:
+    try:
+        root = ET.fromstring(body)
+    except ET.ParseError as e:
+        raise HTTPException(status_code=400, detail=f"Not a valid OPML document: {e}")
+    candidates = []
+
+    def walk(parent, folder):
+        for outline in parent.findall("outline"):
+            title = outline.get("title") or outline.get("text")
+            url = outline.get("xmlUrl") or outline.get("xmlurl")
+            if url:
+                category = outline.get("category")
+                if category:  # comma-separated "/folder/sub" paths; use the first one's leaf
+                    category = category.split(",")[0].strip().strip("/").rsplit("/", 1)[-1] or None
+                candidates.append({"name": title, "url": url, "category": category or folder})
+            else:
+                walk(outline, title or folder)
+
+    body_elem = root.find("body")
+    walk(body_elem if body_elem is not None else root, None)
+    return candidates
+
+
+def parse_json(body: bytes) -> list:
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Not valid JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get("sources")
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise HTTPException(status_code=400, detail="Expected a list of sources (or {\"sources\": [...]})")
+    for i, item in enumerate(data):
+        for field in JSON_FIELDS:
+            if item.get(field) is not None and not isinstance(item[field], str):
+                raise HTTPException(status_code=400, detail=f"Entry {i}: \"{field}\" must be a string")
+    return [
+        {
+            "name": item.get("name"),
+            "url": item.get("url") or item.get("rss_url") or item.get("xmlUrl"),
+            "category": item.get("category"),
+            "color": item.get("color"),
+        }
+        for item in data
+    ]
+
+
+# ===== VALIDATION =====
+
+def _public_address(url: str):
+    """(address to connect to, None) or (None, why ``url`` must not be requested).
+
+    The address is None when IMPORT_ALLOW_PRIVATE is set: the request resolves the host itself.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None, "Not an http(s) URL"
+    if IMPORT_ALLOW_PRIVATE:
+        return None, None
+    try:
+        infos = socket.getaddrinfo(parts.hostname, parts.port or 443, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError) as e:
+        return None, f"Host not found ({e})"
+    addresses = [ipaddress.ip_address(info[4][0].split("%", 1)[0]) for info in infos]
+    for address in addresses:
+        if not address.is_global:
+            return None, f"{parts.hostname} resolves to a non-public address ({address})"
+    return str(addresses[0]), None
+
+
+class PinnedAdapter(HTTPAdapter):
+    """Sends requests to one already-checked address instead of resolving the host again.
+
+    The URL's host still goes out as the Host header and, for https, as the
+    TLS server name the certificate is checked against.
+    """
+
+    def __init__(self, host: str, address: str):
+        self.host = host
+        self.address = f"[{address}]" if ":" in address else address
+        super().__init__()
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, server_hostname=self.host, assert_hostname=self.host, **kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers["Host"] = parts.netloc.rpartition("@")[2]
+        netloc = f"{self.address}:{parts.port}" if parts.port else self.address
+        request.url = urlunsplit(parts._replace(netloc=netloc))
+        return super().send(request, **kwargs)
+
+
+def _get(url: str, address: str, timeout: float):
+    """Streamed GET of ``url`` without following redirects, at ``address`` if given"""
+    session = requests.Session()
+    if address:
+        session.trust_env = False  # a proxy would resolve the host again
+        session.mount(f"{urlsplit(url).scheme}://", PinnedAdapter(urlsplit(url).hostname, address))
+    try:
+        return session.get(url, headers={"User-Agent": USER_AGENT}, stream=True, timeout=timeout,
+                           allow_redirects=False)
+    finally:
+        session.close()
+
+
+def _sniff(response, deadline: float):
+    """(root element, feed title) from the start of the body, or (None, reason)"""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root, depth, received = None, 0, 0
+    try:
+        for chunk in response.iter_content(CHUNK_BYTES):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                tag = _local(elem.tag)
+                if event == "start":
+                    depth += 1
+                    if root is None:
+                        root = tag
+                        if root not in FEED_ROOTS:
+                            return None, f"<{root}> document, not a feed"
+                    elif tag in ENTRY_TAGS:
+                        return root, None  # no feed title before the first entry
+                else:
+                    if tag == "title" and depth <= 3:
+                        return root, (elem.text or "").strip() or None
+                    depth -= 1
+            received += len(chunk)
+            if received >= SNIFF_BYTES or time.monotonic() > deadline:
+                break
+    except ET.ParseError as e:
+        return None, f"not XML ({e})"
+    if root is None:
+        return None, "empty response"
+    return root, None
+
+
+def probe(url: str, timeout: float = IMPORT_TIMEOUT) -> dict:
+    """Fetch the start of a candidate feed (blocking)"""
+    deadline = time.monotonic() + timeout
+    # Redirects are followed by hand so every hop's address is checked before it's requested;
+    # the canonical URL is the end of the leading run of permanent ones
+    current = canonical = url
+    permanent = True
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            address, refused = _public_address(current)
+            if refused:
+                return {"ok": False, "canonical_url": canonical, "detail": refused}
+            with _get(current, address, timeout) as response:
+                if response.is_redirect:
+                    permanent = permanent and response.status_code in (301, 308)
+                    current = urljoin(current, response.headers["location"])
+                    if permanent:
+                        canonical = current
+                    continue
+                if response.status_code >= 400:
+                    return {"ok": False, "canonical_url": canonical, "detail": f"HTTP {response.status_code}"}
+                root, title = _sniff(response, deadline)
+                break
+        else:
+            return {"ok": False, "canonical_url": canonical, "detail": f"More than {MAX_REDIRECTS} redirects"}
+    except requests.RequestException as e:
+        return {"ok": False, "canonical_url": canonical, "detail": f"{type(e).__name__}: {e}"[:200]}
+    if root is None:
+        return {"ok": False, "canonical_url": canonical, "detail": title}
+    return {"ok": True, "canonical_url": canonical, "title": title}
+
+
+async def validate(urls: list, concurrency: int = IMPORT_CONCURRENCY, timeout: float = IMPORT_TIMEOUT) -> list:
+    """probe() every URL, ``concurrency`` at a time; results in order"""
+    if not urls:
+        return []
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="import") as pool:
+        return await asyncio.gather(*(loop.run_in_executor(pool, probe, url, timeout) for url in urls))
+
+
+# ===== IMPORT =====
+
+def _known_urls() -> set:
+    db = SessionLocal()
+    try:
+        return {normalize_url(url) for (url,) in db.query(Source.rss_url).all() if url}
+    finally:
+        db.close()
+
+
+def _insert(rows: list) -> list:
+    """Insert sources (creating their categories) in one transaction; returns new source ids.
+
+    Runs on the loop: no awaits between the first write and the commit.
+    """
+    db = SessionLocal()
+    try:
+        categories = {name.lower(): (cid, color) for cid, name, color in
+                      db.query(Category.id, Category.name, Category.color).all()}
+        for row in rows:
+            key = row["category"].lower()
+            if key not in categories:
+                category = Category(name=row["category"], color=row["color"] or DEFAULT_COLOR)
+                db.add(category)
+                db.flush()
+                categories[key] = (category.id, category.color)
+
+        values = [
+            {
+                "name": row["name"],
+                "rss_url": row["url"],
+                "color": row["color"] or categories[row["category"].lower()][1],
+                "category_id": categories[row["category"].lower()][0],
+            }
+            for row in rows
+        ]
+        stmt = dialect_insert(Source)
+        if stmt is not None:
+            db.execute(stmt.values(values).on_conflict_do_nothing(index_elements=[Source.rss_url]))
+        else:
+            db.add_all(Source(**value) for value in values)
+        db.commit()
+        urls = [value["rss_url"] for value in values]
+        return [sid for (sid,) in db.query(Source.id).filter(Source.rss_url.in_(urls)).all()]
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def import_sources(candidates: list, default_category: str, dry_run: bool = False) -> dict:
+    results = []
+    seen = {}  # normalized URL -> index of the result that claimed it
+    known = await asyncio.to_thread(_known_urls)
+
+    to_probe = []
+    for candidate in candidates:
+        url = (candidate.get("url") or "").strip()
+        result = {"url": url, "name": candidate.get("name"), "category": candidate.get("category") or default_category}
+        results.append(result)
+        if not url.startswith(("http://", "https://")):
+            result.update(status="invalid", detail="Not an http(s) URL")
+            continue
+        key = normalize_url(url)
+        if key in known:
+            result["status"] = "exists"
+        elif key in seen:
+            result.update(status="duplicate", detail=f"Same URL as entry {seen[key]}")
+        else:
+            seen[key] = len(results) - 1
+            to_probe.append(len(results) - 1)
+
+    started = time.monotonic()
+    checks = await validate([results[i]["url"] for i in to_probe])
+    logger.info(f"Validated {len(to_probe)} candidate feeds in {time.monotonic() - started:.1f}s")
+
+    valid = []
+    for i, check in zip(to_probe, checks):
+        result = results[i]
+        result["canonical_url"] = check["canonical_url"]
+        if not check["ok"]:
+            result.update(status="invalid", detail=check["detail"])
+            continue
+        key = normalize_url(check["canonical_url"])
+        if key in known:
+            result.update(status="exists", detail="Redirects to a stored source")
+        elif key in seen and seen[key] != i:
+            result.update(status="duplicate", detail=f"Redirects to the same feed as entry {seen[key]}")
+        else:
+            seen[key] = i
+            result["name"] = (result["name"] or check.get("title") or urlsplit(check["canonical_url"]).hostname)[:255]
+            result["status"] = "valid"
+            valid.append({
+                "name": result["name"],
+                "url": check["canonical_url"],
+                "category": result["category"][:100],
+                "color": candidates[i].get("color"),
+            })
+
+    job = None
+    if valid and not dry_run:
+        new_ids = _insert(valid)
+        bump_data_version("sources", "categories")
+        for result in results:
+            if result.get("status") == "valid":
+                result["status"] = "added"
+        if new_ids:
+            from app.fetch_coordinator import coordinator
+            job, outcome = coordinator.trigger(new_ids, forced=False, reason="import")
+            if outcome == "joined" and job is coordinator.running:
+                job, _ = coordinator.follow_up(new_ids, reason="import")
+        logger.info(f"Imported {len(valid)} sources")
+
+    return {
+        "dry_run": dry_run,
+        "summary": dict(Counter(r["status"] for r in results)),
+        "fetch_job": job.to_dict() if job else None,
+        "results": results,
+    }
+
+
+@router.post("/api/sources/import")
+async def import_endpoint(request: Request, default_category: str = "Imported", dry_run: bool = False,
+                          user_id: str = Depends(verify_token)):
+    """Add sources from an OPML document or a JSON list (admin only; ``dry_run`` only validates)"""
+    body = await request.body()
+    if len(body) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Uploads are limited to {MAX_UPLOAD_BYTES // 1024 // 1024} MB")
+    content_type = request.headers.get("content-type", "")
+    is_json = "json" in content_type or body.lstrip()[:1] in (b"[", b"{")
+    candidates = parse_json(body) if is_json else parse_opml(body)
+    if not candidates:
+        raise HTTPException(status_code=400, detail="No feeds found in the upload")
+    if len(candidates) > IMPORT_MAX_SOURCES:
+        raise HTTPException(status_code=413, detail=f"At most {IMPORT_MAX_SOURCES} sources per import")
+    return await import_sources(candidates, default_category, dry_run)
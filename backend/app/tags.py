@@ -0,0 +1,137 @@
+"""Tag facets from an incrementally maintained in-memory tally.
+
+Ingest adds every new article's tags to a ring of 10-minute buckets keyed
+by publish time, so facet counts for the last N hours are a sum over a few
+small counters rather than a GROUP BY per request. Buckets older than
+MAX_HOURS (the retention window, ARTICLE_RETENTION_DAYS) fall off as time
+advances, at the same publish-time cutoff cleanup archives their articles
+at, so the tally never counts articles that have been deleted. Articles
+published in the future count towards the newest bucket. The tally lives on
+the event loop, like the trending engine, and is rebuilt from article_tags
+at startup.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter
+
+from app.config import ARTICLE_RETENTION_DAYS
+from app.database import SessionLocal
+from app.models import Article, ArticleTag
+
+router = APIRouter()
+
+BUCKET_SECONDS = 600
+MAX_HOURS = ARTICLE_RETENTION_DAYS * 24  # cleanup archives and deletes older articles
+
+
+def parse_tags(value: str) -> list:
+    """``Article.tags`` (comma-separated) as a list"""
+    return [t for t in (value or "").split(",") if t]
+
+
+def _epoch(ts: datetime) -> float:
+    return ts.replace(tzinfo=timezone.utc).timestamp()
+
+
+class TagTally:
+    def __init__(self, max_hours: int = MAX_HOURS):
+        self.span = max_hours * 3600 // BUCKET_SECONDS
+        self.buckets = {}  # bucket number -> Counter of (category_id, tag)
+
+    def add(self, tags, category_id=None, published: float = None, now: float = None):
+        now = time.time() if now is None else now
+        bucket = int(min(published if published is not None else now, now) // BUCKET_SECONDS)
+        if bucket <= now // BUCKET_SECONDS - self.span:
+            return  # already past the window
+        counter = self.buckets.get(bucket)
+        if counter is None:
+            counter = self.buckets[bucket] = Counter()
+            self._prune(now)
+        for tag in tags:
+            counter[category_id, tag] += 1
+
+    def _prune(self, now: float):
+        oldest = now // BUCKET_SECONDS - self.span
+        for bucket in [b for b in self.buckets if b <= oldest]:
+            del self.buckets[bucket]
+
+    def facets(self, hours: int = 24, category_id=None, now: float = None):
+        """[{tag, count}] for articles published in the last ``hours``, most frequent first"""
+        now = time.time() if now is None else now
+        self._prune(now)
+        first = now // BUCKET_SECONDS - min(hours * 3600 // BUCKET_SECONDS, self.span)
+        totals = Counter()
+        for bucket, counter in self.buckets.items():
+            if bucket > first:
+                for (category, tag), count in counter.items():
+                    if category_id is None or category == category_id:
+                        totals[tag] += count
+        return [{"tag": tag, "count": count} for tag, count in totals.most_common() if count]
+
+
+tally = TagTally()
+
+
+def add_articles(articles):
+    """Count freshly ingested articles (called on the loop after their commit)"""
+    now = time.time()
+    for article in articles:
+        if article.tags:
+            published = _epoch(article.timestamp) if article.timestamp else None
+            tally.add(parse_tags(article.tags), article.category_id, published, now)
+
+
+def _untagged_rows():
+    db = SessionLocal()
+    try:
+        if db.query(ArticleTag.id).first():
+            return []
+        return db.query(Article.id, Article.tags, Article.timestamp).filter(Article.tags != "").all()
+    finally:
+        db.close()
+
+
+def _recent_tags():
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - timedelta(hours=MAX_HOURS)
+        return (
+            db.query(ArticleTag.tag, ArticleTag.timestamp, Article.category_id)
+            .join(Article, Article.id == ArticleTag.article_id)
+            .filter(ArticleTag.timestamp >= since)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+async def load_tally():
+    """Fill article_tags for articles stored before it existed, then rebuild the tally"""
+    rows = await asyncio.to_thread(_untagged_rows)
+    if rows:
+        db = SessionLocal()
+        try:
+            db.bulk_insert_mappings(ArticleTag, [
+                {"article_id": article_id, "tag": tag, "timestamp": ts}
+                for article_id, tags, ts in rows
+                for tag in parse_tags(tags)
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+    now = time.time()
+    for tag, ts, category_id in await asyncio.to_thread(_recent_tags):
+        tally.add((tag,), category_id, _epoch(ts) if ts else None, now)
+    return len(rows)
+
+
+@router.get("/api/tags")
+async def get_tags(hours: int = 24, category: int = None):
+    """Tag facet counts for articles published in the last ``hours`` (async: the tally lives on the loop)"""
+    hours = max(1, min(hours, MAX_HOURS))
+    return {"hours": hours, "category_id": category, "tags": tally.facets(hours, category)}
@@ -0,0 +1,282 @@
+"""Per-user timelines.
+
+A reader account (``User``) follows categories (``user_categories``; none
+means all) and keywords. Its timeline is a bounded in-memory list of the
+ids of matching articles, newest first (TIMELINE_SIZE):
+
+* at ingest, each new article is matched once against the timelines in
+  memory and prepended where it matches; users connected to ``/ws/me`` get
+  it pushed
+* a timeline is rebuilt from the newest TIMELINE_SCAN_ROWS articles only
+  on a cache miss (first read or ``/ws/me`` connect, or evicted from the
+  LRU of TIMELINE_CACHE_USERS) and when the user changes their preferences
+* users connected to ``/ws/me`` are never evicted, so their pushes don't
+  stop; the LRU can exceed TIMELINE_CACHE_USERS by that many (at most
+  WS_MAX_CLIENTS)
+
+``/api/me/articles`` takes the ids from memory and loads those rows by
+primary key through the response cache, so a personal read costs what a
+global one does however many categories and keywords the user has.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
+
+from app.auth import verify_user
+from app.cache import bump_data_version, cached_json
+from app.config import TIMELINE_CACHE_USERS, TIMELINE_SCAN_ROWS, TIMELINE_SIZE
+from app.database import ReadSessionLocal, SessionLocal
+from app.metrics import TIMELINE_BUILDS, TIMELINE_BUILD_SECONDS, TIMELINES_CACHED
+from app.models import Article, Category, Source, User, UserCategory
+from app.schemas import UserUpdate
+from app.utils import article_item
+from app.websocket import LIST_COLUMNS, manager
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_KEYWORDS = 50
+MAX_KEYWORD_CHARS = 64
+
+
+def compile_keywords(keywords) -> Optional[re.Pattern]:
+    """One case-insensitive pattern matching any keyword as a whole word (None: no keywords)"""
+    words = sorted({k.strip().lower() for k in keywords or [] if k and k.strip()}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(w) for w in words) + r")(?!\w)", re.IGNORECASE)
+
+
+def _text(title: str, description: str) -> str:
+    return f"{title or ''}\n{description or ''}"
+
+
+def _namespace(user_id: int) -> str:
+    """Response cache namespace of one user's timeline"""
+    return f"timeline:{user_id}"
+
+
+class Timeline:
+    __slots__ = ("categories", "pattern", "ids")
+
+    def __init__(self, categories, keywords):
+        self.categories = frozenset(categories)  # category ids; empty follows all
+        self.pattern = compile_keywords(keywords)
+        self.ids = deque(maxlen=TIMELINE_SIZE)  # newest first
+
+    def matches(self, category_id: int, text: str) -> bool:
+        if self.categories and category_id not in self.categories:
+            return False
+        return self.pattern is None or self.pattern.search(text) is not None
+
+
+def build_timeline(user_id: int):
+    """(timeline, newest article id it has seen) from the database, or None for an unknown user (blocking)"""
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is None:
+            return None
+        categories = [cid for (cid,) in db.query(UserCategory.category_id).filter(UserCategory.user_id == user_id)]
+        timeline = Timeline(categories, user.keywords)
+        max_id = db.query(func.max(Article.id)).scalar() or 0
+        query = db.query(Article.id, Article.category_id, Article.title, Article.description).filter(Article.id <= max_id)
+        if timeline.categories:
+            query = query.filter(Article.category_id.in_(timeline.categories))
+        for article_id, category_id, title, description in (
+            query.order_by(Article.timestamp.desc()).limit(TIMELINE_SCAN_ROWS).yield_per(500)
+        ):
+            if timeline.matches(category_id, _text(title, description)):
+                timeline.ids.append(article_id)
+                if len(timeline.ids) == TIMELINE_SIZE:
+                    break
+        return timeline, max_id
+    finally:
+        db.close()
+
+
+class TimelineStore:
+    """Timelines in memory (LRU) and the ingest-side matching"""
+
+    def __init__(self, size: int = TIMELINE_CACHE_USERS):
+        self.size = max(1, size)
+        self.timelines = OrderedDict()  # user id -> Timeline
+        # (id, category id, text) of the latest ingested articles, for builds they raced with
+        self.recent = deque(maxlen=TIMELINE_SIZE)
+
+    async def get(self, user_id: int) -> Timeline:
+        timeline = self.timelines.get(user_id)
+        if timeline is not None:
+            self.timelines.move_to_end(user_id)
+            return timeline
+        return await self.rebuild(user_id, "miss")
+
+    async def rebuild(self, user_id: int, reason: str) -> Timeline:
+        started = time.perf_counter()
+        built = await asyncio.to_thread(build_timeline, user_id)
+        if built is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        timeline, max_id = built
+        # Articles ingested while the build ran on its thread
+        for article_id, category_id, text in self.recent:
+            if article_id > max_id and timeline.matches(category_id, text):
+                timeline.ids.appendleft(article_id)
+
+        self.timelines[user_id] = timeline
+        self.timelines.move_to_end(user_id)
+        self._evict()
+        bump_data_version(_namespace(user_id))
+        TIMELINES_CACHED.set(len(self.timelines))
+        TIMELINE_BUILDS.inc(reason=reason)
+        TIMELINE_BUILD_SECONDS.observe(time.perf_counter() - started)
+        return timeline
+
+    def _evict(self):
+        """Drop least recently used timelines over ``size``, keeping those of connected users"""
+        excess = len(self.timelines) - self.size
+        if excess <= 0:
+            return
+        idle = [user_id for user_id in self.timelines if not manager.has_user(user_id)]
+        for user_id in idle[:excess]:
+            del self.timelines[user_id]
+
+    def add_articles(self, articles) -> Dict[int, list]:
+        """Prepend new articles to the timelines they match; returns article id -> user ids"""
+        matched = {}
+        for article in articles:
+            text = _text(article.title, article.description)
+            self.recent.append((article.id, article.category_id, text))
+            for user_id, timeline in self.timelines.items():
+                if timeline.matches(article.category_id, text):
+                    timeline.ids.appendleft(article.id)
+                    matched.setdefault(article.id, []).append(user_id)
+        for user_id in {user_id for users in matched.values() for user_id in users}:
+            bump_data_version(_namespace(user_id))
+        return matched
+
+
+timelines = TimelineStore()
+
+
+def publish(data: Dict, users):
+    """Push an "article" message (the /api/articles item) to the users whose timeline took it"""
+    for user_id in users:
+        manager.send_to_user(user_id, {"type": "article", "data": data})
+
+
+# ===== API =====
+
+def _timeline_items(timeline: Timeline, limit: int):
+    ids = list(timeline.ids)[:limit]  # copied in one C call, so safe against appends on the loop
+    db = ReadSessionLocal()
+    try:
+        cats = {c.id: c.name for c in db.query(Category).all()}
+        source_colors = {s.id: s.color for s in db.query(Source).all()}
+        rows = {a.id: a for a in db.query(Article).options(load_only(*LIST_COLUMNS)).filter(Article.id.in_(ids))}
+        # Articles past retention have been deleted; skip their ids
+        return [
+            article_item(rows[i], cats.get(rows[i].category_id), source_colors.get(rows[i].source_id))
+            for i in ids if i in rows
+        ]
+    finally:
+        db.close()
+
+
+@router.get("/api/me/articles")
+async def my_articles(request: Request, limit: int = 50, user_id: int = Depends(verify_user)):
+    """The signed-in user's timeline, newest first, in the /api/articles item shape"""
+    timeline = await timelines.get(user_id)
+    limit = max(1, min(limit, TIMELINE_SIZE))
+    return await asyncio.to_thread(
+        cached_json, request, ("articles", "sources", "categories", _namespace(user_id)),
+        lambda: _timeline_items(timeline, limit),
+        key=f"{request.url.path}?user={user_id}&limit={limit}", private=True,
+    )
+
+
+def _preferences(db, user: User) -> Dict:
+    categories = (
+        db.query(Category.name)
+        .join(UserCategory, UserCategory.category_id == Category.id)
+        .filter(UserCategory.user_id == user.id)
+        .order_by(Category.name)
+        .all()
+    )
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "theme": user.theme,
+        "alerts_enabled": user.alerts_enabled,
+        "keywords": user.keywords or [],
+        "categories": [name for (name,) in categories],
+    }
+
+
+@router.get("/api/me/preferences")
+def get_preferences(user_id: int = Depends(verify_user)):
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return _preferences(db, user)
+    finally:
+        db.close()
+
+
+@router.put("/api/me/preferences")
+async def update_preferences(body: UserUpdate, user_id: int = Depends(verify_user)):
+    """Change followed categories (names; empty = all), keywords, theme or alerts.
+
+    A change of categories or keywords rebuilds the timeline and sends
+    "timeline_reset" on /ws/me.
+    """
+    keywords = None
+    if body.keywords is not None:
+        keywords = list(dict.fromkeys(k.strip() for k in body.keywords if k and k.strip()))
+        if len(keywords) > MAX_KEYWORDS or any(len(k) > MAX_KEYWORD_CHARS for k in keywords):
+            raise HTTPException(status_code=400, detail=f"At most {MAX_KEYWORDS} keywords of "
+                                                        f"{MAX_KEYWORD_CHARS} characters")
+
+    # No awaits between the first write and the commit (the SQLite connection is shared)
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        if body.categories is not None:
+            wanted = {name.strip().lower() for name in body.categories if name and name.strip()}
+            found = db.query(Category.id, Category.name).filter(func.lower(Category.name).in_(wanted)).all()
+            unknown = wanted - {name.lower() for _, name in found}
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(sorted(unknown))}")
+            db.query(UserCategory).filter(UserCategory.user_id == user_id).delete(synchronize_session=False)
+            db.add_all(UserCategory(user_id=user_id, category_id=category_id) for category_id, _ in found)
+        if keywords is not None:
+            user.keywords = keywords
+        if body.theme is not None:
+            user.theme = body.theme[:20]
+        if body.alerts_enabled is not None:
+            user.alerts_enabled = body.alerts_enabled
+        db.commit()
+        preferences = _preferences(db, user)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if body.categories is not None or keywords is not None:
+        await timelines.rebuild(user_id, "preferences")
+        manager.send_to_user(user_id, {"type": "timeline_reset"})
+    return preferences
@@ -0,0 +1,266 @@
+"""Streaming trending-topics detector.
+
+Ingest feeds every new title's terms (words and adjacent-word bigrams, once
+per article) into two sliding-window Count-Min Sketches: the recent window
+(TRENDING_WINDOW_MINUTES in 5-minute buckets) and a baseline
+(TRENDING_BASELINE_HOURS in hourly buckets). A bounded top-K heap tracks
+the terms with the highest recent counts. A term's burst score compares its
+recent count with what its baseline rate predicts for a window of that
+length. Memory stays fixed whatever the volume: two rings of sketches plus
+CANDIDATES terms.
+"""
+
+import asyncio
+import heapq
+import math
+import re
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter
+
+from app.config import TRENDING_BASELINE_HOURS, TRENDING_WINDOW_MINUTES
+from app.database import SessionLocal
+from app.models import Article
+from app.websocket import broadcast_trending
+
+router = APIRouter()
+
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+WINDOW_BUCKET_SECONDS = 300
+BASELINE_BUCKET_SECONDS = 3600
+CANDIDATES = 256  # terms kept in the top-K heap
+MIN_COUNT = 3  # articles in the window before a term can trend
+TOP_LIMIT = 50
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#'-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about after again against all also am an and any are as at be because been before being between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my new no nor not now of off on once only or other our out
+over own same says she should so some such than that the their them then there these they this those through to
+too under until up very via was we were what when where which while who whom why will with would you your
+report reports news update updates today week weekly day daily year amid said vs
+""".split())
+
+
+def title_terms(title: str) -> set:
+    """Words and adjacent-word bigrams of a title, lowercased, without stopwords"""
+    words = WORD_PATTERN.findall((title or "").lower())
+    terms = set()
+    previous = None
+    for word in words:
+        if word in STOPWORDS or len(word) < 3 and not word.isdigit():
+            previous = None
+            continue
+        if not word.isdigit():
+            terms.add(word)
+        if previous is not None:
+            terms.add(f"{previous} {word}")
+        previous = word
+    return terms
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch: estimates never undercount"""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = array("I", bytes(4 * width * depth))
+
+    def cells(self, key: str):
+        # Double hashing off one salted hash; stable within the process, which is all we need
+        h = hash(key)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        return [row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, cells, count: int = 1):
+        table = self.table
+        for cell in cells:
+            table[cell] += count
+
+    def estimate(self, cells) -> int:
+        table = self.table
+        return min(table[cell] for cell in cells)
+
+    def subtract(self, other: "CountMinSketch"):
+        self.table = array("I", map(int.__sub__, self.table, other.table))
+
+    def clear(self):
+        self.table = array("I", bytes(4 * self.width * self.depth))
+
+
+class SlidingSketch:
+    """Ring of per-bucket sketches plus their running total"""
+
+    def __init__(self, bucket_seconds: int, buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.ring = [CountMinSketch() for _ in range(buckets)]
+        self.total = CountMinSketch()
+        self.head = None  # newest bucket number (time // bucket_seconds)
+
+    @property
+    def span(self) -> int:
+        return self.bucket_seconds * len(self.ring)
+
+    def advance(self, now: float):
+        bucket = int(now // self.bucket_seconds)
+        if self.head is None or bucket - self.head >= len(self.ring):
+            for sketch in self.ring:
+                sketch.clear()
+            self.total.clear()
+            self.head = bucket
+            return
+        while self.head < bucket:
+            self.head += 1
+            expired = self.ring[self.head % len(self.ring)]
+            self.total.subtract(expired)
+            expired.clear()
+
+    def add(self, cells, now: float):
+        bucket = int(now // self.bucket_seconds)
+        if self.head is None or bucket > self.head:
+            self.advance(now)
+        elif bucket <= self.head - len(self.ring):
+            return  # older than the window
+        self.ring[bucket % len(self.ring)].add(cells)
+        self.total.add(cells)
+
+
+class TrendingEngine:
+    def __init__(self, window_minutes: int = TRENDING_WINDOW_MINUTES,
+                 baseline_hours: int = TRENDING_BASELINE_HOURS, capacity: int = CANDIDATES):
+        self.window = SlidingSketch(WINDOW_BUCKET_SECONDS, max(1, window_minutes * 60 // WINDOW_BUCKET_SECONDS))
+        self.baseline = SlidingSketch(BASELINE_BUCKET_SECONDS, max(1, baseline_hours * 3600 // BASELINE_BUCKET_SECONDS))
+        self.capacity = capacity
+        self.candidates = {}  # term -> window count when last seen
+        self.heap = []  # (count, term), may hold stale entries
+        self.since = None  # time of the oldest title seen
+
+    def add_title(self, title: str, now: float = None):
+        now = time.time() if now is None else now
+        if self.since is None or now < self.since:
+            self.since = now
+        for term in title_terms(title):
+            cells = self.window.total.cells(term)
+            self.window.add(cells, now)
+            self.baseline.add(cells, now)
+            self._offer(term, self.window.total.estimate(cells))
+
+    def add_titles(self, titles, now: float = None):
+        for title in titles:
+            self.add_title(title, now)
+
+    def _min_count(self):
+        while self.heap:
+            count, term = self.heap[0]
+            if self.candidates.get(term) == count:
+                return count
+            heapq.heappop(self.heap)  # stale
+        return None
+
+    def _offer(self, term: str, count: int):
+        if term not in self.candidates and len(self.candidates) >= self.capacity:
+            lowest = self._min_count()
+            if lowest is not None and count <= lowest:
+                return
+            _, evicted = heapq.heappop(self.heap)
+            del self.candidates[evicted]
+        self.candidates[term] = count
+        heapq.heappush(self.heap, (count, term))
+        if len(self.heap) > 4 * self.capacity:
+            self._rebuild()
+
+    def _rebuild(self):
+        self.heap = [(count, term) for term, count in self.candidates.items()]
+        heapq.heapify(self.heap)
+
+    def top(self, limit: int = 20, now: float = None):
+        """Terms ranked by burst score: (recent - expected) / sqrt(expected + 1)"""
+        now = time.time() if now is None else now
+        self.window.advance(now)
+        self.baseline.advance(now)
+        span = self.window.span
+        history = max(0.0, min(self.baseline.span, now - self.since) - span) if self.since else 0.0
+
+        scored = []
+        for term in list(self.candidates):
+            cells = self.window.total.cells(term)
+            recent = self.window.total.estimate(cells)
+            if recent == 0:
+                del self.candidates[term]  # aged out of the window
+                continue
+            self.candidates[term] = recent
+            if recent < MIN_COUNT:
+                continue
+            past = max(0, self.baseline.total.estimate(cells) - recent)
+            expected = past * span / history if history else 0.0
+            score = (recent - expected) / math.sqrt(expected + 1)
+            if score > 0:
+                scored.append((score, recent, expected, term))
+        self._rebuild()
+
+        scored.sort(reverse=True)
+        return [
+            {"term": term, "count": recent, "expected": round(expected, 2), "score": round(score, 2)}
+            for score, recent, expected, term in scored[:limit]
+        ]
+
+    def memory_bytes(self) -> int:
+        sketches = len(self.window.ring) + len(self.baseline.ring) + 2
+        return sketches * SKETCH_WIDTH * SKETCH_DEPTH * 4
+
+
+engine = TrendingEngine()
+_last_broadcast = None
+
+
+def _recent_titles():
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - timedelta(hours=TRENDING_BASELINE_HOURS)
+        return (
+            db.query(Article.title, Article.fetched_at)
+            .filter(Article.fetched_at >= since)
+            .order_by(Article.fetched_at)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+async def load_history():
+    """Seed the windows with the titles ingested during the baseline period"""
+    rows = await asyncio.to_thread(_recent_titles)
+    for title, fetched_at in rows:
+        engine.add_title(title, fetched_at.replace(tzinfo=timezone.utc).timestamp())
+    return len(rows)
+
+
+def snapshot(limit: int = 20):
+    return {
+        "window_minutes": TRENDING_WINDOW_MINUTES,
+        "baseline_hours": TRENDING_BASELINE_HOURS,
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "terms": engine.top(limit),
+    }
+
+
+async def publish_trending():
+    """Scheduled: push the current list to stream clients when it has changed"""
+    global _last_broadcast
+    data = snapshot()
+    ranking = [(t["term"], t["count"]) for t in data["terms"]]
+    if ranking != _last_broadcast:
+        _last_broadcast = ranking
+        await broadcast_trending(data)
+
+
+@router.get("/api/trending")
+async def get_trending(limit: int = 20):
+    """Terms spiking in the recent window relative to the baseline (async: the engine lives on the loop)"""
+    return snapshot(max(1, min(limit, TOP_LIMIT)))
@@ -0,0 +1,283 @@
+"""Background severity triage with a pluggable scoring backend.
+
+Ingest gives every article a provisional severity from keyword scoring
+(utils.extract_keywords). When TRIAGE_METHOD names a model backend, new
+articles are also queued here: TRIAGE_CONCURRENCY workers take up to
+TRIAGE_BATCH_SIZE articles at a time and score them in one backend call.
+Results are stored in triage_results keyed by article_hash, so reposts and
+restarts reuse them instead of rescoring; cleanup deletes them with their
+article. The article's severity is then
+upgraded and re-broadcast as an "article_update" message.
+"""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import requests
+
+from app.cache import bump_data_version
+from app.config import (
+    OLLAMA_MODEL, OLLAMA_URL, TRIAGE_BATCH_SIZE, TRIAGE_CONCURRENCY, TRIAGE_METHOD,
+    TRIAGE_QUEUE_SIZE, TRIAGE_TIMEOUT,
+)
+from app.database import SessionLocal
+from app.metrics import TRIAGE_ARTICLES, TRIAGE_BATCH_SECONDS, TRIAGE_QUEUE_DEPTH
+from app.models import Article, TriageResult
+from app.utils import severity_label
+from app.websocket import broadcast_article_update
+
+logger = logging.getLogger(__name__)
+
+LABEL_SCORES = {"critical": 10, "high": 8, "medium": 5, "low": 2}
+BATCH_LINGER = 0.05  # seconds a worker waits for a batch to fill up
+PROMPT_TEXT_CHARS = 600  # description characters sent per article
+REQUEUE_WINDOW = timedelta(days=2)  # unscored articles picked up again at startup
+
+
+class TriageItem(NamedTuple):
+    article_id: int
+    article_hash: str
+    title: str
+    description: str
+
+
+class TriageBackend(ABC):
+    """Scores a batch of articles; returns one label from LABEL_SCORES (or None) per item"""
+    name = "base"
+
+    @abstractmethod
+    async def score(self, items):
+        ...
+
+
+class OllamaBackend(TriageBackend):
+    """Local LLM via Ollama's /api/generate, one prompt per batch with JSON output"""
+
+    def __init__(self, url: str = OLLAMA_URL, model: str = OLLAMA_MODEL, timeout: float = TRIAGE_TIMEOUT):
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.name = f"ollama:{model}"
+
+    @staticmethod
+    def prompt(items) -> str:
+        lines = [
+            "Classify the severity of each numbered security/intelligence news item as "
+            "critical, high, medium or low.",
+            'Answer with JSON only: {"results": [{"id": <number>, "severity": "<level>"}]}',
+            "",
+        ]
+        for i, item in enumerate(items, 1):
+            lines.append(f"{i}. {item.title}")
+            if item.description:
+                lines.append(f"   {item.description[:PROMPT_TEXT_CHARS]}")
+        return "\n".join(lines)
+
+    def _generate(self, prompt: str) -> str:
+        response = requests.post(
+            f"{self.url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False,
+                "format": "json",
+                "options": {"temperature": 0},
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    async def score(self, items):
+        text = await asyncio.to_thread(self._generate, self.prompt(items))
+        return parse_labels(text, len(items))
+
+
+BACKENDS = {"ollama": OllamaBackend}
+
+
+def parse_labels(text: str, count: int):
+    """Labels by position from a ``{"results": [{"id", "severity"}]}`` answer; None where missing"""
+    labels = [None] * count
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return labels
+    results = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(results, list):
+        return labels
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        idx = result.get("id")
+        label = str(result.get("severity", "")).strip().lower()
+        if isinstance(idx, int) and 1 <= idx <= count and label in LABEL_SCORES:
+            labels[idx - 1] = label
+    return labels
+
+
+class TriageQueue:
+    def __init__(self, backend: TriageBackend, batch_size: int = TRIAGE_BATCH_SIZE,
+                 concurrency: int = TRIAGE_CONCURRENCY, maxsize: int = TRIAGE_QUEUE_SIZE):
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.queue = asyncio.Queue(maxsize)
+        self.pending = set()  # hashes queued or being scored
+        self.workers = []
+
+    def submit(self, item: TriageItem) -> bool:
+        """Queue an article unless it's already pending; False if the queue is full"""
+        if item.article_hash in self.pending:
+            return True
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            TRIAGE_ARTICLES.inc(result="dropped")
+            return False
+        self.pending.add(item.article_hash)
+        TRIAGE_QUEUE_DEPTH.set(self.queue.qsize())
+        return True
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        if self.queue.qsize() < self.batch_size - 1:
+            await asyncio.sleep(BATCH_LINGER)
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        TRIAGE_QUEUE_DEPTH.set(self.queue.qsize())
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._score(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                TRIAGE_ARTICLES.inc(len(batch), result="failed")
+                logger.error(f"Triage batch of {len(batch)} failed ({self.backend.name}): {e}")
+            finally:
+                for item in batch:
+                    self.pending.discard(item.article_hash)
+
+    async def _score(self, batch):
+        with TRIAGE_BATCH_SECONDS.time(backend=self.backend.name):
+            labels = await self.backend.score(batch)
+
+        # Runs on the loop with no awaits until commit (the SQLite connection is shared)
+        updates = []
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            for item, label in zip(batch, labels):
+                if label is None:
+                    TRIAGE_ARTICLES.inc(result="failed")
+                    continue
+                severity = LABEL_SCORES[label]
+                db.merge(TriageResult(article_hash=item.article_hash, severity=severity, label=label,
+                                      model=self.backend.name, scored_at=now))
+                TRIAGE_ARTICLES.inc(result="scored")
+                article = db.get(Article, item.article_id)
+                if article is not None and article.severity != severity:
+                    article.severity = severity
+                    updates.append({
+                        "id": article.id,
+                        "severity": severity_label(severity),
+                        "score": severity,
+                        "triage": label,
+                        "model": self.backend.name,
+                    })
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        if updates:
+            bump_data_version("articles")
+        for update in updates:
+            await broadcast_article_update(update)
+
+    def start(self):
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        logger.info(f"Triage queue started: {self.backend.name}, batch {self.batch_size}, "
+                    f"concurrency {self.concurrency}")
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+
+queue = None  # TriageQueue while a model backend is configured
+
+
+def apply_cached(db, articles) -> set:
+    """Give new ``articles`` their stored model severity; returns the hashes that had one"""
+    if queue is None or not articles:
+        return set()
+    cached = dict(
+        db.query(TriageResult.article_hash, TriageResult.severity)
+        .filter(TriageResult.article_hash.in_([a.article_hash for a in articles]))
+    )
+    for article in articles:
+        if article.article_hash in cached:
+            article.severity = cached[article.article_hash]
+    if cached:
+        TRIAGE_ARTICLES.inc(len(cached), result="cached")
+    return set(cached)
+
+
+def enqueue(articles):
+    """Queue committed articles for model scoring (no-op with keyword triage)"""
+    if queue is None:
+        return
+    for article in articles:
+        queue.submit(TriageItem(article.id, article.article_hash, article.title, article.description or ""))
+
+
+def _unscored(limit: int):
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - REQUEUE_WINDOW
+        return (
+            db.query(Article)
+            .outerjoin(TriageResult, TriageResult.article_hash == Article.article_hash)
+            .filter(TriageResult.article_hash.is_(None), Article.timestamp >= since)
+            .order_by(Article.id.desc())
+            .limit(limit)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+async def start(method: str = TRIAGE_METHOD):
+    """Start the queue for ``method`` and pick up articles a previous run didn't score"""
+    global queue
+    backend = BACKENDS.get(method)
+    if backend is None:
+        if method != "keyword":
+            logger.warning(f"Unknown TRIAGE_METHOD '{method}', using keyword scoring only")
+        return
+    queue = TriageQueue(backend())
+    queue.start()
+    backlog = await asyncio.to_thread(_unscored, queue.queue.maxsize or TRIAGE_QUEUE_SIZE)
+    enqueue(backlog)
+    if backlog:
+        logger.info(f"Requeued {len(backlog)} unscored articles for triage")
+
+
+async def stop():
+    global queue
+    if queue is not None:
+        await queue.stop()
+        queue = None
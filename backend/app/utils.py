@@ -31,6 +31,39 @@ def extract_keywords(title: str) -> list:
 
     return tags, severity
 
+def severity_label(severity: int) -> str:
+    """Label the frontend shows for a 0-10 severity"""
+    severity = severity or 0
+    return "high" if severity >= 7 else "medium" if severity >= 4 else "low"
+
+def article_item(article, category: str, source_color: str) -> dict:
+    """Compact article shape shared by /api/articles and the live stream.
+
+    No description: clients fetch /api/articles/{id} for that.
+    """
+    return {
+        "id": article.id,
+        "title": article.title,
+        "url": article.link,
+        "source": article.source_name,
+        "source_color": source_color or "#55ff55",
+        "category": category or "Unknown",
+        "category_id": article.category_id,
+        "severity": severity_label(article.severity),
+        "tags": [t for t in (article.tags or "").split(",") if t],
+        "published_at": article.timestamp.isoformat() + "Z" if article.timestamp else None,
+    }
+
+def truncate_text(text: str, limit: int) -> str:
+    """``text`` cut to at most ``limit`` characters at a word boundary (0 = no limit)"""
+    if not text or limit <= 0 or len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
 def format_timestamp(dt: datetime) -> str:
     """Format datetime for IRC-style display"""
     if not dt:
@@ -1,48 +1,362 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from collections import deque
+from typing import Dict, Optional
+import asyncio
 import json
 import logging
+import secrets
+import time
+from sqlalchemy.orm import load_only
+from app.config import (
+    REPLAY_LOG_SIZE, CLIENT_SEND_QUEUE_SIZE, SNAPSHOT_MAX_ARTICLES, SSE_KEEPALIVE_SECONDS, WS_MAX_CLIENTS,
+)
+from app.auth import user_from_token
+from app.database import ReadSessionLocal
+from app.models import Article, Category, Source
+from app.utils import article_item
+from app.metrics import WS_CLIENTS, WS_SEND_QUEUE_DEPTH, WS_BROADCAST_SECONDS, WS_SEND_ERRORS, ADMISSION_REJECTED
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Sequence numbers restart with the process; clients resuming across a
+# restart are told so through the epoch and get a snapshot instead.
+EPOCH = secrets.token_hex(4)
+
+
+class Subscriber:
+    """One live client (WebSocket or SSE) with its own bounded send queue.
+
+    A client that falls more than CLIENT_SEND_QUEUE_SIZE messages behind is
+    cut off instead of stalling the broadcast; it reconnects with ?resume=
+    and catches up from the replay log.
+
+    A client is subscribed before its catch-up frames are sent, so nothing
+    broadcast meanwhile is lost; ``caught_up_to`` is the highest seq those
+    frames covered, and queued messages at or below it are skipped rather
+    than sent a second time (and out of order).
+    """
+
+    def __init__(self, kind: str, user_id: int = None):
+        self.kind = kind
+        self.user_id = user_id  # set for /ws/me timeline channels
+        self.queue = asyncio.Queue(maxsize=CLIENT_SEND_QUEUE_SIZE)
+        self.overflowed = False
+        self.caught_up_to = 0
+
+    async def next(self):
+        """Next queued (seq, text) to send, or None when the client must disconnect"""
+        while True:
+            item = await self.queue.get()
+            if item is None or item[0] is None or item[0] > self.caught_up_to:
+                return item
+
+    def offer(self, item):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)  # tells the writer to disconnect
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, replay_size: int = REPLAY_LOG_SIZE):
+        self.subscribers = set()
+        self.user_subscribers = {}  # user id -> subscribers of /ws/me (not in self.subscribers)
+        self.seq = 0
+        self.replay = deque(maxlen=replay_size)  # (seq, json text)
+        self.article_seqs = deque(maxlen=replay_size)  # (seq, article id) of "article" messages
+
+    @property
+    def client_count(self) -> int:
+        return len(self.subscribers) + sum(len(subs) for subs in self.user_subscribers.values())
+
+    def full(self) -> bool:
+        """No room for another live client (WS_MAX_CLIENTS)"""
+        if WS_MAX_CLIENTS > 0 and self.client_count >= WS_MAX_CLIENTS:
+            ADMISSION_REJECTED.inc(reason="stream_full")
+            return True
+        return False
+
+    def subscribe(self, kind: str, user_id: int = None) -> Subscriber:
+        """A global subscriber, or with ``user_id`` one of that user's timeline channel"""
+        subscriber = Subscriber(kind, user_id)
+        if user_id is None:
+            self.subscribers.add(subscriber)
+        else:
+            self.user_subscribers.setdefault(user_id, set()).add(subscriber)
+        WS_CLIENTS.set(self.client_count)
+        logger.info(f"Client connected ({kind}). Total: {self.client_count}")
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber.user_id is None:
+            self.subscribers.discard(subscriber)
+        else:
+            subs = self.user_subscribers.get(subscriber.user_id, set())
+            subs.discard(subscriber)
+            if not subs:
+                self.user_subscribers.pop(subscriber.user_id, None)
+        WS_CLIENTS.set(self.client_count)
+        logger.info(f"Client disconnected ({subscriber.kind}). Total: {self.client_count}")
+
+    def has_user(self, user_id: int) -> bool:
+        return user_id in self.user_subscribers
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"Client connected. Total: {len(self.active_connections)}")
+    def send_to_user(self, user_id: int, message: Dict):
+        """Queue a message for one user's timeline channel (no sequence numbers or replay)"""
+        subs = self.user_subscribers.get(user_id)
+        if not subs:
+            return
+        item = (None, json.dumps(message, default=str))
+        for subscriber in list(subs):
+            subscriber.offer(item)
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        logger.info(f"Client disconnected. Total: {len(self.active_connections)}")
+    def articles_after(self, after_seq: int) -> set:
+        """Ids of the articles broadcast after ``after_seq``"""
+        return {article_id for seq, article_id in self.article_seqs if seq > after_seq}
+
+    def backlog(self, after_seq: Optional[int], epoch: Optional[str]):
+        """Messages after ``after_seq``, or None if they are no longer in the log"""
+        if after_seq is None or epoch != EPOCH or after_seq > self.seq:
+            return None
+        if after_seq == self.seq:
+            return []
+        if not self.replay or self.replay[0][0] > after_seq + 1:
+            return None
+        return [item for item in self.replay if item[0] > after_seq]
 
     async def broadcast(self, message: Dict):
         """Broadcast message to all connected clients"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Broadcast error: {e}")
+        started = time.perf_counter()
+        self.seq += 1
+        # Serialize once for every client
+        item = (self.seq, json.dumps({**message, "seq": self.seq}, default=str))
+        self.replay.append(item)
+        if message.get("type") == "article":
+            self.article_seqs.append((self.seq, message["data"]["id"]))
+        for subscriber in list(self.subscribers):
+            subscriber.offer(item)
+        WS_SEND_QUEUE_DEPTH.set(sum(s.queue.qsize() for s in self.subscribers))
+        WS_BROADCAST_SECONDS.observe(time.perf_counter() - started, type=message.get("type", "unknown"))
 
 manager = ConnectionManager()
 
+
+def _hello() -> str:
+    return json.dumps({"type": "hello", "epoch": EPOCH, "seq": manager.seq})
+
+
+# Article columns article_item() reads; list queries load only these
+LIST_COLUMNS = (
+    Article.id, Article.title, Article.link, Article.source_id, Article.source_name, Article.category_id,
+    Article.severity, Article.tags, Article.timestamp,
+)
+
+
+def article_message_data(article: Article, category: str, source_color: str, iocs=None, locations=None) -> Dict:
+    """Payload of an "article" stream message: the /api/articles item, plus
+    ``iocs`` (extracted (type, value) pairs) and ``locations`` (gazetteer places)"""
+    data = article_item(article, category, source_color)
+    if iocs:
+        data["iocs"] = [{"type": kind, "value": value} for kind, value in iocs]
+    if locations:
+        data["locations"] = [
+            {"place": p.name, "country": p.country, "lat": p.lat, "lon": p.lon} for p in locations
+        ]
+    return data
+
+
+def _snapshot_articles(last_id: int):
+    db = ReadSessionLocal()
+    try:
+        rows = (
+            db.query(Article, Category.name, Source.color)
+            .outerjoin(Source, Source.id == Article.source_id)
+            .outerjoin(Category, Category.id == Article.category_id)
+            .options(load_only(*LIST_COLUMNS))
+            .filter(Article.id > last_id)
+            .order_by(Article.id.desc())
+            .limit(SNAPSHOT_MAX_ARTICLES + 1)
+            .all()
+        )
+        return [article_message_data(a, category, color) for a, category, color in reversed(rows)]
+    finally:
+        db.close()
+
+
+async def _snapshot(last_id: Optional[int]):
+    """Catch-up frame for clients whose gap is not in the replay log.
+
+    Carries the articles newer than the client's ``last_id`` when there are
+    at most SNAPSHOT_MAX_ARTICLES of them; otherwise ``complete`` is false
+    and the client should reload its window.
+    """
+    # Read before the query: everything broadcast up to here was committed before it, so is included
+    seq = manager.seq
+    articles = []
+    complete = False
+    if last_id is not None:
+        articles = await asyncio.to_thread(_snapshot_articles, last_id)
+        complete = len(articles) <= SNAPSHOT_MAX_ARTICLES
+        # Articles broadcast while the query ran come live after the snapshot; don't send them twice
+        live = manager.articles_after(seq)
+        articles = [a for a in articles if a["id"] not in live] if complete else []
+    return seq, json.dumps({
+        "type": "snapshot",
+        "epoch": EPOCH,
+        "seq": seq,
+        "complete": complete,
+        "articles": articles,
+    }, default=str)
+
+
+async def _catch_up(resume: Optional[int], epoch: Optional[str], last_id: Optional[int]):
+    """(seq, text) frames a (re)connecting client needs before live messages"""
+    if resume is None and last_id is None:
+        return []
+    backlog = manager.backlog(resume, epoch)
+    if backlog is not None:
+        return backlog
+    return [await _snapshot(last_id)]
+
+
+async def _pump(websocket: WebSocket, subscriber: Subscriber):
+    while True:
+        item = await subscriber.next()
+        if item is None:
+            await websocket.close(code=1013)  # try again later: reconnect with ?resume=
+            return
+        try:
+            await websocket.send_text(item[1])
+        except Exception as e:
+            WS_SEND_ERRORS.inc()
+            logger.error(f"Broadcast error: {e}")
+            return
+
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, resume: int = None, epoch: str = None, last_id: int = None):
+    await websocket.accept()
+    if manager.full():
+        await websocket.close(code=1013, reason="Server full")  # try again later
+        return
+    # Subscribe before computing the backlog so nothing falls in between
+    subscriber = manager.subscribe("ws")
+    sender = None
     try:
+        await websocket.send_text(_hello())
+        for seq, text in await _catch_up(resume, epoch, last_id):
+            await websocket.send_text(text)
+            subscriber.caught_up_to = max(subscriber.caught_up_to, seq)
+        sender = asyncio.create_task(_pump(websocket, subscriber))
         while True:
             # Keep connection alive and listen for messages
             data = await websocket.receive_text()
             # Could handle commands here later
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        manager.disconnect(websocket)
+    finally:
+        if sender is not None:
+            sender.cancel()
+        manager.unsubscribe(subscriber)
+
+
+@router.websocket("/ws/me")
+async def user_websocket(websocket: WebSocket, token: str = None):
+    """The signed-in user's timeline: "article" messages for new matching articles,
+    and "timeline_reset" when their preferences change (reload /api/me/articles).
+
+    Browsers can't set headers on WebSockets, so the bearer token comes as ?token=.
+    The timeline is loaded before the hello, so ingest matches against it from then on.
+    """
+    from app.timelines import timelines
+
+    await websocket.accept()
+    try:
+        user_id = user_from_token(token or "")
+    except HTTPException:
+        await websocket.close(code=1008, reason="Sign in with a user account")  # policy violation
+        return
+    if manager.full():
+        await websocket.close(code=1013, reason="Server full")
+        return
+    subscriber = manager.subscribe("ws-user", user_id)
+    sender = None
+    try:
+        await timelines.get(user_id)
+        await websocket.send_text(json.dumps({"type": "hello", "user_id": user_id}))
+        sender = asyncio.create_task(_pump(websocket, subscriber))
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"WebSocket error: {e}")
+    finally:
+        if sender is not None:
+            sender.cancel()
+        manager.unsubscribe(subscriber)
+
+
+def _sse(text: str, seq: int = None, event: str = None) -> str:
+    lines = []
+    if seq is not None:
+        lines.append(f"id: {EPOCH}-{seq}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {text}")
+    return "\n".join(lines) + "\n\n"
+
+
+@router.get("/api/stream")
+async def event_stream(request: Request, last_id: int = None):
+    """Server-Sent Events mirror of /ws for proxies that mishandle WebSockets.
+
+    Resumes from the Last-Event-ID header (``<epoch>-<seq>``) using the same
+    replay log.
+    """
+    if manager.full():
+        raise HTTPException(status_code=503, detail="Too many live clients", headers={"Retry-After": "30"})
+    resume, epoch = None, None
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    if last_event_id and "-" in last_event_id:
+        epoch, _, seq = last_event_id.partition("-")
+        resume = int(seq) if seq.isdigit() else None
+
+    async def events():
+        subscriber = manager.subscribe("sse")
+        try:
+            yield "retry: 3000\n" + _sse(_hello(), event="hello")
+            for seq, text in await _catch_up(resume, epoch, last_id):
+                yield _sse(text, seq)
+                subscriber.caught_up_to = max(subscriber.caught_up_to, seq)
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.next(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if item is None:
+                    return
+                yield _sse(item[1], item[0])
+        finally:
+            manager.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 async def broadcast_article(article_dict: Dict):
     """Broadcast new article to all clients"""
@@ -51,9 +365,30 @@ async def broadcast_article(article_dict: Dict):
         "data": article_dict
     })
 
+async def broadcast_article_update(update: Dict):
+    """Broadcast changed fields of an article already sent (e.g. triaged severity)"""
+    await manager.broadcast({
+        "type": "article_update",
+        "data": update
+    })
+
+async def broadcast_trending(data: Dict):
+    """Broadcast the current trending terms"""
+    await manager.broadcast({
+        "type": "trending",
+        "data": data
+    })
+
 async def broadcast_status(message: str):
     """Broadcast status message"""
     await manager.broadcast({
         "type": "status",
         "message": message
     })
+
+async def broadcast_fetch_job(job_dict: Dict):
+    """Broadcast fetch job progress"""
+    await manager.broadcast({
+        "type": "fetch_job",
+        "data": job_dict
+    })
@@ -0,0 +1,222 @@
+"""WebSub (PubSubHubbub) push ingestion.
+
+Feeds that advertise ``<link rel="hub">`` are recorded during polling
+(note_hub). When PUBLIC_BASE_URL is set, maintain_subscriptions() subscribes
+them at their hub and renews leases before they expire; the hub then pushes
+new entries to /api/websub/{source_id}, which verifies the HMAC signature
+and hands them to the same ingest path as polling. Scheduled polling of
+those sources drops to WEBSUB_SAFETY_POLL_MINUTES.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import datetime, timedelta
+
+import requests
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.config import PUBLIC_BASE_URL, WEBSUB_LEASE_SECONDS
+from app.database import SessionLocal
+from app.metrics import WEBSUB_PUSHES, WEBSUB_SUBSCRIBE_REQUESTS
+from app.models import Source, SourceCheckpoint, WebSubSubscription
+from app.rss_engine import ingest_entries
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+RENEW_BEFORE = timedelta(hours=1)  # renew leases this long before they expire
+RETRY_AFTER = timedelta(hours=1)  # retry failed / unanswered subscription requests
+MAX_PUSH_BYTES = 5 * 1024 * 1024
+
+SIGNATURE_METHODS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+
+def callback_url(source_id: int) -> str:
+    return f"{PUBLIC_BASE_URL}/api/websub/{source_id}"
+
+
+def note_hub(db: Session, source: Source, hub_url: str, topic_url: str = None):
+    """Record a hub advertised by ``source``'s feed (committed by the caller)"""
+    if not PUBLIC_BASE_URL:
+        return
+    topic_url = topic_url or source.rss_url
+    sub = db.get(WebSubSubscription, source.id)
+    if sub is None:
+        logger.info(f"WebSub hub discovered for {source.name}: {hub_url}")
+        db.add(WebSubSubscription(
+            source_id=source.id,
+            hub_url=hub_url,
+            topic_url=topic_url,
+            secret=secrets.token_hex(20),
+            state="discovered",
+        ))
+    elif sub.hub_url != hub_url or sub.topic_url != topic_url:
+        logger.info(f"WebSub hub changed for {source.name}: {hub_url}")
+        sub.hub_url, sub.topic_url, sub.state = hub_url, topic_url, "discovered"
+
+
+def verify_signature(secret: str, body: bytes, header: str) -> bool:
+    """Check an ``X-Hub-Signature: <method>=<hex>`` header against ``body``"""
+    method, _, signature = (header or "").partition("=")
+    digest = SIGNATURE_METHODS.get(method.lower())
+    if digest is None or not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, digest).hexdigest()
+    return hmac.compare_digest(expected, signature.lower())
+
+
+def _post_to_hub(sub: WebSubSubscription):
+    return requests.post(sub.hub_url, data={
+        "hub.mode": "subscribe",
+        "hub.topic": sub.topic_url,
+        "hub.callback": callback_url(sub.source_id),
+        "hub.secret": sub.secret,
+        "hub.lease_seconds": WEBSUB_LEASE_SECONDS,
+    }, timeout=10)
+
+
+async def subscribe(db: Session, sub: WebSubSubscription):
+    """Send a subscription (or renewal) request; the hub verifies it asynchronously"""
+    sub.requested_at = datetime.utcnow()
+    try:
+        response = await asyncio.to_thread(_post_to_hub, sub)
+        if response.status_code in (202, 204):
+            if sub.state != "active":  # renewals stay active until the lease runs out
+                sub.state = "pending"
+            sub.error = None
+            WEBSUB_SUBSCRIBE_REQUESTS.inc(outcome="accepted")
+        else:
+            sub.state = "failed"
+            sub.error = f"HTTP {response.status_code}: {response.text[:200]}"
+            WEBSUB_SUBSCRIBE_REQUESTS.inc(outcome="rejected")
+    except requests.RequestException as e:
+        sub.state = "failed"
+        sub.error = str(e)[:500]
+        WEBSUB_SUBSCRIBE_REQUESTS.inc(outcome="error")
+    db.commit()
+    if sub.error:
+        logger.warning(f"WebSub subscribe to {sub.hub_url} failed: {sub.error}")
+
+
+def _due(sub: WebSubSubscription, now: datetime) -> bool:
+    if sub.state == "discovered":
+        return True
+    if sub.state == "active":
+        return sub.lease_expires_at is None or sub.lease_expires_at - now < RENEW_BEFORE
+    if sub.state in ("pending", "failed"):
+        return sub.requested_at is None or now - sub.requested_at > RETRY_AFTER
+    return False  # denied by the hub
+
+
+async def maintain_subscriptions():
+    """Scheduled task: subscribe newly discovered hubs and renew expiring leases"""
+    if not PUBLIC_BASE_URL:
+        return
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        subs = (
+            db.query(WebSubSubscription)
+            .join(Source, Source.id == WebSubSubscription.source_id)
+            .filter(Source.enabled == True)
+            .all()
+        )
+        for sub in subs:
+            if _due(sub, now):
+                await subscribe(db, sub)
+    except Exception as e:
+        logger.error(f"WebSub maintenance error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+# Async so the write runs on the event loop with the ingest path (SQLite
+# sessions share one connection)
+@router.get("/api/websub/{source_id}")
+async def verify_intent(
+    source_id: int,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: str = Query(None, alias="hub.challenge"),
+    lease_seconds: int = Query(None, alias="hub.lease_seconds"),
+    reason: str = Query(None, alias="hub.reason"),
+):
+    """Hub verification of intent (and denial notices)"""
+    db = SessionLocal()
+    try:
+        sub = db.get(WebSubSubscription, source_id)
+        if sub is None or sub.topic_url != topic:
+            raise HTTPException(status_code=404, detail="Unknown subscription")
+
+        if mode == "denied":
+            sub.state, sub.error = "denied", (reason or "denied by hub")[:500]
+            db.commit()
+            logger.warning(f"WebSub subscription for source {source_id} denied: {sub.error}")
+            return Response(status_code=200)
+
+        if mode != "subscribe" or sub.state not in ("pending", "active") or not challenge:
+            raise HTTPException(status_code=404, detail="Not expecting this verification")
+
+        sub.state = "active"
+        sub.lease_expires_at = datetime.utcnow() + timedelta(seconds=lease_seconds or WEBSUB_LEASE_SECONDS)
+        db.commit()
+        logger.info(f"WebSub subscription active for source {source_id} until {sub.lease_expires_at}")
+        return PlainTextResponse(challenge)
+    finally:
+        db.close()
+
+
+@router.post("/api/websub/{source_id}", status_code=202)
+async def receive_push(source_id: int, request: Request):
+    """Content distribution from the hub: verify and ingest pushed entries"""
+    body = await request.body()
+    if len(body) > MAX_PUSH_BYTES:
+        WEBSUB_PUSHES.inc(result="too_large")
+        raise HTTPException(status_code=413, detail="Payload too large")
+
+    db = SessionLocal()
+    try:
+        sub = db.get(WebSubSubscription, source_id)
+        source = db.get(Source, source_id)
+        if sub is None or source is None or sub.state != "active":
+            WEBSUB_PUSHES.inc(result="unknown")
+            raise HTTPException(status_code=410, detail="Not subscribed")
+
+        # Per spec a bad signature is still acknowledged, but the content is dropped
+        if not verify_signature(sub.secret, body, request.headers.get("x-hub-signature")):
+            WEBSUB_PUSHES.inc(result="bad_signature")
+            logger.warning(f"Dropping WebSub push for {source.name}: bad signature")
+            return Response(status_code=202)
+
+        import feedparser
+        feed = await asyncio.to_thread(feedparser.parse, body)
+
+        checkpoint = db.get(SourceCheckpoint, source_id)
+        if checkpoint is None:
+            checkpoint = SourceCheckpoint(source_id=source_id)
+            db.add(checkpoint)
+        sub.last_push_at = datetime.utcnow()
+        try:
+            stored = await ingest_entries(source, db, feed.entries, checkpoint)
+        except Exception as e:
+            db.rollback()
+            WEBSUB_PUSHES.inc(result="error")
+            logger.error(f"Error ingesting WebSub push for {source.name}: {e}")
+            raise HTTPException(status_code=503, detail="Ingest failed, retry later")
+        WEBSUB_PUSHES.inc(result="accepted")
+        logger.info(f"WebSub push for {source.name}: {stored} new of {len(feed.entries)} entries")
+        return Response(status_code=202)
+    finally:
+        db.close()
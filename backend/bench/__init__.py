@@ -0,0 +1 @@
+# Intel Terminal benchmarks
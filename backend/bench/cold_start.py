@@ -0,0 +1,127 @@
+"""Cold-start benchmark: import time and time to first request.
+
+    cd backend
+    python -m bench.cold_start --runs 5
+
+Each run spawns a fresh interpreter, so numbers include bytecode loading
+but not a cold OS page cache.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from bench.run_ingest import RESULTS_DIR, git_revision
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def scratch_env(workdir):
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'cold.db')}"
+    env["FETCH_ON_STARTUP"] = "false"
+    return env
+
+
+def measure_import(env):
+    out = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env,
+        stderr=subprocess.DEVNULL, text=True,
+    )
+    return float(out.strip().splitlines()[-1])
+
+
+def poll(url, deadline, predicate=lambda body: True):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                body = resp.read()
+                if resp.status == 200 and predicate(body):
+                    return time.monotonic()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.005)
+    return None
+
+
+def measure_first_request(env, port, timeout):
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = started + timeout
+    base = f"http://127.0.0.1:{port}"
+    try:
+        health = poll(f"{base}/api/health", deadline)
+        static = poll(f"{base}/", deadline)
+        ready = poll(f"{base}/api/health", deadline, lambda body: json.loads(body).get("ready"))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return {
+        "first_health_s": round(health - started, 4) if health else None,
+        "first_static_s": round(static - started, 4) if static else None,
+        "ready_s": round(ready - started, 4) if ready else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure backend import time and time to first request")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="results file (default: bench/results/cold-start-<rev>.json)")
+    args = parser.parse_args(argv)
+
+    imports, requests = [], []
+    for _ in range(args.runs):
+        # Fresh database each run: first boot is the worst case
+        env = scratch_env(tempfile.mkdtemp(prefix="intel-cold-"))
+        imports.append(measure_import(env))
+        env = scratch_env(tempfile.mkdtemp(prefix="intel-cold-"))
+        requests.append(measure_first_request(env, args.port, args.timeout))
+
+    def median_of(key):
+        values = [r[key] for r in requests if r[key] is not None]
+        return round(statistics.median(values), 4) if values else None
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "import_app_main_s": {
+            "runs": [round(v, 4) for v in imports],
+            "median": round(statistics.median(imports), 4),
+        },
+        "first_request": {
+            "runs": requests,
+            "median_first_health_s": median_of("first_health_s"),
+            "median_first_static_s": median_of("first_static_s"),
+            "median_ready_s": median_of("ready_s"),
+        },
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"cold-start-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("import_app_main_s", "first_request")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare two benchmark result files.
+
+    python -m bench.compare bench/results/old.json bench/results/new.json
+"""
+
+import json
+import sys
+
+# (path, lower_is_better)
+METRICS = [
+    (("fetch_cycle", "median_wall_s"), True),
+    (("fetch_cycle", "rows_per_s"), False),
+    (("e2e_latency", "fast_clients", "p50_ms"), True),
+    (("e2e_latency", "fast_clients", "p99_ms"), True),
+    (("e2e_latency", "slow_clients", "p99_ms"), True),
+    (("memory", "max_rss_kb"), True),
+    (("memory", "python_heap_peak_bytes"), True),
+]
+
+
+def lookup(results, path):
+    for key in path:
+        if not isinstance(results, dict):
+            return None
+        results = results.get(key)
+    return results
+
+
+def compare(old, new):
+    rows = []
+    for path, lower_is_better in METRICS:
+        a, b = lookup(old, path), lookup(new, path)
+        if a is None or b is None:
+            continue
+        change = (b - a) / a * 100 if a else 0.0
+        better = change < 0 if lower_is_better else change > 0
+        verdict = "=" if abs(change) < 1 else ("better" if better else "worse")
+        rows.append((".".join(path), a, b, change, verdict))
+    return rows
+
+
+def main(argv=None):
+    argv = argv or sys.argv[1:]
+    if len(argv) != 2:
+        print(__doc__.strip())
+        return 2
+    with open(argv[0]) as f:
+        old = json.load(f)
+    with open(argv[1]) as f:
+        new = json.load(f)
+    print(f"{old.get('revision')} -> {new.get('revision')}")
+    for name, a, b, change, verdict in compare(old, new):
+        print(f"{name:40} {a:>12} {b:>12} {change:+8.1f}%  {verdict}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
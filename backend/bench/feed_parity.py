@@ -0,0 +1,149 @@
+"""Parity check: the streaming feed parser against feedparser.
+
+Parses sample RSS 2.0, Atom and RSS 1.0 (RDF) documents with both and
+compares what ingest reads from each entry: the title and link (and so the
+dedup hash), the summary, the id and the publish/update dates. Prints the
+differences and exits non-zero when there are any.
+
+    cd backend
+    python -m bench.feed_parity
+    python -m bench.feed_parity saved-feed.xml other.xml   # also check real documents
+"""
+
+import sys
+
+RSS2 = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+     xmlns:media="http://search.yahoo.com/mrss/" xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+  <title>Sample RSS</title><link>https://example.com/</link>
+  <item>
+    <title>Real title</title>
+    <link>https://example.com/a</link>
+    <description>Summary &lt;b&gt;with&lt;/b&gt; markup</description>
+    <guid isPermaLink="false">a-1</guid>
+    <pubDate>Mon, 06 May 2024 10:00:00 +0200</pubDate>
+    <itunes:title>Ep 1</itunes:title>
+    <media:title>Media title</media:title>
+  </item>
+  <item>
+    <title>Only a permalink guid</title>
+    <guid>https://example.com/b</guid>
+    <dc:date>2024-05-06T09:00:00Z</dc:date>
+  </item>
+  <item>
+    <title>Guid that is not a link</title>
+    <guid isPermaLink="false">urn:uuid:1234</guid>
+    <content:encoded><![CDATA[<p>Full content</p>]]></content:encoded>
+  </item>
+  <item>
+    <title>Link and permalink guid</title>
+    <link>https://example.com/d</link>
+    <guid isPermaLink="true">https://example.com/d?guid</guid>
+  </item>
+</channel>
+</rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">
+  <title>Sample Atom</title>
+  <link rel="self" href="https://example.com/atom.xml"/>
+  <link href="https://example.com/"/>
+  <entry>
+    <title>Atom entry</title>
+    <link rel="alternate" href="https://example.com/e1"/>
+    <link rel="enclosure" href="https://example.com/e1.mp3"/>
+    <id>tag:example.com,2024:e1</id>
+    <published>2024-05-06T08:00:00Z</published>
+    <updated>2024-05-06T09:30:00+01:00</updated>
+    <summary>Atom summary</summary>
+    <media:group><media:title>Media title</media:title></media:group>
+  </entry>
+  <entry>
+    <title type="html">Escaped &amp;amp; title</title>
+    <link href="https://example.com/e2"/>
+    <id>tag:example.com,2024:e2</id>
+    <updated>2024-05-05T08:00:00Z</updated>
+    <content type="text">Content only</content>
+  </entry>
+</feed>"""
+
+RDF = b"""<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/rdf">
+    <title>Sample RDF</title><link>https://example.com/</link>
+  </channel>
+  <item rdf:about="https://example.com/r1">
+    <title>RDF item</title>
+    <link>https://example.com/r1</link>
+    <description>RDF description</description>
+    <dc:date>2024-05-06T07:00:00+00:00</dc:date>
+  </item>
+  <item rdf:about="https://example.com/r2">
+    <title>RDF item without a date</title>
+    <link>https://example.com/r2</link>
+  </item>
+</rdf:RDF>"""
+
+SAMPLES = {"rss2": RSS2, "atom": ATOM, "rdf": RDF}
+
+
+def ingest_view(entry) -> dict:
+    """The entry fields ingest uses, as it derives them"""
+    from app.utils import generate_article_hash, sanitize_text
+
+    title = sanitize_text(entry.get("title", "No title"))
+    link = entry.get("link", "")
+    return {
+        "title": title,
+        "link": link,
+        "hash": generate_article_hash(title, link),
+        "summary": sanitize_text(entry.get("summary", "")),
+        "id": entry.get("id"),
+        "published_parsed": tuple(entry["published_parsed"][:6]) if entry.get("published_parsed") else None,
+        "updated_parsed": tuple(entry["updated_parsed"][:6]) if entry.get("updated_parsed") else None,
+    }
+
+
+def streaming_entries(document: bytes) -> list:
+    from app.feed_stream import StreamingFeedParser
+
+    parser = StreamingFeedParser(limit=10 ** 6)
+    parser.feed(document)
+    parser.close()
+    return parser.entries
+
+
+def compare(name: str, document: bytes) -> list:
+    """Differences between the two parsers on one document"""
+    import feedparser
+
+    expected = [ingest_view(e) for e in feedparser.parse(document).entries]
+    actual = [ingest_view(e) for e in streaming_entries(document)]
+    problems = []
+    if len(expected) != len(actual):
+        problems.append(f"{name}: {len(actual)} entries, feedparser has {len(expected)}")
+    for i, (want, got) in enumerate(zip(expected, actual)):
+        for field, value in want.items():
+            if got[field] != value:
+                problems.append(f"{name}[{i}] {field}: {got[field]!r}, feedparser: {value!r}")
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    documents = dict(SAMPLES)
+    for path in argv:
+        with open(path, "rb") as f:
+            documents[path] = f.read()
+    problems = [p for name, document in documents.items() for p in compare(name, document)]
+    for problem in problems:
+        print(problem)
+    print(f"{len(documents)} documents, {len(problems)} differences")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
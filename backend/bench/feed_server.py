@@ -0,0 +1,216 @@
+"""Local stand-in HTTP server serving synthetic RSS/Atom feeds.
+
+Every feed starts with ``items`` entries. Each request may publish new
+entries (``churn`` = expected new entries per request), wait ``latency_ms``
+before answering, or fail with a 500 at ``error_rate``. The publish time of
+every entry is embedded in its link (``?t=<epoch>``) so clients can measure
+publish-to-receipt latency. With ``hub`` set, feeds advertise that WebSub
+hub (``<link rel="hub">``) and their own URL as topic.
+"""
+
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+WORDS = (
+    "ransomware exploit breach vulnerability patch critical attack botnet "
+    "phishing zero-day malware advisory update cloud outage election sanctions "
+    "satellite research model privacy leak firmware supply chain router"
+).split()
+
+
+class SyntheticFeed:
+    """One feed's entry list, newest first"""
+
+    def __init__(self, index: int, fmt: str, items: int, desc_bytes: int, rng: random.Random):
+        self.index = index
+        self.fmt = fmt
+        self.desc_bytes = desc_bytes
+        self.rng = rng
+        self.counter = 0
+        self.entries = []
+        self.lock = threading.Lock()
+        now = time.time()
+        for i in range(items):
+            self._publish(now - (items - i) * 60)
+
+    def _publish(self, published: float):
+        self.counter += 1
+        title = " ".join(self.rng.choice(WORDS) for _ in range(6)).capitalize()
+        filler = " ".join(self.rng.choice(WORDS) for _ in range(self.desc_bytes // 6 + 1))
+        self.entries.insert(0, {
+            "id": f"feed{self.index}-{self.counter}",
+            "title": f"{title} #{self.index}-{self.counter}",
+            "link": f"http://bench.local/{self.index}/{self.counter}?t={published:.6f}",
+            "description": filler[:self.desc_bytes],
+            "published": published,
+        })
+
+    def advance(self, churn: float, cap: int):
+        """Publish ``churn`` new entries on average and trim to ``cap``"""
+        with self.lock:
+            new = int(churn) + (1 if self.rng.random() < churn - int(churn) else 0)
+            for _ in range(new):
+                self._publish(time.time())
+            del self.entries[cap:]
+
+    def render(self, hub: str = None, self_url: str = None) -> bytes:
+        with self.lock:
+            entries = list(self.entries)
+        if self.fmt == "atom":
+            return self._render_atom(entries, hub, self_url)
+        return self._render_rss(entries, hub, self_url)
+
+    @staticmethod
+    def _hub_links(prefix: str, hub: str, self_url: str):
+        if not hub:
+            return []
+        return [
+            f'<{prefix}link rel="hub" href="{escape(hub)}"/>',
+            f'<{prefix}link rel="self" href="{escape(self_url)}"/>',
+        ]
+
+    def _render_rss(self, entries, hub=None, self_url=None) -> bytes:
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>',
+            f"<title>Bench Feed {self.index}</title>",
+            f"<link>http://bench.local/{self.index}</link>",
+            "<description>Synthetic benchmark feed</description>",
+            *self._hub_links("atom:", hub, self_url),
+        ]
+        for e in entries:
+            parts.append(
+                "<item>"
+                f"<title>{escape(e['title'])}</title>"
+                f"<link>{escape(e['link'])}</link>"
+                f"<guid>{e['id']}</guid>"
+                f"<pubDate>{formatdate(e['published'], usegmt=True)}</pubDate>"
+                f"<description>{escape(e['description'])}</description>"
+                "</item>"
+            )
+        parts.append("</channel></rss>")
+        return "".join(parts).encode()
+
+    def _render_atom(self, entries, hub=None, self_url=None) -> bytes:
+        updated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<feed xmlns="http://www.w3.org/2005/Atom">',
+            f"<title>Bench Feed {self.index}</title>",
+            f"<id>urn:bench:{self.index}</id>",
+            f"<updated>{updated}</updated>",
+            *self._hub_links("", hub, self_url),
+        ]
+        for e in entries:
+            published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(e["published"]))
+            parts.append(
+                "<entry>"
+                f"<title>{escape(e['title'])}</title>"
+                f'<link href="{escape(e["link"])}"/>'
+                f"<id>urn:bench:{e['id']}</id>"
+                f"<updated>{published}</updated>"
+                f"<published>{published}</published>"
+                f"<summary>{escape(e['description'])}</summary>"
+                "</entry>"
+            )
+        parts.append("</feed>")
+        return "".join(parts).encode()
+
+
+class FeedServer:
+    """Threaded HTTP server hosting ``feeds`` synthetic feeds at /feeds/<n>.xml"""
+
+    def __init__(self, feeds=20, items=30, desc_bytes=400, latency_ms=0, error_rate=0.0,
+                 churn=0.5, fmt="mixed", seed=1, host="127.0.0.1", port=0, hub=None):
+        self.latency_ms = latency_ms
+        self.hub = hub
+        self.error_rate = error_rate
+        self.churn = churn
+        self.items = items
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.feeds = []
+        for i in range(feeds):
+            feed_fmt = fmt if fmt != "mixed" else ("atom" if i % 2 else "rss")
+            self.feeds.append(SyntheticFeed(i, feed_fmt, items, desc_bytes, random.Random(seed + i)))
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_urls(self):
+        return [f"{self.base_url}/feeds/{f.index}.xml" for f in self.feeds]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                try:
+                    index = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+                    feed = server.feeds[index]
+                except (ValueError, IndexError):
+                    self.send_error(404)
+                    return
+                if server.rng.random() < server.error_rate:
+                    server.errors += 1
+                    self.send_error(500)
+                    return
+                feed.advance(server.churn, server.items)
+                body = feed.render(server.hub, f"{server.base_url}/feeds/{feed.index}.xml")
+                content_type = "application/atom+xml" if feed.fmt == "atom" else "application/rss+xml"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve synthetic RSS/Atom feeds")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--desc-bytes", type=int, default=400)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--churn", type=float, default=0.5)
+    parser.add_argument("--format", choices=["rss", "atom", "mixed"], default="mixed")
+    parser.add_argument("--hub", help="WebSub hub URL to advertise")
+    args = parser.parse_args()
+
+    srv = FeedServer(args.feeds, args.items, args.desc_bytes, args.latency_ms, args.error_rate,
+                     args.churn, args.format, port=args.port, hub=args.hub)
+    print(f"Serving {args.feeds} feeds at {srv.base_url}/feeds/<n>.xml")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        srv.stop()
@@ -0,0 +1,142 @@
+"""Location extraction and map aggregation benchmark.
+
+Measures app.geo.extract_locations per article on synthetic titles and
+descriptions (random words with place names sprinkled in), the one-off
+gazetteer load, and the /api/geo summary over a 24h window as the
+article_locations table grows.
+
+    cd backend
+    python -m bench.geo_extract --articles 5000 --desc-bytes 600 --table-rows 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bench.feed_server import WORDS
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+PLACES = [
+    "Russia", "Ukrainian", "Kyiv", "China", "Beijing", "North Korea", "the U.S.", "UK", "Iran",
+    "Tel Aviv", "Hong Kong", "São Paulo", "Washington, D.C.", "New York City", "Taiwan", "Germany",
+]
+
+
+def make_text(rng: random.Random, size: int, density: float) -> str:
+    parts = []
+    length = 0
+    while length < size:
+        token = rng.choice(PLACES) if rng.random() < density else rng.choice(WORDS)
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)
+
+
+def bench_extract(args):
+    from app.geo import extract_locations, load_gazetteer
+
+    t0 = time.perf_counter()
+    load_gazetteer()
+    load_s = time.perf_counter() - t0
+
+    rng = random.Random(args.seed)
+    texts = [(make_text(rng, 80, args.density), make_text(rng, args.desc_bytes, args.density))
+             for _ in range(args.articles)]
+
+    timings = []
+    found = 0
+    for title, description in texts:
+        t0 = time.perf_counter()
+        found += len(extract_locations(title, description))
+        timings.append(time.perf_counter() - t0)
+    return {
+        "gazetteer_load_s": round(load_s, 4),
+        "articles": args.articles,
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "places": found,
+        "per_article": latency_summary(timings),
+    }
+
+
+def bench_aggregate(args):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.geo import load_gazetteer, summarize
+    from app.models import Base, Article, ArticleLocation
+
+    centroids = load_gazetteer()[1]
+    countries = sorted(centroids)
+    results = []
+    for rows in args.table_rows:
+        path = os.path.join(tempfile.mkdtemp(prefix="intel-bench-"), "geo.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine, tables=[Article.__table__, ArticleLocation.__table__])
+        rng = random.Random(args.seed)
+        now = datetime.utcnow()
+        with engine.begin() as conn:
+            batch = []
+            for i in range(rows):
+                code = rng.choice(countries)
+                batch.append({
+                    "article_id": i // 2 + 1, "place": code, "kind": "country", "country_code": code,
+                    "region": "Europe", "lat": centroids[code][0], "lon": centroids[code][1],
+                    # 30 days in ingest order, so a 24h window is the newest 1/30th
+                    "timestamp": now - timedelta(seconds=30 * 86400 * (rows - i) / rows),
+                })
+                if len(batch) == 50000:
+                    conn.execute(ArticleLocation.__table__.insert(), batch)
+                    batch = []
+            if batch:
+                conn.execute(ArticleLocation.__table__.insert(), batch)
+
+        session = sessionmaker(bind=engine)()
+        since = now - timedelta(hours=24)
+        timings = []
+        for _ in range(args.queries):
+            t0 = time.perf_counter()
+            summarize(session, since)
+            timings.append(time.perf_counter() - t0)
+        session.close()
+        engine.dispose()
+        results.append({"rows": rows, "median_ms": round(statistics.median(timings) * 1000, 3),
+                        "query": latency_summary(timings)})
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark gazetteer location extraction")
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--desc-bytes", type=int, default=600, help="description size")
+    parser.add_argument("--density", type=float, default=0.02, help="fraction of tokens that are place names")
+    parser.add_argument("--table-rows", type=int, nargs="*", default=[10000, 100000],
+                        help="article_locations table sizes (30 days of data) to time a 24h /api/geo summary against")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: bench/results/geo-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "extract": bench_extract(args),
+        "aggregate": bench_aggregate(args),
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"geo-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("extract", "aggregate")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
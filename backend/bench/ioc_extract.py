@@ -0,0 +1,147 @@
+"""IOC extraction and lookup benchmark.
+
+Measures app.ioc.extract_iocs throughput on large synthetic descriptions
+(random words with indicators sprinkled in, some defanged), and the
+latency of an indicator lookup as the article_iocs table grows.
+
+    cd backend
+    python -m bench.ioc_extract --articles 500 --desc-kb 16 --lookup-rows 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from bench.feed_server import WORDS
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+
+def random_indicator(rng: random.Random) -> str:
+    kind = rng.randrange(7)
+    if kind == 0:
+        return f"CVE-{rng.randint(2015, 2025)}-{rng.randint(1000, 99999)}"
+    if kind == 1:
+        return ".".join(str(rng.randint(1, 254)) for _ in range(4))
+    if kind == 2:
+        return f"{rng.choice(WORDS)}-{rng.randint(1, 999)}[.]com"
+    if kind == 3:
+        return "".join(rng.choice("0123456789abcdef") for _ in range(rng.choice((32, 40, 64))))
+    if kind == 4:
+        return f"T{rng.randint(1000, 1600)}.{rng.randint(1, 20):03d}"
+    if kind == 5:
+        return f"2001:db8:{rng.randint(1, 0xffff):x}::{rng.randint(1, 0xffff):x}"
+    return f"cdn.{rng.choice(WORDS)}.net"
+
+
+def make_description(rng: random.Random, size: int, density: float) -> str:
+    parts = []
+    length = 0
+    while length < size:
+        token = random_indicator(rng) if rng.random() < density else rng.choice(WORDS)
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)
+
+
+def bench_extract(args):
+    from app.ioc import extract_iocs
+
+    rng = random.Random(args.seed)
+    texts = [make_description(rng, args.desc_kb * 1024, args.density) for _ in range(args.articles)]
+    total_bytes = sum(len(t) for t in texts)
+
+    timings = []
+    found = 0
+    started = time.perf_counter()
+    for text in texts:
+        t0 = time.perf_counter()
+        found += len(extract_iocs("", text))
+        timings.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - started
+    return {
+        "articles": args.articles,
+        "bytes": total_bytes,
+        "wall_s": round(wall, 4),
+        "mb_per_s": round(total_bytes / wall / 1e6, 2),
+        "articles_per_s": round(args.articles / wall, 1),
+        "indicators": found,
+        "per_article": latency_summary(timings),
+    }
+
+
+def bench_lookup(args):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models import Base, ArticleIOC
+
+    results = []
+    for rows in args.lookup_rows:
+        path = os.path.join(tempfile.mkdtemp(prefix="intel-bench-"), "ioc.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine, tables=[ArticleIOC.__table__])
+        rng = random.Random(args.seed)
+        values = [f"cve-{i}" for i in range(max(1, rows // 5))]  # ~5 mentions per indicator
+        with engine.begin() as conn:
+            batch = []
+            for i in range(rows):
+                batch.append({"article_id": i + 1, "ioc_type": "cve", "value": rng.choice(values)})
+                if len(batch) == 50000:
+                    conn.execute(ArticleIOC.__table__.insert(), batch)
+                    batch = []
+            if batch:
+                conn.execute(ArticleIOC.__table__.insert(), batch)
+
+        session = sessionmaker(bind=engine)()
+        timings = []
+        for _ in range(args.lookups):
+            value = rng.choice(values)
+            t0 = time.perf_counter()
+            (session.query(ArticleIOC.article_id)
+             .filter(ArticleIOC.value == value)
+             .order_by(ArticleIOC.article_id.desc())
+             .limit(50).all())
+            timings.append(time.perf_counter() - t0)
+        session.close()
+        engine.dispose()
+        results.append({"rows": rows, "median_ms": round(statistics.median(timings) * 1000, 4),
+                        "lookup": latency_summary(timings)})
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark IOC extraction and lookup")
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--desc-kb", type=int, default=16, help="description size")
+    parser.add_argument("--density", type=float, default=0.01, help="fraction of tokens that are indicators")
+    parser.add_argument("--lookup-rows", type=int, nargs="*", default=[10000, 100000],
+                        help="article_iocs table sizes to time lookups against")
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: bench/results/ioc-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "extract": bench_extract(args),
+        "lookup": bench_lookup(args),
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"ioc-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("extract", "lookup")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Local stand-in for the Ollama HTTP API.
+
+Answers ``POST /api/generate`` (non-streaming) like a slow local model:
+each call sleeps ``latency`` seconds plus ``per_item`` per numbered item in
+the prompt, then returns ``{"results": [{"id", "severity"}]}`` as the JSON
+``response`` string, scoring items by keyword. ``GET /api/tags`` lists the
+model. Counters (calls, items, peak concurrent calls) let benchmarks check
+batching and the concurrency limit.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ITEM_LINE = re.compile(r"^(\d+)\. (.*)$", re.MULTILINE)
+
+KEYWORD_LEVELS = (
+    ("critical", ("ransomware", "zero-day", "exploit")),
+    ("high", ("breach", "vulnerability", "attack", "malware", "botnet")),
+    ("medium", ("advisory", "patch", "phishing", "leak")),
+)
+
+
+def classify(text: str) -> str:
+    text = text.lower()
+    for level, words in KEYWORD_LEVELS:
+        if any(w in text for w in words):
+            return level
+    return "low"
+
+
+class OllamaStub:
+    def __init__(self, host="127.0.0.1", port=0, model="llama3", latency=2.0, per_item=0.0,
+                 error_rate=0.0, seed=1):
+        self.model = model
+        self.latency = latency
+        self.per_item = per_item
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.items = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def generate(self, prompt: str) -> dict:
+        items = ITEM_LINE.findall(prompt)
+        with self.lock:
+            self.calls += 1
+            self.items += len(items)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency + self.per_item * len(items))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        results = [{"id": int(i), "severity": classify(title)} for i, title in items]
+        return {
+            "model": self.model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "response": json.dumps({"results": results}),
+            "done": True,
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._json(200, {"models": [{"name": f"{stub.model}:latest", "model": f"{stub.model}:latest"}]})
+                else:
+                    self._json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self._json(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._json(400, {"error": "invalid JSON"})
+                    return
+                if request.get("model", "").split(":")[0] != stub.model:
+                    self._json(404, {"error": f"model '{request.get('model')}' not found"})
+                    return
+                if stub.error_rate and stub.rng.random() < stub.error_rate:
+                    self._json(500, {"error": "simulated failure"})
+                    return
+                self._json(200, stub.generate(request.get("prompt", "")))
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stand-in Ollama API")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default="llama3")
+    parser.add_argument("--latency", type=float, default=2.0, help="seconds per call")
+    parser.add_argument("--per-item", type=float, default=0.0, help="extra seconds per article in a batch")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    srv = OllamaStub(port=args.port, model=args.model, latency=args.latency, per_item=args.per_item,
+                     error_rate=args.error_rate)
+    print(f"Ollama stand-in at {srv.url}")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,129 @@
+"""Feed parsing benchmark: feedparser vs. the streaming parser.
+
+Serves large synthetic feeds (many entries with full-content-sized
+descriptions) from the local feed server, in a separate process so its
+rendering doesn't count towards the measured memory, and fetches each one
+three ways:
+
+* ``feedparser``: the whole document, as FEED_STREAMING=false does
+* ``streaming``: incremental parse stopping at MAX_ARTICLES_PER_FEED entries
+* ``streaming_unchanged``: a repeat fetch that stops at the checkpoint entry
+
+For each it records wall time per fetch and peak traced Python allocations
+(tracemalloc) during the fetch.
+
+    cd backend
+    python -m bench.parse_feeds --feeds 5 --items 300 --desc-bytes 8000
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark feedparser against the streaming feed parser")
+    parser.add_argument("--feeds", type=int, default=5)
+    parser.add_argument("--items", type=int, default=300, help="entries per feed document")
+    parser.add_argument("--desc-bytes", type=int, default=8000)
+    parser.add_argument("--limit", type=int, default=10, help="MAX_ARTICLES_PER_FEED")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--format", choices=["rss", "atom", "mixed"], default="mixed")
+    parser.add_argument("--port", type=int, default=8799, help="feed server port")
+    parser.add_argument("--output", help="results file (default: bench/results/parse-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+def measure(fetch, urls, rounds):
+    timings, peaks, entries = [], [], 0
+    for _ in range(rounds):
+        for url in urls:
+            tracemalloc.start()
+            started = time.perf_counter()
+            feed = fetch(url)
+            timings.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            entries += len(feed.entries)
+    return {
+        "per_fetch": latency_summary(timings),
+        "peak_alloc_kb_max": max(peaks) // 1024,
+        "peak_alloc_kb_mean": sum(peaks) // len(peaks) // 1024,
+        "entries_per_fetch": round(entries / len(timings), 1),
+    }
+
+
+def run(args):
+    import feedparser
+    import requests
+    from app import feed_stream
+    from app.utils import generate_article_hash, sanitize_text
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "bench.feed_server", "--port", str(args.port), "--feeds", str(args.feeds),
+         "--items", str(args.items), "--desc-bytes", str(args.desc_bytes), "--churn", "0",
+         "--format", args.format],
+        stdout=subprocess.DEVNULL,
+    )
+    urls = [f"http://127.0.0.1:{args.port}/feeds/{i}.xml" for i in range(args.feeds)]
+    newest = {}
+
+    def unchanged(url):
+        checkpoint = newest[url]
+        stop = lambda e: generate_article_hash(sanitize_text(e.title), e.get("link", "")) == checkpoint  # noqa: E731
+        return feed_stream.fetch(url, limit=args.limit, stop=stop)
+
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", args.port), timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError("feed server did not start")
+                time.sleep(0.1)
+        document_kb = len(requests.get(urls[0]).content) // 1024
+
+        # Checkpoint hash of each feed's newest entry, as ingest would have stored it
+        for url in urls:
+            first = feed_stream.fetch(url, limit=1).entries[0]
+            newest[url] = generate_article_hash(sanitize_text(first.title), first.link)
+
+        return {
+            "document_kb": document_kb,
+            "feedparser": measure(feedparser.parse, urls, args.rounds),
+            "streaming": measure(lambda url: feed_stream.fetch(url, limit=args.limit), urls, args.rounds),
+            "streaming_unchanged": measure(unchanged, urls, args.rounds),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "parse": run(args),
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"parse-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results["parse"], indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Admission control benchmark: a polite client's latency during a surge.
+
+Runs the app in-process over a database of --articles articles. --greedy
+clients (each its own X-Forwarded-For address) hammer uncached
+/api/articles queries from --connections parallel connections each, as a
+dashboard with several tabs on a short auto-refresh interval would, while
+one polite client makes the same kind of request every 250 ms. The surge
+is replayed with admission control enabled (the configured limits) and
+disabled, reporting the polite client's latency and outcomes and the
+greedy clients' completed and shed requests.
+
+    cd backend
+    python -m bench.run_admission --greedy 4 --connections 8 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark admission control under a request surge")
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--greedy", type=int, default=4, help="misbehaving clients")
+    parser.add_argument("--connections", type=int, default=8, help="parallel connections per greedy client")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8797)
+    parser.add_argument("--output", help="results file (default: bench/results/admission-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+def seed(count: int):
+    from app.database import SessionLocal
+    from app.models import Article
+
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(Article, [
+            {
+                "title": f"Bench article {i} about a routine development",
+                "link": f"https://example.com/{i}",
+                "description": "Lorem ipsum dolor sit amet. " * 20,
+                "source_name": "Bench",
+                "category_id": 1 + i % 4,
+                "severity": i % 10,
+                "article_hash": f"{i:064x}",
+                "timestamp": now - timedelta(seconds=i * 5),
+            }
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def get(url: str, client: str):
+    """(status, seconds) of an uncached /api/articles query"""
+    query = f"limit={random.randint(200, 1000)}&hours={random.randint(1, 48)}"
+    request = urllib.request.Request(f"{url}/api/articles?{query}", headers={"X-Forwarded-For": client})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    return status, time.perf_counter() - started
+
+
+def surge(base: str, args):
+    stop = threading.Event()
+    greedy = Counter()
+    polite, polite_statuses = [], Counter()
+
+    def hammer(client):
+        statuses = Counter()
+        while not stop.is_set():
+            statuses[get(base, client)[0]] += 1
+        return statuses
+
+    def probe():
+        while not stop.is_set():
+            status, seconds = get(base, "10.1.0.1")
+            polite_statuses[status] += 1
+            if status == 200:
+                polite.append(seconds)
+            time.sleep(0.25)
+
+    workers = [(hammer, f"10.0.0.{g}") for g in range(args.greedy) for _ in range(args.connections)]
+    with ThreadPoolExecutor(max_workers=len(workers) + 1) as pool:
+        futures = [pool.submit(fn, client) for fn, client in workers] + [pool.submit(probe)]
+        time.sleep(args.seconds)
+        stop.set()
+        for future in futures:
+            greedy.update(future.result() or {})
+
+    return {
+        "polite": latency_summary(polite),
+        "polite_statuses": dict(polite_statuses),
+        "greedy_ok_per_s": round(greedy[200] / args.seconds, 1),
+        "greedy_statuses": dict(greedy),
+    }
+
+
+async def run(args):
+    import logging
+    import uvicorn
+    from app import admission, main
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=args.port, log_level="error"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    await main.warmup_task
+    main.scheduler.pause()
+
+    base = f"http://127.0.0.1:{args.port}"
+    limits = {"rate": admission.buckets.rate, "concurrent": admission.limiter.limit}
+    results = {"limits": limits, "enabled": await asyncio.to_thread(surge, base, args)}
+
+    admission.buckets.rate = 0
+    admission.limiter.limit = 0
+    results["disabled"] = await asyncio.to_thread(surge, base, args)
+
+    server.should_exit = True
+    await server_task
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="intel-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["FETCH_ON_STARTUP"] = "false"
+    os.environ["RATE_LIMIT_TRUSTED_PROXIES"] = "1"
+    os.environ["STATIC_BUILD_DIR"] = os.path.join(workdir, "static")
+
+    from app.database import init_db
+    init_db()
+    seed(args.articles)
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "cpus": os.cpu_count(),
+        **asyncio.run(run(args)),
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"admission-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("limits", "enabled", "disabled")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
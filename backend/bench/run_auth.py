@@ -0,0 +1,193 @@
+"""Login throughput benchmark.
+
+Runs the app in-process, creates an admin, then fires --logins POST
+/api/auth/login requests from --clients concurrent clients while a prober
+hits /api/health and a task on the server loop measures scheduling lag.
+The same burst is replayed against a bench-only route that checks the
+password with bcrypt directly on the event loop (how a plain async handler
+calling verify_password would behave), for comparison. It also times
+decode_token with and without the verified-token cache.
+
+    cd backend
+    python -m bench.run_auth --logins 64 --clients 16 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+USERNAME = "bench-admin"
+PASSWORD = "bench-password"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark admin login and token verification")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent login requests")
+    parser.add_argument("--workers", type=int, default=2, help="AUTH_HASH_WORKERS")
+    parser.add_argument("--verifications", type=int, default=20000, help="decode_token calls to time")
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--output", help="results file (default: bench/results/auth-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+def post(url: str, body: dict):
+    request = urllib.request.Request(url, json.dumps(body).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+async def loop_lag(samples: list, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+def probe_health(base: str, samples: list, stop: threading.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        urllib.request.urlopen(f"{base}/api/health").read()
+        samples.append(time.perf_counter() - started)
+        time.sleep(0.02)
+
+
+async def burst(base: str, path: str, args):
+    lag, health, latencies, errors = [], [], [], 0
+    stop_lag, stop_probe = asyncio.Event(), threading.Event()
+    lag_task = asyncio.create_task(loop_lag(lag, stop_lag))
+    prober = threading.Thread(target=probe_health, args=(base, health, stop_probe), daemon=True)
+    prober.start()
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            post(f"{base}{path}", {"username": USERNAME, "password": PASSWORD})
+            return time.perf_counter() - started
+        except urllib.error.HTTPError:
+            return None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = await asyncio.to_thread(lambda: list(pool.map(one, range(args.logins))))
+    elapsed = time.perf_counter() - started
+    stop_probe.set()
+    stop_lag.set()
+    await lag_task
+    await asyncio.to_thread(prober.join)
+
+    for result in results:
+        if result is None:
+            errors += 1
+        else:
+            latencies.append(result)
+    return {
+        "logins_per_s": round(len(latencies) / elapsed, 2),
+        "errors": errors,
+        "login": latency_summary(latencies),
+        "health_during_burst": latency_summary(health),
+        "loop_lag": latency_summary(lag),
+    }
+
+
+def time_verification(count: int):
+    from app import auth
+
+    token = auth.create_access_token({"sub": "1"})
+    auth.token_cache.entries.clear()
+    size = auth.token_cache.size
+
+    auth.token_cache.size = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        auth.decode_token(token)
+    uncached = time.perf_counter() - started
+
+    auth.token_cache.size = size
+    started = time.perf_counter()
+    for _ in range(count):
+        auth.decode_token(token)
+    cached = time.perf_counter() - started
+    return {
+        "uncached_us": round(uncached / count * 1e6, 2),
+        "cached_us": round(cached / count * 1e6, 2),
+    }
+
+
+async def run(args):
+    import logging
+    import uvicorn
+    from fastapi import HTTPException
+    from app import auth, main
+    from app.main import app
+    from app.schemas import AdminLoginRequest
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async def inline_login(body: AdminLoginRequest):
+        admin = auth._find_admin(body.username)
+        if not admin or not auth.verify_password(body.password, admin.hashed_password):
+            raise HTTPException(status_code=401)
+        return {"access_token": auth.create_access_token({"sub": str(admin.id)})}
+
+    app.add_api_route("/bench/login-inline", inline_login, methods=["POST"])
+    app.router.routes.insert(0, app.router.routes.pop())  # ahead of the static files mount at "/"
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    await main.warmup_task
+    main.scheduler.pause()
+
+    base = f"http://127.0.0.1:{args.port}"
+
+    results = {
+        "pooled": await burst(base, "/api/auth/login", args),
+        "on_loop": await burst(base, "/bench/login-inline", args),
+        "token_verification": time_verification(args.verifications),
+    }
+
+    server.should_exit = True
+    await server_task
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="intel-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["FETCH_ON_STARTUP"] = "false"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+    os.environ["ADMIN_USERNAME"] = USERNAME  # created during warmup
+    os.environ["ADMIN_PASSWORD"] = PASSWORD
+    os.environ["AUTH_HASH_WORKERS"] = str(args.workers)
+    os.environ["AUTH_HASH_MAX_WAITING"] = str(max(64, args.clients))
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "cpus": os.cpu_count(),
+        **asyncio.run(run(args)),
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"auth-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("pooled", "on_loop", "token_verification")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
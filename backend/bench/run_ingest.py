@@ -0,0 +1,212 @@
+"""Ingest and fan-out benchmark.
+
+Runs the real app in-process against a local synthetic feed server and a
+set of simulated WebSocket clients, then writes machine-readable results.
+
+    cd backend
+    python -m bench.run_ingest --feeds 40 --cycles 5 --clients 50 --slow 5
+    python -m bench.compare bench/results/<old>.json bench/results/<new>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from bench.feed_server import FeedServer
+from bench.ws_clients import drain_clients, start_clients, stop_clients
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def latency_summary(values):
+    return {
+        "count": len(values),
+        "p50_ms": _ms(percentile(values, 50)),
+        "p95_ms": _ms(percentile(values, 95)),
+        "p99_ms": _ms(percentile(values, 99)),
+        "max_ms": _ms(max(values) if values else None),
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def max_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RSS ingest and WebSocket fan-out")
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--items", type=int, default=30, help="entries per feed document")
+    parser.add_argument("--desc-bytes", type=int, default=400)
+    parser.add_argument("--latency-ms", type=int, default=0, help="feed server response delay")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--churn", type=float, default=2.0, help="new entries per feed request")
+    parser.add_argument("--format", choices=["rss", "atom", "mixed"], default="mixed")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--slow", type=int, default=2, help="how many clients read slowly")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="seconds per message")
+    parser.add_argument("--drain-timeout", type=float, default=30.0,
+                        help="seconds to wait for slow clients to catch up")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true", help="track Python heap peak (slower)")
+    parser.add_argument("--output", help="results file (default: bench/results/<rev>.json)")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    # Import the app only after DATABASE_URL points at a scratch database
+    import logging
+    import uvicorn
+    from app import main
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models import Article, Category, Source
+    from app.rss_engine import fetch_and_process_feeds
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    feeds = FeedServer(args.feeds, args.items, args.desc_bytes, args.latency_ms,
+                       args.error_rate, args.churn, args.format, args.seed).start()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    await main.warmup_task
+    main.scheduler.pause()
+
+    # Swap the default (remote) sources for the local synthetic ones
+    db = SessionLocal()
+    category = db.query(Category).first()
+    db.query(Source).update({Source.enabled: False})
+    for url in feeds.feed_urls():
+        db.add(Source(name=f"bench-{url.rsplit('/', 1)[-1]}", rss_url=url, color="#55ff55",
+                      category_id=category.id if category else None))
+    db.commit()
+
+    clients = await start_clients(f"ws://127.0.0.1:{args.port}/ws", args.clients, args.slow, args.slow_delay)
+
+    # Backfill the initial entries so measured cycles only see churn. The
+    # backfill is broadcast too, so clients ignore entries published before it.
+    measure_from = time.time()
+    for c in clients:
+        c.min_published = measure_from
+    started = time.perf_counter()
+    await fetch_and_process_feeds(db)
+    backfill = {"wall_s": round(time.perf_counter() - started, 4), "rows": db.query(Article).count()}
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    cycles = []
+    for _ in range(args.cycles):
+        before = db.query(Article).count()
+        started = time.perf_counter()
+        await fetch_and_process_feeds(db)
+        elapsed = time.perf_counter() - started
+        rows = db.query(Article).count() - before
+        cycles.append({
+            "wall_s": round(elapsed, 4),
+            "rows": rows,
+            "rows_per_s": round(rows / elapsed, 2) if elapsed else None,
+        })
+
+    heap_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    # Let slow clients catch up before collecting their numbers
+    drain_started = time.perf_counter()
+    drained = await drain_clients(clients, db.query(Article).count(), args.drain_timeout)
+    drain_wall = time.perf_counter() - drain_started
+    await stop_clients(clients)
+    db.close()
+
+    server.should_exit = True
+    await server_task
+    feeds.stop()
+
+    fast = [c for c in clients if not c.delay]
+    slow = [c for c in clients if c.delay]
+    walls = [c["wall_s"] for c in cycles]
+    total_rows = sum(c["rows"] for c in cycles)
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "fetch_cycle": {
+            "backfill": backfill,
+            "cycles": cycles,
+            "median_wall_s": round(statistics.median(walls), 4) if walls else None,
+            "total_rows": total_rows,
+            "rows_per_s": round(total_rows / sum(walls), 2) if sum(walls) else None,
+        },
+        "feed_server": {"requests": feeds.requests, "errors": feeds.errors},
+        "e2e_latency": {
+            "fast_clients": latency_summary([l for c in fast for l in c.latencies]),
+            "slow_clients": latency_summary([l for c in slow for l in c.latencies]),
+            "messages_received": sum(c.received for c in clients),
+            "slow_drain_s": round(drain_wall, 3),
+            "all_drained": drained,
+        },
+        "memory": {
+            "max_rss_kb": max_rss_kb(),
+            "python_heap_peak_bytes": heap_peak,
+        },
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="intel-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["FETCH_ON_STARTUP"] = "false"
+
+    results = asyncio.run(run(args))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("fetch_cycle", "e2e_latency", "memory")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
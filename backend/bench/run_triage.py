@@ -0,0 +1,175 @@
+"""Model triage queue benchmark.
+
+Runs the app in-process with TRIAGE_METHOD=ollama against the stand-in
+Ollama API (bench/ollama_stub.py). One fetch cycle ingests every synthetic
+feed; the bench then waits for the queue to score everything and records
+backend calls (batching), peak concurrent calls, and the delay between an
+article's provisional broadcast and its "article_update". A second pass
+deletes the articles and ingests the same entries again (a repost or a
+restart after cleanup): every severity should come from triage_results,
+with no new backend calls.
+
+    cd backend
+    python -m bench.run_triage --feeds 10 --latency 2 --batch-size 8 --concurrency 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from bench.feed_server import FeedServer
+from bench.ollama_stub import OllamaStub
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the model triage queue")
+    parser.add_argument("--feeds", type=int, default=10)
+    parser.add_argument("--items", type=int, default=10, help="entries per feed")
+    parser.add_argument("--latency", type=float, default=2.0, help="stand-in model seconds per call")
+    parser.add_argument("--per-item", type=float, default=0.05, help="extra model seconds per batched article")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for scoring")
+    parser.add_argument("--port", type=int, default=8797)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: bench/results/triage-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+async def listen(url: str, seen: dict, updated: dict, ready: asyncio.Event):
+    import websockets
+
+    async with websockets.connect(url) as ws:
+        ready.set()
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg.get("type") == "article":
+                seen.setdefault(msg["data"]["id"], time.perf_counter())
+            elif msg.get("type") == "article_update":
+                updated.setdefault(msg["data"]["id"], time.perf_counter())
+
+
+async def run(args):
+    import logging
+    import uvicorn
+    from app import main, triage
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models import Article, Category, Source, SourceCheckpoint, TriageResult
+    from app.rss_engine import fetch_and_process_feeds
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    feeds = FeedServer(args.feeds, args.items, 400, 0, 0.0, 0.0, "mixed", args.seed).start()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    await main.warmup_task
+    main.scheduler.pause()
+
+    db = SessionLocal()
+    category = db.query(Category).first()
+    db.query(Source).update({Source.enabled: False})
+    for url in feeds.feed_urls():
+        db.add(Source(name=f"bench-{url.rsplit('/', 1)[-1]}", rss_url=url, color="#55ff55",
+                      category_id=category.id if category else None))
+    db.commit()
+
+    seen, updated, ready = {}, {}, asyncio.Event()
+    listener = asyncio.create_task(listen(f"ws://127.0.0.1:{args.port}/ws", seen, updated, ready))
+    await ready.wait()
+
+    async def wait_scored(expected):
+        deadline = time.perf_counter() + args.timeout
+        while time.perf_counter() < deadline:
+            db.expire_all()
+            if db.query(TriageResult).count() >= expected and not triage.queue.pending:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+    # Pass 1: everything is new and goes through the model
+    stub = args.stub
+    started = time.perf_counter()
+    ingested = await fetch_and_process_feeds(db)
+    ingest_s = time.perf_counter() - started
+    scored_all = await wait_scored(ingested)
+    score_s = time.perf_counter() - started
+    await asyncio.sleep(0.2)
+    first = {
+        "articles": ingested,
+        "ingest_s": round(ingest_s, 3),
+        "all_scored_s": round(score_s, 3),
+        "scored": db.query(TriageResult).count(),
+        "complete": scored_all,
+        "backend_calls": stub.calls,
+        "articles_per_call": round(stub.items / stub.calls, 2) if stub.calls else None,
+        "peak_concurrent_calls": stub.peak_in_flight,
+        "updates_broadcast": len(updated),
+        "provisional_to_update": latency_summary([updated[i] - seen[i] for i in updated if i in seen]),
+    }
+
+    # Pass 2: same entries again after cleanup, with the queue restarted
+    calls_before = stub.calls
+    db.query(Article).delete()
+    db.query(SourceCheckpoint).delete()
+    db.commit()
+    await triage.stop()
+    await triage.start("ollama")
+    reingested = await fetch_and_process_feeds(db)
+    await asyncio.sleep(0.5)
+    severities = dict(db.query(Article.article_hash, Article.severity))
+    cached = dict(db.query(TriageResult.article_hash, TriageResult.severity))
+    second = {
+        "articles": reingested,
+        "backend_calls": stub.calls - calls_before,
+        "severity_from_cache": sum(1 for h, s in severities.items() if cached.get(h) == s),
+    }
+
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+    db.close()
+    server.should_exit = True
+    await server_task
+    feeds.stop()
+
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": {k: v for k, v in vars(args).items() if k != "stub"},
+        "first_pass": first,
+        "repost_pass": second,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.stub = OllamaStub(latency=args.latency, per_item=args.per_item, seed=args.seed).start()
+    workdir = tempfile.mkdtemp(prefix="intel-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["FETCH_ON_STARTUP"] = "false"
+    os.environ["TRIAGE_METHOD"] = "ollama"
+    os.environ["OLLAMA_URL"] = args.stub.url
+    os.environ["TRIAGE_BATCH_SIZE"] = str(args.batch_size)
+    os.environ["TRIAGE_CONCURRENCY"] = str(args.concurrency)
+
+    results = asyncio.run(run(args))
+    args.stub.stop()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"triage-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("first_pass", "repost_pass")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
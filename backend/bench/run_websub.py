@@ -0,0 +1,153 @@
+"""WebSub push benchmark.
+
+Runs the app in-process with a stand-in hub: the synthetic feeds advertise
+the hub, the first poll discovers it, the app subscribes, and every
+publish is pushed to /api/websub/<source_id>. Records publish-to-client
+latency over the push path and checks that a scheduled cycle leaves the
+pushed sources alone.
+
+    cd backend
+    python -m bench.run_websub --feeds 10 --rounds 5 --clients 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bench.feed_server import FeedServer
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+from bench.websub_hub import WebSubHub
+from bench.ws_clients import drain_clients, start_clients, stop_clients
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark WebSub push ingestion")
+    parser.add_argument("--feeds", type=int, default=10)
+    parser.add_argument("--items", type=int, default=30, help="entries per feed document")
+    parser.add_argument("--churn", type=float, default=1.0, help="new entries per publish")
+    parser.add_argument("--format", choices=["rss", "atom", "mixed"], default="mixed")
+    parser.add_argument("--rounds", type=int, default=5, help="publishes per feed")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: bench/results/websub-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    import logging
+    import uvicorn
+    from app import main
+    from app.main import app
+    from app.database import SessionLocal
+    from app.models import Article, Category, Source, WebSubSubscription
+    from app.rss_engine import fetch_and_process_feeds
+    from app.websub import maintain_subscriptions
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    hub = WebSubHub().start()
+    feeds = FeedServer(args.feeds, args.items, 400, 0, 0.0, args.churn, args.format, args.seed,
+                       hub=hub.url).start()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    await main.warmup_task
+    main.scheduler.pause()
+
+    db = SessionLocal()
+    category = db.query(Category).first()
+    db.query(Source).update({Source.enabled: False})
+    for url in feeds.feed_urls():
+        db.add(Source(name=f"bench-{url.rsplit('/', 1)[-1]}", rss_url=url, color="#55ff55",
+                      category_id=category.id if category else None))
+    db.commit()
+
+    clients = await start_clients(f"ws://127.0.0.1:{args.port}/ws", args.clients)
+    measure_from = time.time()
+    for c in clients:
+        c.min_published = measure_from
+
+    # First poll discovers the hubs, then subscribe and wait for verification
+    await fetch_and_process_feeds(db)
+    started = time.perf_counter()
+    await maintain_subscriptions()
+    active = 0
+    while time.perf_counter() - started < 10:
+        db.expire_all()
+        active = db.query(WebSubSubscription).filter(WebSubSubscription.state == "active").count()
+        if active == args.feeds:
+            break
+        await asyncio.sleep(0.05)
+    subscribe_s = time.perf_counter() - started
+
+    # A scheduled cycle should skip every pushed source
+    requests_before = feeds.requests
+    await fetch_and_process_feeds(db, include_pushed=False)
+    safety_poll_requests = feeds.requests - requests_before
+
+    # Publish from a private pool: the app's push handler needs the loop's default executor
+    loop = asyncio.get_running_loop()
+    publishers = ThreadPoolExecutor(max_workers=args.feeds)
+    before = db.query(Article).count()
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        await asyncio.gather(*(loop.run_in_executor(publishers, hub.publish, url) for url in feeds.feed_urls()))
+    publishers.shutdown()
+    push_wall = time.perf_counter() - started
+    pushed_rows = db.query(Article).count() - before
+
+    drained = await drain_clients(clients, db.query(Article).count(), 30)
+    await stop_clients(clients)
+    db.close()
+
+    server.should_exit = True
+    await server_task
+    feeds.stop()
+    hub.stop()
+
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "subscriptions": {"active": active, "expected": args.feeds, "verify_s": round(subscribe_s, 3)},
+        "safety_poll_requests": safety_poll_requests,
+        "push": {
+            "deliveries": hub.deliveries,
+            "failed_deliveries": hub.failed_deliveries,
+            "rows": pushed_rows,
+            "wall_s": round(push_wall, 4),
+        },
+        "e2e_latency": {
+            "clients": latency_summary([l for c in clients for l in c.latencies]),
+            "all_drained": drained,
+        },
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="intel-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["FETCH_ON_STARTUP"] = "false"
+    os.environ["PUBLIC_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+
+    results = asyncio.run(run(args))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"websub-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("subscriptions", "safety_poll_requests", "push", "e2e_latency")}, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Trending detector benchmark.
+
+Feeds app.trending.TrendingEngine a simulated day of background titles
+(random words from the synthetic feed vocabulary) on a fake clock, then a
+burst of titles sharing a planted phrase, and records per-title ingest
+cost, top() latency, sketch memory (fixed whatever the volume) and where
+the planted terms rank.
+
+    cd backend
+    python -m bench.trending --titles-per-hour 500 --burst 40
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+from bench.feed_server import WORDS
+from bench.run_ingest import RESULTS_DIR, git_revision, latency_summary
+
+PLANTED = "moveit transfer zero-day"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the trending-topics engine")
+    parser.add_argument("--hours", type=int, default=24, help="hours of background titles")
+    parser.add_argument("--titles-per-hour", type=int, default=500)
+    parser.add_argument("--burst", type=int, default=40, help="titles with the planted phrase in the last window")
+    parser.add_argument("--words", type=int, default=8, help="words per title")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="results file (default: bench/results/trending-<rev>.json)")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    from app.trending import TrendingEngine, title_terms
+
+    rng = random.Random(args.seed)
+    engine = TrendingEngine()
+    start = 1_700_000_000.0
+    title = lambda: " ".join(rng.choice(WORDS) for _ in range(args.words))  # noqa: E731
+
+    timings = []
+    total = args.hours * args.titles_per_hour
+    for i in range(total):
+        now = start + i * 3600 / args.titles_per_hour
+        text = title()
+        t0 = time.perf_counter()
+        engine.add_title(text, now)
+        timings.append(time.perf_counter() - t0)
+
+    end = start + args.hours * 3600
+    for i in range(args.burst):
+        text = f"{PLANTED} {title()}"
+        now = end + i * 60
+        t0 = time.perf_counter()
+        engine.add_title(text, now)
+        timings.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    top = engine.top(20, end + args.burst * 60)
+    top_ms = (time.perf_counter() - t0) * 1000
+
+    planted = title_terms(PLANTED)
+    ranks = [i + 1 for i, t in enumerate(top) if t["term"] in planted]
+    return {
+        "titles": total + args.burst,
+        "per_title": latency_summary(timings),
+        "top_ms": round(top_ms, 3),
+        "memory_bytes": engine.memory_bytes(),
+        "candidates": len(engine.candidates),
+        "planted_ranks": ranks,
+        "top": top[:10],
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "params": vars(args),
+        "trending": run(args),
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"trending-{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results["trending"], indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Local stand-in WebSub hub.
+
+Accepts subscribe/unsubscribe requests, verifies intent against the
+subscriber's callback (GET with ``hub.challenge``) and, on publish(topic),
+fetches the topic and pushes it to every subscriber with an
+``X-Hub-Signature: sha256=...`` header. Publishers can also POST
+``hub.mode=publish&hub.url=<topic>``.
+
+Pair it with the feed server so the synthetic feeds advertise the hub:
+
+    FeedServer(..., hub=hub.url)
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode
+
+
+class WebSubHub:
+    """Threaded HTTP hub; ``subscriptions`` maps topic -> {callback: (secret, expires_at)}"""
+
+    def __init__(self, host="127.0.0.1", port=0, max_lease=86400):
+        self.max_lease = max_lease
+        self.subscriptions = {}
+        self.deliveries = 0
+        self.failed_deliveries = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _verify(self, mode, topic, callback, secret, lease):
+        """Verification of intent, then record (or drop) the subscription"""
+        challenge = secrets.token_hex(16)
+        query = urlencode({
+            "hub.mode": mode,
+            "hub.topic": topic,
+            "hub.challenge": challenge,
+            "hub.lease_seconds": lease,
+        })
+        sep = "&" if "?" in callback else "?"
+        try:
+            with urllib.request.urlopen(f"{callback}{sep}{query}", timeout=10) as response:
+                confirmed = response.status == 200 and response.read().decode() == challenge
+        except (urllib.error.URLError, OSError):
+            confirmed = False
+        if not confirmed:
+            return
+        with self.lock:
+            subscribers = self.subscriptions.setdefault(topic, {})
+            if mode == "subscribe":
+                subscribers[callback] = (secret, time.time() + lease)
+            else:
+                subscribers.pop(callback, None)
+
+    def publish(self, topic: str, content: bytes = None, content_type: str = "application/atom+xml"):
+        """Push ``content`` (fetched from the topic if omitted) to its subscribers.
+
+        Returns the HTTP status each callback answered with (0 = unreachable).
+        """
+        if content is None:
+            with urllib.request.urlopen(topic, timeout=10) as response:
+                content = response.read()
+                content_type = response.headers.get("Content-Type", content_type)
+        now = time.time()
+        with self.lock:
+            subscribers = [(cb, secret) for cb, (secret, expires) in self.subscriptions.get(topic, {}).items()
+                           if expires > now]
+        statuses = []
+        for callback, secret in subscribers:
+            headers = {"Content-Type": content_type, "Link": f'<{self.url}>; rel="hub", <{topic}>; rel="self"'}
+            if secret:
+                digest = hmac.new(secret.encode(), content, hashlib.sha256).hexdigest()
+                headers["X-Hub-Signature"] = f"sha256={digest}"
+            request = urllib.request.Request(callback, data=content, headers=headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    statuses.append(response.status)
+            except urllib.error.HTTPError as e:
+                statuses.append(e.code)
+            except (urllib.error.URLError, OSError):
+                statuses.append(0)
+        self.deliveries += sum(1 for s in statuses if 200 <= s < 300)
+        self.failed_deliveries += sum(1 for s in statuses if not 200 <= s < 300)
+        return statuses
+
+    def _handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                mode = form.get("hub.mode")
+                if mode in ("subscribe", "unsubscribe"):
+                    topic, callback = form.get("hub.topic"), form.get("hub.callback")
+                    if not topic or not callback:
+                        self.send_error(400, "hub.topic and hub.callback are required")
+                        return
+                    lease = min(int(form.get("hub.lease_seconds") or hub.max_lease), hub.max_lease)
+                    args = (mode, topic, callback, form.get("hub.secret"), lease)
+                    threading.Thread(target=hub._verify, args=args, daemon=True).start()
+                elif mode == "publish" and (form.get("hub.url") or form.get("hub.topic")):
+                    topic = form.get("hub.url") or form.get("hub.topic")
+                    threading.Thread(target=hub.publish, args=(topic,), daemon=True).start()
+                else:
+                    self.send_error(400, "Unsupported hub.mode")
+                    return
+                self.send_response(202)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stand-in WebSub hub")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--max-lease", type=int, default=86400)
+    args = parser.parse_args()
+
+    srv = WebSubHub(port=args.port, max_lease=args.max_lease)
+    print(f"WebSub hub at {srv.url}")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,80 @@
+"""Simulated WebSocket clients for fan-out benchmarks."""
+
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+
+def publish_time(article: dict):
+    """Recover the feed server's publish time from an article link"""
+    link = article.get("url") or article.get("link") or ""
+    t = parse_qs(urlparse(link).query).get("t")
+    return float(t[0]) if t else None
+
+
+class BenchClient:
+    """One /ws subscriber recording publish-to-receipt latency.
+
+    Slow clients sleep ``delay`` seconds per message without reading the
+    socket, so their backlog builds up on the server side.
+    """
+
+    def __init__(self, url: str, delay: float = 0.0):
+        self.url = url
+        self.delay = delay
+        # Entries published before this (e.g. the initial backfill) are ignored
+        self.min_published = 0.0
+        self.latencies = []
+        self.received = 0
+        self.connected = asyncio.Event()
+        self.task = None
+
+    async def run(self):
+        try:
+            # A one-message client queue lets a slow reader push back on the server
+            async with websockets.connect(self.url, max_queue=1 if self.delay else None) as ws:
+                self.connected.set()
+                async for raw in ws:
+                    received_at = time.time()
+                    msg = json.loads(raw)
+                    if msg.get("type") == "article":
+                        self.received += 1
+                        published = publish_time(msg.get("data", {}))
+                        if published is not None and published >= self.min_published:
+                            self.latencies.append(received_at - published)
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+        except (asyncio.CancelledError, websockets.ConnectionClosed, OSError):
+            pass
+        finally:
+            self.connected.set()
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+        return self
+
+
+async def start_clients(url: str, count: int, slow: int = 0, slow_delay: float = 0.05):
+    """Connect ``count`` clients, the first ``slow`` of which are slow readers"""
+    clients = [BenchClient(url, slow_delay if i < slow else 0.0).start() for i in range(count)]
+    await asyncio.gather(*(c.connected.wait() for c in clients))
+    return clients
+
+
+async def drain_clients(clients, expected: int, timeout: float):
+    """Wait until every client has seen ``expected`` articles or ``timeout`` passes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(c.received >= expected or c.task.done() for c in clients):
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+async def stop_clients(clients):
+    for c in clients:
+        c.task.cancel()
+    await asyncio.gather(*(c.task for c in clients), return_exceptions=True)
@@ -16,14 +16,19 @@ const WS_URL = WS_PROTOCOL + '//' + WS_HOST + '/ws';
 
 // Application State
 let articles = [];
+const articleDetails = new Map(); // id -> /api/articles/{id} response, fetched when a card is expanded
 let categories = [];
 let activeCategories = new Set();
 let ws = null;
 let reconnectAttempts = 0;
+// Stream position, sent back on reconnect so the server can replay what we missed
+let wsEpoch = null;
+let lastSeq = null;
 const MAX_RECONNECT_ATTEMPTS = 10;
 let currentLayout = 'modern'; // 'modern' or 'irc'
 let autoRefreshInterval = null;
 let autoRefreshSeconds = 0; // 0 = disabled
+let backoffUntil = 0; // set when the server sheds a request; auto-refresh waits until then
 
 // Default categories with colors
 const DEFAULT_CATEGORIES = [
@@ -47,6 +52,7 @@ document.addEventListener('DOMContentLoaded', () => {
     loadCategoriesFromBackend();
     connectWebSocket();
     loadArticles();
+    watchFeedScroll();
 });
 
 // ========================================
@@ -97,6 +103,7 @@ function changeLayout(layout) {
     currentLayout = layout;
     localStorage.setItem('intel-layout', layout);
     applyLayout(layout);
+    rowHeights = new WeakMap(); // measured in the other layout
     renderArticles(); // Re-render with new layout
 }
 
@@ -214,6 +221,7 @@ async function loadCategoriesFromBackend() {
     
     renderCategories();
     populateCategoryDropdown();
+    renderArticles(); // articles may have arrived before the active categories were known
 }
 
 function initializeCategories() {
@@ -280,7 +288,7 @@ function toggleCategory(name) {
 // ========================================
 function connectWebSocket() {
     try {
-        ws = new WebSocket(WS_URL);
+        ws = new WebSocket(streamUrl());
         
         ws.onopen = () => {
             console.log('WebSocket connected');
@@ -291,11 +299,20 @@ function connectWebSocket() {
         ws.onmessage = (event) => {
             try {
                 const msg = JSON.parse(event.data);
-                if (msg.type === 'article') {
+                if (msg.type === 'hello') {
+                    wsEpoch = msg.epoch;
+                } else if (msg.type === 'snapshot') {
+                    handleSnapshot(msg);
+                } else if (msg.type === 'article') {
                     addArticle(msg.data);
+                } else if (msg.type === 'article_update') {
+                    updateArticle(msg.data);
+                } else if (msg.type === 'fetch_job') {
+                    handleFetchJob(msg.data);
                 } else if (msg.type === 'status') {
                     console.log('Status:', msg.message);
                 }
+                if (msg.seq !== undefined) lastSeq = msg.seq;
             } catch (e) {
                 console.error('Parse error:', e);
             }
@@ -322,6 +339,27 @@ function connectWebSocket() {
     }
 }
 
+function streamUrl() {
+    if (lastSeq === null && articles.length === 0) return WS_URL;
+    const params = new URLSearchParams();
+    if (lastSeq !== null && wsEpoch) {
+        params.set('resume', lastSeq);
+        params.set('epoch', wsEpoch);
+    }
+    const newestId = articles.reduce((max, a) => Math.max(max, a.id || 0), 0);
+    if (newestId) params.set('last_id', newestId);
+    return WS_URL + '?' + params.toString();
+}
+
+// Sent instead of a replay when our gap is no longer in the server's log
+function handleSnapshot(msg) {
+    if (!msg.complete) {
+        loadArticles();
+        return;
+    }
+    msg.articles.forEach(addArticle);
+}
+
 function updateStatus(className, text) {
     const el = document.getElementById('status');
     if (el) {
@@ -333,6 +371,13 @@ function updateStatus(className, text) {
 // ========================================
 // Auto-Refresh Management
 // ========================================
+// Honour Retry-After on 429 (rate limited) and 503 (overloaded) responses
+function noteBackoff(response) {
+    if (response.status !== 429 && response.status !== 503) return;
+    const seconds = parseInt(response.headers.get('Retry-After'), 10) || 5;
+    backoffUntil = Date.now() + seconds * 1000;
+}
+
 function loadAutoRefreshSetting() {
     const saved = localStorage.getItem('intel-autorefresh');
     if (saved) {
@@ -362,6 +407,7 @@ function startAutoRefresh() {
     if (autoRefreshSeconds > 0) {
         console.log('Auto-refresh enabled: every ' + autoRefreshSeconds + ' seconds');
         autoRefreshInterval = setInterval(() => {
+            if (Date.now() < backoffUntil) return;
             console.log('Auto-refreshing articles...');
             loadArticles();
         }, autoRefreshSeconds * 1000);
@@ -370,11 +416,55 @@ function startAutoRefresh() {
     }
 }
 
+// Fetch jobs we are waiting on: job_id -> resolve callback
+const pendingFetchJobs = new Map();
+const FETCH_JOB_TIMEOUT_MS = 120000;
+const FETCH_JOB_POLL_MS = 3000;
+
+function handleFetchJob(job) {
+    const resolve = pendingFetchJobs.get(job.job_id);
+    if (resolve && (job.status === 'done' || job.status === 'error')) {
+        pendingFetchJobs.delete(job.job_id);
+        resolve(job);
+    }
+}
+
+// Resolve when the job finishes: pushed over /ws, with polling as a fallback
+function waitForFetchJob(job) {
+    if (job.status === 'done' || job.status === 'error') return Promise.resolve(job);
+    return new Promise((resolve) => {
+        pendingFetchJobs.set(job.job_id, resolve);
+        const started = Date.now();
+        const poll = async () => {
+            if (!pendingFetchJobs.has(job.job_id)) return;
+            if (Date.now() - started > FETCH_JOB_TIMEOUT_MS) {
+                pendingFetchJobs.delete(job.job_id);
+                resolve(job);
+                return;
+            }
+            try {
+                const response = await fetch(API_BASE + '/api/fetch/' + job.job_id);
+                if (response.ok) handleFetchJob(await response.json());
+            } catch (e) {
+                // keep waiting for the push
+            }
+            setTimeout(poll, FETCH_JOB_POLL_MS);
+        };
+        setTimeout(poll, FETCH_JOB_POLL_MS);
+    });
+}
+
 async function manualRefresh() {
     updateStatus('', '⟳ Refreshing...');
     try {
-        // First trigger backend fetch
-        await fetch(API_BASE + '/api/fetch', { method: 'POST' });
+        // Trigger (or join) a backend fetch cycle; returns immediately with a job
+        const response = await fetch(API_BASE + '/api/fetch', { method: 'POST' });
+        if (!response.ok) {
+            noteBackoff(response);
+            throw new Error('HTTP ' + response.status);
+        }
+        const job = await response.json();
+        await waitForFetchJob(job);
         // Then reload articles
         await loadArticles();
         updateStatus('connected', '✓ Connected');
@@ -387,96 +477,320 @@ async function manualRefresh() {
 // ========================================
 // Article Management
 // ========================================
+// The feed is drawn from per-category indexes: only rows near the viewport
+// exist in the DOM, and stream messages are applied once per animation frame.
+const MAX_ARTICLES = 1000;
+const ROW_ESTIMATE = { irc: 28, modern: 160 }; // px, until a row has been measured
+const OVERSCAN_PX = 800; // rendered above and below the viewport
+const articleIds = new Set();
+const arrivalOrder = new WeakMap(); // article -> increasing number; merges the indexes
+const rowNodes = new Map(); // article -> its row element, while in the DOM
+let rowHeights = new WeakMap(); // article -> measured height in px, margin included
+let articlesByCategory = new Map(); // category name -> its articles, oldest first
+let viewRows = []; // articles in active categories, oldest first
+let pendingArticles = []; // received since the last frame
+let nextOrder = 0;
+let frameRequested = false;
+let topSpacer = null;
+let bottomSpacer = null;
+
 async function loadArticles() {
     try {
         const response = await fetch(API_BASE + '/api/articles?limit=200');
         if (response.ok) {
-            articles = await response.json();
-            updateArticleCount();
-            renderArticles();
+            setArticles(await response.json());
+        } else {
+            noteBackoff(response);
         }
     } catch (error) {
         console.error('Failed to load articles:', error);
     }
 }
 
-function addArticle(article) {
-    // Add to beginning
-    articles.unshift(article);
-    if (articles.length > 1000) articles.pop();
+// Replace everything (page load, reload, clear); ``list`` is newest first
+function setArticles(list) {
+    articles = list.slice(0, MAX_ARTICLES);
+    articleIds.clear();
+    articlesByCategory = new Map();
+    pendingArticles = [];
+    for (let i = articles.length - 1; i >= 0; i--) indexArticle(articles[i]);
     updateArticleCount();
     renderArticles();
 }
 
+function categoryOf(article) {
+    // Category comes as a string name from the backend now
+    return article.category || 'Unknown';
+}
+
+function indexArticle(article) {
+    arrivalOrder.set(article, nextOrder++);
+    if (article.id !== undefined) articleIds.add(article.id);
+    const cat = categoryOf(article);
+    if (!articlesByCategory.has(cat)) articlesByCategory.set(cat, []);
+    articlesByCategory.get(cat).push(article);
+}
+
+function addArticle(article) {
+    pendingArticles.push(article);
+    // A hidden tab gets no frames; only the newest MAX_ARTICLES would survive anyway
+    if (pendingArticles.length > MAX_ARTICLES) pendingArticles.splice(0, pendingArticles.length - MAX_ARTICLES);
+    scheduleFrame();
+}
+
+function scheduleFrame() {
+    if (frameRequested) return;
+    frameRequested = true;
+    requestAnimationFrame(() => {
+        frameRequested = false;
+        flushArticles();
+        renderWindow();
+    });
+}
+
+// Apply the articles received since the last frame in one pass
+function flushArticles() {
+    if (pendingArticles.length === 0) return;
+    const batch = pendingArticles;
+    pendingArticles = [];
+    const added = [];
+    batch.forEach(article => {
+        // Replays and snapshots may repeat articles we already have
+        if (article.id !== undefined && articleIds.has(article.id)) return;
+        indexArticle(article);
+        added.push(article);
+    });
+    if (added.length === 0) return;
+
+    articles = added.slice().reverse().concat(articles);
+    while (articles.length > MAX_ARTICLES) evictArticle(articles.pop());
+    added.forEach(article => {
+        if (activeCategories.has(categoryOf(article))) viewRows.push(article);
+    });
+    updateArticleCount();
+    if (!topSpacer && viewRows.length > 0) renderArticles();
+}
+
+function evictArticle(article) {
+    // The oldest article overall is also the oldest of its category and of the view
+    const cat = categoryOf(article);
+    const list = articlesByCategory.get(cat);
+    if (list && list[0] === article) list.shift();
+    if (list && list.length === 0) articlesByCategory.delete(cat);
+    if (viewRows[0] === article) viewRows.shift();
+    articleIds.delete(article.id);
+    articleDetails.delete(article.id);
+    const node = rowNodes.get(article);
+    if (node) {
+        node.remove();
+        rowNodes.delete(article);
+    }
+}
+
+function updateArticle(update) {
+    // Severity upgraded by model triage after the article was first sent
+    const article = articles.find(a => a.id === update.id) || pendingArticles.find(a => a.id === update.id);
+    if (!article) return;
+    article.severity = update.severity;
+    article.triage = update.triage;
+    invalidateRow(article);
+}
+
+// Redraw one row on the next frame (its content or height changed)
+function invalidateRow(article) {
+    const node = rowNodes.get(article);
+    if (node) {
+        node.remove();
+        rowNodes.delete(article);
+    }
+    rowHeights.delete(article);
+    scheduleFrame();
+}
+
 function updateArticleCount() {
     const el = document.getElementById('articleCount');
     if (el) el.textContent = 'Articles: ' + articles.length;
 }
 
+// Articles of the active categories in arrival order, merged from the indexes
+function mergeActiveCategories() {
+    const lists = [...activeCategories].map(name => articlesByCategory.get(name)).filter(Boolean);
+    const heads = lists.map(() => 0);
+    const merged = [];
+    for (;;) {
+        let best = -1;
+        for (let i = 0; i < lists.length; i++) {
+            if (heads[i] < lists[i].length && (best < 0 ||
+                    arrivalOrder.get(lists[i][heads[i]]) < arrivalOrder.get(lists[best][heads[best]]))) {
+                best = i;
+            }
+        }
+        if (best < 0) return merged;
+        merged.push(lists[best][heads[best]++]);
+    }
+}
+
+// Full redraw: category filter, layout or category colors changed
 function renderArticles() {
     const feed = document.getElementById('feed');
     if (!feed) return;
-    
-    // Filter by active categories
-    const filtered = articles.filter(a => {
-        // Category comes as a string name from the backend now
-        const cat = a.category || 'Unknown';
-        return activeCategories.has(cat);
-    });
-    
-    if (filtered.length === 0) {
+
+    viewRows = mergeActiveCategories();
+    rowNodes.clear();
+    if (viewRows.length === 0) {
+        topSpacer = bottomSpacer = null;
         feed.innerHTML = '<div class="no-articles">No articles match your filters. Try enabling more categories or wait for new articles...</div>';
         return;
     }
-    
-    let html = '';
-    
-    // Render based on current layout
-    if (currentLayout === 'irc') {
-        // IRC Classic Layout - chat room style
-        filtered.forEach(article => {
-            const sourceColor = article.source_color || article.color || '#55ff55';
-            const categoryName = article.category || 'Unknown';
-            const categoryColor = getCategoryColor(categoryName);
-            const articleUrl = article.url || article.link || '#';
-            const timestamp = article.published_at ? formatTimeShort(article.published_at) : '';
-            
-            html += '<div class="article-card">';
-            html += '<span class="article-timestamp">' + timestamp + '</span>';
-            html += '<span class="article-source" style="color: ' + sourceColor + '">' + escapeHtml(article.source || 'Unknown') + '</span>';
-            html += '<span class="article-title"><a href="' + escapeAttr(articleUrl) + '" target="_blank">' + escapeHtml(article.title) + '</a></span>';
-            html += '<span class="article-category" style="background: ' + categoryColor + '22; color: ' + categoryColor + '; border: 1px solid ' + categoryColor + '">' + escapeHtml(categoryName) + '</span>';
-            html += '</div>';
-        });
-    } else {
-        // Modern Cards Layout (default)
-        filtered.forEach(article => {
-            const severity = article.severity || 'low';
-            const sourceColor = article.source_color || article.color || '#55ff55';
-            const categoryName = article.category || 'Unknown';
-            const categoryColor = getCategoryColor(categoryName);
-            const articleUrl = article.url || article.link || '#';
-            const summary = article.summary || 'No summary available';
-            
-            html += '<div class="article" data-severity="' + severity + '">';
-            html += '<div class="article-header">';
-            html += '<span class="source" style="color: ' + sourceColor + '">[' + escapeHtml(article.source || 'Unknown') + ']</span>';
-            html += '<span class="category" style="border-left: 3px solid ' + categoryColor + '; padding-left: 8px;">' + escapeHtml(categoryName) + '</span>';
-            html += '<span class="severity severity-' + severity + '">' + severity.toUpperCase() + '</span>';
-            html += '</div>';
-            html += '<div class="article-title">' + escapeHtml(article.title) + '</div>';
-            html += '<div class="article-summary">' + escapeHtml(summary) + '</div>';
-            html += '<div class="article-footer">';
-            html += '<a href="' + escapeAttr(articleUrl) + '" target="_blank" class="article-link">Read More →</a>';
-            if (article.published_at) {
-                html += '<span class="timestamp">' + formatTime(article.published_at) + '</span>';
-            }
-            html += '</div>';
-            html += '</div>';
-        });
+    topSpacer = document.createElement('div');
+    bottomSpacer = document.createElement('div');
+    feed.replaceChildren(topSpacer, bottomSpacer);
+    renderWindow();
+}
+
+// The element that scrolls the feed (.main-content in index.html, else the feed itself)
+function scrollContainer(feed) {
+    return feed.closest('.main-content') || feed;
+}
+
+function watchFeedScroll() {
+    const feed = document.getElementById('feed');
+    if (!feed) return;
+    scrollContainer(feed).addEventListener('scroll', scheduleFrame, { passive: true });
+    if (scrollContainer(feed) !== feed) feed.addEventListener('scroll', scheduleFrame, { passive: true });
+    window.addEventListener('resize', scheduleFrame);
+}
+
+// Make the DOM hold exactly the rows near the viewport, newest at the top
+function renderWindow() {
+    const feed = document.getElementById('feed');
+    if (!feed || !topSpacer) return;
+    const container = scrollContainer(feed);
+    const offset = container === feed ? 0 :
+        feed.getBoundingClientRect().top - container.getBoundingClientRect().top + container.scrollTop;
+    const top = container.scrollTop - offset - OVERSCAN_PX;
+    const bottom = container.scrollTop - offset + container.clientHeight + OVERSCAN_PX;
+    const estimate = ROW_ESTIMATE[currentLayout] || ROW_ESTIMATE.modern;
+
+    let y = 0;
+    let topPad = 0;
+    let bottomPad = 0;
+    const visible = [];
+    for (let i = viewRows.length - 1; i >= 0; i--) {
+        const article = viewRows[i];
+        const height = rowHeights.get(article) || estimate;
+        if (y + height < top) {
+            topPad += height;
+        } else if (y <= bottom) {
+            visible.push(article);
+        } else {
+            bottomPad += height;
+        }
+        y += height;
+    }
+
+    const keep = new Set(visible);
+    rowNodes.forEach((node, article) => {
+        if (!keep.has(article)) {
+            node.remove();
+            rowNodes.delete(article);
+        }
+    });
+    topSpacer.style.height = topPad + 'px';
+    bottomSpacer.style.height = bottomPad + 'px';
+
+    // Existing rows stay put; only new ones are created and inserted
+    let cursor = topSpacer;
+    visible.forEach(article => {
+        let node = rowNodes.get(article);
+        if (!node) {
+            node = createRow(article);
+            rowNodes.set(article, node);
+        }
+        if (cursor.nextSibling !== node) feed.insertBefore(node, cursor.nextSibling);
+        cursor = node;
+    });
+
+    // Measure what was drawn so spacers match the real heights next time
+    visible.forEach(article => {
+        const node = rowNodes.get(article);
+        rowHeights.set(article, node.nextSibling.offsetTop - node.offsetTop);
+    });
+}
+
+function createRow(article) {
+    const template = document.createElement('template');
+    template.innerHTML = currentLayout === 'irc' ? ircRowHtml(article) : cardHtml(article);
+    return template.content.firstElementChild;
+}
+
+// IRC Classic Layout - chat room style
+function ircRowHtml(article) {
+    const sourceColor = article.source_color || article.color || '#55ff55';
+    const categoryName = categoryOf(article);
+    const categoryColor = getCategoryColor(categoryName);
+    const articleUrl = article.url || article.link || '#';
+    const timestamp = article.published_at ? formatTimeShort(article.published_at) : '';
+
+    let html = '<div class="article-card">';
+    html += '<span class="article-timestamp">' + timestamp + '</span>';
+    html += '<span class="article-source" style="color: ' + sourceColor + '">' + escapeHtml(article.source || 'Unknown') + '</span>';
+    html += '<span class="article-title"><a href="' + escapeAttr(articleUrl) + '" target="_blank">' + escapeHtml(article.title) + '</a></span>';
+    html += '<span class="article-category" style="background: ' + categoryColor + '22; color: ' + categoryColor + '; border: 1px solid ' + categoryColor + '">' + escapeHtml(categoryName) + '</span>';
+    html += '</div>';
+    return html;
+}
+
+// Modern Cards Layout (default)
+function cardHtml(article) {
+    const severity = article.severity || 'low';
+    const sourceColor = article.source_color || article.color || '#55ff55';
+    const categoryName = categoryOf(article);
+    const categoryColor = getCategoryColor(categoryName);
+    const articleUrl = article.url || article.link || '#';
+    const details = articleDetails.get(article.id);
+
+    let html = '<div class="article" data-severity="' + severity + '">';
+    html += '<div class="article-header">';
+    html += '<span class="source" style="color: ' + sourceColor + '">[' + escapeHtml(article.source || 'Unknown') + ']</span>';
+    html += '<span class="category" style="border-left: 3px solid ' + categoryColor + '; padding-left: 8px;">' + escapeHtml(categoryName) + '</span>';
+    html += '<span class="severity severity-' + severity + '">' + severity.toUpperCase() + '</span>';
+    html += '</div>';
+    html += '<div class="article-title">' + escapeHtml(article.title) + '</div>';
+    if (details) {
+        html += '<div class="article-summary expanded">' + escapeHtml(details.content || 'No summary available') + '</div>';
+    } else if (article.id !== undefined) {
+        html += '<div class="article-summary"><a href="#" class="article-details" onclick="event.preventDefault(); showDetails(' + article.id + ')">[+] Summary</a></div>';
+    }
+    html += '<div class="article-footer">';
+    html += '<a href="' + escapeAttr(articleUrl) + '" target="_blank" class="article-link">Read More →</a>';
+    if (article.published_at) {
+        html += '<span class="timestamp">' + formatTime(article.published_at) + '</span>';
+    }
+    html += '</div>';
+    html += '</div>';
+    return html;
+}
+
+// Lists and the stream carry no description; fetch it when a card is expanded
+async function showDetails(id) {
+    const article = articles.find(a => a.id === id);
+    if (articleDetails.has(id)) {
+        articleDetails.delete(id);
+        if (article) invalidateRow(article);
+        return;
+    }
+    try {
+        const response = await fetch(API_BASE + '/api/articles/' + id);
+        if (response.ok) {
+            articleDetails.set(id, await response.json());
+            if (article) invalidateRow(article);
+        } else {
+            noteBackoff(response);
+        }
+    } catch (error) {
+        console.error('Failed to load article:', error);
     }
-    
-    feed.innerHTML = html;
 }
 
 // Format time for IRC layout (short format)
@@ -543,9 +857,8 @@ function escapeAttr(text) {
 
 function clearFeed() {
     if (confirm('Clear all displayed articles?')) {
-        articles = [];
-        renderArticles();
-        updateArticleCount();
+        articleDetails.clear();
+        setArticles([]);
     }
 }
 